@@ -0,0 +1,293 @@
+# 📁 C:\APP\tax-bill\core\excel_sheet_cache.py
+# -*- coding: utf-8 -*-
+"""
+엑셀 시트 파싱 결과 디스크 캐시
+
+세금계산서.xlsx의 거래처/거래명세표 시트를 한 번 파싱하면 셀 값을 문자열 그리드
+(DataFrame, 헤더 포함, header=None 형태)로 ~/.hometax/cache 아래에 저장한다.
+
+- 1차 키: 파일 경로 + 크기 + 수정시각 → 일치하면 파일을 열지 않고 바로 로드
+- 2차 키: 시트별 내용 해시 (xlsx zip 목차의 시트 XML / sharedStrings CRC)
+  → 파일이 저장되어 수정시각이 바뀌어도 내용이 같은 시트는 다시 파싱하지 않음
+
+캐시에 문제가 있으면 항상 원본을 다시 파싱하므로 결과는 캐시 유무와 같다.
+"""
+
+import os
+import json
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# 캐시 포맷이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / ".hometax" / "cache"
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def cell_to_str(value) -> str:
+    """셀 값을 문자열로 변환 (빈 셀은 빈 문자열)"""
+    if value is None:
+        return ""
+    return str(value)
+
+
+@dataclass
+class CachedSheet:
+    """파싱된 시트 (frame.iloc[0]이 엑셀 1행)"""
+    title: str
+    frame: pd.DataFrame
+    from_cache: bool = False
+
+    @property
+    def max_row(self) -> int:
+        return len(self.frame)
+
+    @property
+    def max_column(self) -> int:
+        return self.frame.shape[1]
+
+    def row_values(self, row_number: int) -> List[str]:
+        """엑셀 행 번호(1부터)의 셀 값 목록"""
+        return self.frame.iloc[row_number - 1].tolist()
+
+
+class SheetCache:
+    """파일 지문 기반 시트 캐시"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+
+    def load(self, file_path: str, sheet_name: str) -> Optional[CachedSheet]:
+        """시트 로드 (캐시 우선). 시트가 없으면 활성 시트, 파일을 읽을 수 없으면 None"""
+        file_path = os.path.abspath(file_path)
+        cached, lookup = self._lookup(file_path, sheet_name)
+        if cached is not None or lookup is None:
+            return cached
+
+        sheet = _parse_sheet(file_path, sheet_name)
+        if sheet is None:
+            return None
+
+        entry_dir, meta, parts = lookup
+        if parts is not None:
+            self._store(entry_dir, file_path, meta, sheet_name, sheet, parts[1])
+        return sheet
+
+    def peek(self, file_path: str, sheet_name: str) -> Optional[CachedSheet]:
+        """캐시에 저장된 시트만 반환 (캐시가 없거나 내용이 바뀌었으면 파싱하지 않고 None)"""
+        cached, _ = self._lookup(os.path.abspath(file_path), sheet_name)
+        return cached
+
+    def invalidate(self, file_path: str) -> None:
+        """파일의 캐시 삭제"""
+        entry_dir = self._entry_dir(os.path.abspath(file_path))
+        if not entry_dir.exists():
+            return
+        for item in entry_dir.iterdir():
+            try:
+                item.unlink()
+            except OSError:
+                pass
+
+    # 내부 구현
+    def _lookup(self, file_path: str, sheet_name: str):
+        """(캐시된 시트, (캐시 위치, 메타, 시트 목차)) 반환 - 파일을 확인할 수 없으면 (None, None)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            print(f"❌ 엑셀 파일 확인 실패: {e}")
+            return None, None
+
+        entry_dir = self._entry_dir(file_path)
+        meta = self._read_meta(entry_dir)
+        fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        # 1차: 파일 지문이 같으면 xlsx를 열지 않고 로드
+        if meta.get('fingerprint') == fingerprint:
+            cached = self._load_entry(entry_dir, meta.get('sheets', {}).get(sheet_name))
+            if cached is not None:
+                return cached, (entry_dir, meta, None)
+
+        # 2차: 시트 내용 해시 비교
+        try:
+            parts = _locate_sheet(file_path, sheet_name)
+        except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            print(f"⚠️ 시트 목차 확인 실패, 캐시 없이 읽습니다: {e}")
+            parts = None
+
+        if parts is not None:
+            title, digest = parts
+            if meta.get('fingerprint') != fingerprint:
+                meta = {'fingerprint': fingerprint, 'sheets': self._keep_unchanged(file_path, meta)}
+            entry = meta['sheets'].get(sheet_name)
+            if entry and entry.get('digest') == digest:
+                cached = self._load_entry(entry_dir, entry)
+                if cached is not None:
+                    self._write_meta(entry_dir, file_path, meta)
+                    return cached, (entry_dir, meta, parts)
+
+        return None, (entry_dir, meta, parts)
+
+    def _entry_dir(self, file_path: str) -> Path:
+        key = hashlib.sha1(os.path.normcase(file_path).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / key
+
+    def _read_meta(self, entry_dir: Path) -> Dict:
+        try:
+            with open(entry_dir / "meta.json", encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if meta.get('version') != CACHE_VERSION:
+            return {}
+        return meta
+
+    def _write_meta(self, entry_dir: Path, file_path: str, meta: Dict) -> None:
+        meta = dict(meta, version=CACHE_VERSION, path=file_path)
+        _atomic_write(entry_dir / "meta.json", json.dumps(meta, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    def _keep_unchanged(self, file_path: str, meta: Dict) -> Dict:
+        """파일이 바뀌었을 때 내용 해시가 그대로인 시트 항목만 유지"""
+        kept = {}
+        for name, entry in meta.get('sheets', {}).items():
+            try:
+                parts = _locate_sheet(file_path, name)
+            except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+                continue
+            if parts is not None and parts[1] == entry.get('digest'):
+                kept[name] = entry
+        return kept
+
+    def _load_entry(self, entry_dir: Path, entry: Optional[Dict]) -> Optional[CachedSheet]:
+        if not entry:
+            return None
+        try:
+            frame = pd.read_pickle(entry_dir / entry['file'])
+        except Exception:
+            return None
+        return CachedSheet(title=entry['title'], frame=frame, from_cache=True)
+
+    def _store(self, entry_dir: Path, file_path: str, meta: Dict, sheet_name: str,
+               sheet: CachedSheet, digest: str) -> None:
+        try:
+            entry_dir.mkdir(parents=True, exist_ok=True)
+            file_name = hashlib.sha1(sheet_name.encode('utf-8')).hexdigest()[:16] + ".pkl"
+            tmp_path = entry_dir / (file_name + ".tmp")
+            sheet.frame.to_pickle(tmp_path)
+            os.replace(tmp_path, entry_dir / file_name)
+
+            meta.setdefault('sheets', {})[sheet_name] = {'title': sheet.title, 'digest': digest, 'file': file_name}
+            self._write_meta(entry_dir, file_path, meta)
+        except Exception as e:
+            print(f"⚠️ 시트 캐시 저장 실패 (무시하고 계속): {e}")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def sheet_part(zf: zipfile.ZipFile, sheet_name: str, fallback_active: bool = True):
+    """(실제 시트 이름, 시트 XML 경로) 반환 - 워크북 목차만 읽음
+
+    시트가 없으면 openpyxl과 같이 활성 시트를 사용한다 (fallback_active=False이면 None).
+    """
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f"{_NS_PKG_REL}Relationship")}
+
+    sheets = [(sheet.get('name'), sheet.get(f"{_NS_REL}id")) for sheet in workbook.iter(f"{_NS_MAIN}sheet")]
+    if not sheets:
+        return None
+
+    chosen = next((sheet for sheet in sheets if sheet[0] == sheet_name), None)
+    if chosen is None:
+        if not fallback_active:
+            return None
+        view = workbook.find(f"{_NS_MAIN}bookViews/{_NS_MAIN}workbookView")
+        active = int(view.get('activeTab', 0)) if view is not None else 0
+        chosen = sheets[active] if active < len(sheets) else sheets[0]
+
+    title, rel_id = chosen
+    target = targets[rel_id]
+    part = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join("xl", target))
+    return title, part
+
+
+def _locate_sheet(file_path: str, sheet_name: str):
+    """(실제 시트 이름, 내용 해시) 반환 - zip 목차의 CRC만 읽고 압축은 풀지 않음"""
+    with zipfile.ZipFile(file_path) as zf:
+        located = sheet_part(zf, sheet_name)
+        if located is None:
+            return None
+
+        title, part = located
+        crcs = [f"{part}:{zf.getinfo(part).CRC:08x}"]
+        if "xl/sharedStrings.xml" in zf.namelist():
+            crcs.append(f"sst:{zf.getinfo('xl/sharedStrings.xml').CRC:08x}")
+        return title, "|".join(crcs)
+
+
+def _parse_sheet(file_path: str, sheet_name: str) -> Optional[CachedSheet]:
+    """openpyxl 읽기 전용 모드로 시트 전체를 문자열 그리드로 파싱"""
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as e:
+        print(f"❌ 엑셀 파일 열기 실패: {e}")
+        return None
+
+    try:
+        if sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+        else:
+            ws = wb.active
+
+        rows = [[cell_to_str(value) for value in values] for values in ws.iter_rows(values_only=True)]
+        title = ws.title
+    finally:
+        wb.close()
+
+    width = max((len(row) for row in rows), default=0)
+    for row in rows:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+
+    frame = pd.DataFrame(rows, columns=range(width), dtype=object)
+    return CachedSheet(title=title, frame=frame)
+
+
+_default_cache: Optional[SheetCache] = None
+
+
+def get_sheet_cache() -> SheetCache:
+    """기본 캐시 (HOMETAX_CACHE_DIR 환경변수로 위치 변경 가능)"""
+    global _default_cache
+    cache_dir = os.getenv("HOMETAX_CACHE_DIR") or DEFAULT_CACHE_DIR
+    if _default_cache is None or _default_cache.cache_dir != Path(cache_dir):
+        _default_cache = SheetCache(cache_dir)
+    return _default_cache
+
+
+def read_sheet(file_path: str, sheet_name: str) -> Optional[CachedSheet]:
+    """기본 캐시를 통해 시트 로드"""
+    return get_sheet_cache().load(file_path, sheet_name)
+
+
+def peek_sheet(file_path: str, sheet_name: str) -> Optional[CachedSheet]:
+    """기본 캐시에 저장된 시트만 반환 (없으면 None, xlsx는 파싱하지 않음)"""
+    return get_sheet_cache().peek(file_path, sheet_name)
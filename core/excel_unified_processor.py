@@ -11,12 +11,25 @@ import sys
 import subprocess
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import re
+import atexit
+import bisect
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+from excel_sheet_cache import cell_to_str, peek_sheet, read_sheet
+from excel_write_worker import ExcelWriteWorker, get_excel_writer
+from xlwings_session import get_workbook_session
+from xlsx_patch_writer import patch_cells
+from run_checkpoint import RunCheckpoint, selection_fingerprint
 
 
 @dataclass
@@ -193,6 +206,170 @@ class ExcelFileManager:
             pass
 
 
+class RowSelection:
+    """행 선택 결과 - 병합된 구간 목록으로 보관
+
+    "2-200000" 같은 범위를 정수 리스트로 펼치지 않고 (시작, 끝) 구간만 저장한다.
+    멤버십/개수/순서대로 순회/인덱싱은 구간 수 기준 이진 탐색으로 처리하고,
+    시트의 실제 데이터 범위와의 교집합은 clip()으로 구한다.
+    """
+    
+    def __init__(self, intervals=()):
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted((int(s), int(e)) for s, e in intervals if int(s) <= int(e)):
+            if merged and start <= merged[-1][1] + 1:
+                # 겹치거나 인접한 구간은 하나로 합침
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+        # _offsets[i] = i번째 구간 앞에 있는 행 개수 (위치 인덱싱용)
+        self._offsets = []
+        total = 0
+        for start, end in merged:
+            self._offsets.append(total)
+            total += end - start + 1
+        self._count = total
+    
+    @classmethod
+    def parse(cls, selection: str, silent: bool = False, min_row: int = 1) -> 'RowSelection':
+        """행 선택 문자열 파싱 (예: "2,5-7,10")
+
+        min_row보다 작은 행(헤더 등)은 제외한다.
+        """
+        intervals = []
+        if not selection or not selection.strip():
+            return cls()
+        
+        for part in selection.split(','):
+            part = part.replace(' ', '')
+            if not part:
+                continue
+            
+            if '-' in part:
+                # 범위 처리 (예: 2-8)
+                try:
+                    start_str, end_str = part.split('-', 1)
+                    start_num = int(start_str)
+                    end_num = int(end_str)
+                except ValueError:
+                    if not silent:
+                        print(f"❌ 잘못된 범위 형식: {part}")
+                    continue
+                
+                if start_num > end_num or end_num < min_row:
+                    if not silent:
+                        print(f"❌ 잘못된 범위: {part}")
+                    continue
+                intervals.append((max(start_num, min_row), end_num))
+            else:
+                # 단일 행 처리
+                try:
+                    row_num = int(part)
+                except ValueError:
+                    if not silent:
+                        print(f"❌ 잘못된 행 번호: {part}")
+                    continue
+                
+                if row_num < min_row:
+                    if not silent:
+                        print(f"❌ 잘못된 행 번호: {part}")
+                    continue
+                intervals.append((row_num, row_num))
+        
+        return cls(intervals)
+    
+    @classmethod
+    def from_rows(cls, rows) -> 'RowSelection':
+        """행 번호 목록(또는 RowSelection)으로부터 생성"""
+        if isinstance(rows, RowSelection):
+            return rows
+        return cls((row, row) for row in rows or [])
+    
+    @property
+    def intervals(self) -> List[Tuple[int, int]]:
+        """병합된 (시작, 끝) 구간 목록"""
+        return list(zip(self._starts, self._ends))
+    
+    @property
+    def first_row(self) -> Optional[int]:
+        return self._starts[0] if self._starts else None
+    
+    @property
+    def last_row(self) -> Optional[int]:
+        return self._ends[-1] if self._ends else None
+    
+    def clip(self, first: int, last: int) -> 'RowSelection':
+        """[first, last] 범위와의 교집합"""
+        return RowSelection(
+            (max(start, first), min(end, last))
+            for start, end in zip(self._starts, self._ends)
+            if end >= first and start <= last
+        )
+    
+    def first(self, n: int) -> List[int]:
+        """앞에서부터 최대 n개 행"""
+        return self[:n]
+    
+    def __contains__(self, row_number) -> bool:
+        i = bisect.bisect_right(self._starts, row_number) - 1
+        return i >= 0 and row_number <= self._ends[i]
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self):
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end + 1)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("RowSelection index out of range")
+        
+        i = bisect.bisect_right(self._offsets, index) - 1
+        return self._starts[i] + (index - self._offsets[i])
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RowSelection):
+            return self.intervals == other.intervals
+        if isinstance(other, (list, tuple)):
+            return len(other) == self._count and list(self) == list(other)
+        return NotImplemented
+    
+    def __str__(self) -> str:
+        return ",".join(str(start) if start == end else f"{start}-{end}"
+                        for start, end in zip(self._starts, self._ends))
+    
+    def __repr__(self) -> str:
+        return f"RowSelection('{self}')"
+
+
+# 상태 컬럼의 완료 표시 (완료일: "2025-08-31", 날짜 셀이면 "2025-08-31 00:00:00")
+COMPLETED_STATUS_PATTERN = r'^\s*\d{4}[-./]\d{1,2}[-./]\d{1,2}'
+
+# 다시 처리하면 성공할 수 있는 오류 표시 (번호오류/미등록 등은 데이터 수정이 필요하므로 제외)
+RETRYABLE_STATUSES = ("처리오류", "발급실패", "error", "명세표 입력 error", "개별 입력 error")
+
+
+def _rows_to_selection(row_numbers) -> 'RowSelection':
+    """정렬된 행 번호 배열을 연속 구간 단위 RowSelection으로 변환"""
+    row_numbers = np.asarray(row_numbers, dtype=np.int64)
+    if row_numbers.size == 0:
+        return RowSelection()
+    breaks = np.flatnonzero(np.diff(row_numbers) != 1)
+    starts = row_numbers[np.concatenate(([0], breaks + 1))]
+    ends = row_numbers[np.concatenate((breaks, [row_numbers.size - 1]))]
+    return RowSelection(zip(starts.tolist(), ends.tolist()))
+
+
 class RowSelector:
     """행 선택 GUI 클래스"""
     
@@ -201,6 +378,39 @@ class RowSelector:
         self.file_path = file_path
         self.selected_rows = None
     
+    def find_pending_rows(self, include_retryable: bool = True,
+                          retryable_statuses=RETRYABLE_STATUSES) -> 'RowSelection':
+        """상태 컬럼을 한 번에 검사해 아직 처리하지 않은 데이터 행 선택
+
+        - 상태가 비어 있는 데이터 행 → 선택
+        - 완료일이 기록된 행 → 제외
+        - 재시도 가능한 오류(처리오류 등) → include_retryable이면 선택
+        - 그 밖의 오류(번호오류, 미등록 등) → 제외 (데이터를 고친 뒤 직접 선택)
+        """
+        sheet = read_sheet(self.file_path, self.config.sheet_name)
+        if sheet is None or sheet.max_row < 2:
+            return RowSelection()
+        
+        data = sheet.frame.iloc[1:]
+        status_index = self.config.status_column - 1
+        if status_index < data.shape[1]:
+            status = data.iloc[:, status_index].str.strip()
+            others = data.drop(columns=data.columns[status_index])
+        else:
+            status = pd.Series("", index=data.index)
+            others = data
+        
+        # 상태 컬럼 외에 값이 하나라도 있는 행만 데이터 행으로 취급
+        has_data = (others.apply(lambda column: column.str.strip()) != "").any(axis=1)
+        pending = status == ""
+        if include_retryable:
+            pending |= status.isin(list(retryable_statuses))
+        completed = status.str.match(COMPLETED_STATUS_PATTERN)
+        
+        selected = has_data & pending & ~completed
+        # frame 인덱스 0이 엑셀 1행
+        return _rows_to_selection(np.flatnonzero(selected.to_numpy()) + 2)
+    
     def show_row_selection_gui(self) -> bool:
         """행 선택 GUI 표시"""
         print("\n=== 행 선택 GUI ===")
@@ -213,7 +423,7 @@ class RowSelector:
         screen_width = root.winfo_screenwidth()
         screen_height = root.winfo_screenheight()
         window_width = 500
-        window_height = 550
+        window_height = 600
         x = (screen_width - window_width) // 2
         y = (screen_height - window_height) // 4
         root.geometry(f"{window_width}x{window_height}+{x}+{y}")
@@ -279,6 +489,15 @@ class RowSelector:
         # 이벤트 핸들러 설정
         self._setup_event_handlers(root, entry_var, result_text)
         
+        # 미처리 행 자동 선택
+        pending_frame = ttk.Frame(main_frame)
+        pending_frame.pack(fill=tk.X, pady=(0, 10), before=button_frame)
+        
+        retry_var = tk.BooleanVar(value=True)
+        ttk.Button(pending_frame, text="미처리 행 전체 선택",
+                  command=lambda: self._select_pending_rows(entry_var, retry_var.get())).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(pending_frame, text="처리오류 행 다시 처리", variable=retry_var).pack(side=tk.LEFT)
+        
         ttk.Button(button_frame, text="확인", 
                   command=lambda: self._confirm_selection(entry_var.get(), root)).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="취소", 
@@ -315,68 +534,51 @@ class RowSelector:
         # Enter 키로 확인
         root.bind('<Return>', lambda event: self._confirm_selection(entry_var.get(), root))
     
-    def _show_row_preview(self, result_text, rows):
-        """선택된 행의 미리보기 표시"""
+    def _show_row_preview(self, result_text, rows: 'RowSelection'):
+        """선택된 행의 미리보기 표시 (파싱 결과 캐시 사용)"""
         try:
-            from openpyxl import load_workbook
-            
-            wb = load_workbook(self.file_path)
-            if self.config.sheet_name in wb.sheetnames:
-                ws = wb[self.config.sheet_name]
-            else:
-                ws = wb.active
+            sheet = read_sheet(self.file_path, self.config.sheet_name)
+            if sheet is None:
+                result_text.insert(tk.END, "미리보기 실패: 엑셀 파일을 읽을 수 없습니다.")
+                return
             
-            max_row = ws.max_row
+            max_row = sheet.max_row
             result_text.insert(tk.END, f"시트 최대 행: {max_row}\n")
             
-            # 각 행의 상호명 표시 (4번째 컬럼 기준)
-            for row_num in rows[:5]:  # 최대 5개만 미리보기
-                if row_num <= max_row:
-                    company_value = ws.cell(row=row_num, column=4).value or "데이터 없음"
-                    result_text.insert(tk.END, f"행{row_num}: {company_value}\n")
-                else:
-                    result_text.insert(tk.END, f"행{row_num}: 범위 초과\n")
+            in_range = rows.clip(1, max_row)
+            if len(in_range) < len(rows):
+                result_text.insert(tk.END, f"범위 초과: {len(rows) - len(in_range)}개 행\n")
+            
+            # 각 행의 상호명 표시 (4번째 컬럼 기준, 최대 5개만 미리보기)
+            for row_num in in_range.first(5):
+                values = sheet.row_values(row_num)
+                company_value = (values[3] if len(values) > 3 else "") or "데이터 없음"
+                result_text.insert(tk.END, f"행{row_num}: {company_value}\n")
             
-            if len(rows) > 5:
-                result_text.insert(tk.END, f"... 외 {len(rows)-5}개 행\n")
+            if len(in_range) > 5:
+                result_text.insert(tk.END, f"... 외 {len(in_range)-5}개 행\n")
                 
         except Exception as e:
             result_text.insert(tk.END, f"미리보기 실패: {e}")
     
-    def parse_row_selection(self, selection: str, silent: bool = False) -> List[int]:
-        """행 선택 문자열 파싱"""
-        if not selection.strip():
-            return []
-        
-        rows = []
-        parts = selection.split(',')
+    def _select_pending_rows(self, entry_var, include_retryable: bool):
+        """미처리 행을 찾아 입력란에 채움 (미리보기는 입력란 변경으로 갱신)"""
+        try:
+            rows = self.find_pending_rows(include_retryable)
+        except Exception as e:
+            messagebox.showerror("오류", f"미처리 행 검색 실패: {e}")
+            return
         
-        for part in parts:
-            part = part.strip()
-            if '-' in part:
-                # 범위 처리 (예: 2-8)
-                try:
-                    start_str, end_str = part.split('-', 1)
-                    if start_str and end_str:
-                        start_num = int(start_str.strip())
-                        end_num = int(end_str.strip())
-                        rows.extend(range(start_num, end_num + 1))
-                    else:
-                        if not silent:
-                            print(f"❌ 잘못된 범위 형식: {part}")
-                except ValueError:
-                    if not silent:
-                        print(f"❌ 잘못된 범위 형식: {part}")
-            else:
-                # 단일 행 처리
-                try:
-                    row_num = int(part.strip())
-                    rows.append(row_num)
-                except ValueError:
-                    if not silent:
-                        print(f"❌ 잘못된 행 번호: {part}")
+        if not rows:
+            messagebox.showinfo("미처리 행 없음", f"{self.config.sheet_name} 시트에 처리할 행이 없습니다.")
+            return
         
-        return sorted(set(rows))  # 중복 제거 및 정렬
+        print(f"미처리 행 {len(rows)}개 자동 선택: {rows}")
+        entry_var.set(str(rows))
+    
+    def parse_row_selection(self, selection: str, silent: bool = False) -> 'RowSelection':
+        """행 선택 문자열 파싱"""
+        return RowSelection.parse(selection, silent=silent)
     
     def _confirm_selection(self, selection: str, root):
         """선택 확정"""
@@ -397,6 +599,278 @@ class RowSelector:
         sys.exit(0)
 
 
+def normalize_business_number(value) -> str:
+    """사업자번호 정규화 (숫자만 남김)"""
+    if value is None:
+        return ""
+    return ''.join(filter(str.isdigit, str(value)))
+
+
+class BusinessNumberIndex:
+    """정규화된 사업자번호 → 엑셀 행 번호 목록 인덱스"""
+    
+    def __init__(self):
+        self._rows: Dict[str, List[int]] = {}
+    
+    @classmethod
+    def from_column(cls, values: List[Any], first_row: int = 2) -> 'BusinessNumberIndex':
+        """사업자번호 컬럼 값 목록으로 인덱스 생성 (values[0]이 first_row 행)"""
+        index = cls()
+        for offset, value in enumerate(values):
+            index.add(first_row + offset, value)
+        return index
+    
+    def add(self, row_number: int, business_number) -> None:
+        """행 하나 반영"""
+        key = normalize_business_number(business_number)
+        if not key:
+            return
+        rows = self._rows.setdefault(key, [])
+        if not rows or rows[-1] < row_number:
+            rows.append(row_number)  # 위에서 아래로 읽는 일반적인 경우
+        elif row_number not in rows:
+            bisect.insort(rows, row_number)
+    
+    def lookup(self, business_number) -> List[int]:
+        """사업자번호와 일치하는 엑셀 행 번호 목록"""
+        return list(self._rows.get(normalize_business_number(business_number), []))
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+# ===== 필드 처리기 =====
+# 헤더를 시트당 한 번 분류해 컬럼별 처리 함수를 정하고, 선택된 행에는 컬럼 단위로 적용한다.
+
+DATE_HEADERS = {'공급일자', '작성일자', '일자', '날짜'}
+AMOUNT_HEADERS = {'수량', '단가', '공급가액', '세액', '합계금액', '현금', '수표', '어음', '외상미수금'}
+BUSINESS_NUMBER_KEYWORDS = ['사업자번호', '사업자등록번호', '거래처등록번호', '등록번호']
+
+_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%Y%m%d', '%Y.%m.%d', '%Y/%m/%d')
+
+
+class EmailParts:
+    """@ 기준으로 나눈 이메일 (기존 {'front', 'back'} dict와 같은 방식으로 접근 가능)"""
+    
+    __slots__ = ('front', 'back')
+    
+    def __init__(self, front: str, back: str = ''):
+        self.front = front
+        self.back = back
+    
+    def __getitem__(self, key: str) -> str:
+        if key in EmailParts.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in EmailParts.__slots__ else default
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EmailParts):
+            return (self.front, self.back) == (other.front, other.back)
+        if isinstance(other, Mapping):
+            return {'front': self.front, 'back': self.back} == dict(other)
+        return NotImplemented
+    
+    def __str__(self) -> str:
+        return f"{self.front}@{self.back}" if self.back else self.front
+    
+    def __repr__(self) -> str:
+        return f"EmailParts(front={self.front!r}, back={self.back!r})"
+
+
+def split_email(value: str) -> EmailParts:
+    """이메일을 @ 기준 앞/뒤로 분리"""
+    if '@' in value:
+        front, back = value.split('@', 1)
+        return EmailParts(front.strip(), back.strip())
+    return EmailParts(value, '')
+
+
+def normalize_date(value: str) -> str:
+    """날짜 문자열을 YYYY-MM-DD로 변환 (해석 불가 시 원래 값)"""
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return value
+
+
+def normalize_amount(value: str) -> str:
+    """금액/수량 문자열 정리 (콤마 제거, 1000.0 → 1000)"""
+    value = value.replace(',', '').strip()
+    if value.endswith('.0') and value[:-2].lstrip('-').isdigit():
+        return value[:-2]
+    return value
+
+
+def _passthrough(value: str) -> str:
+    return value
+
+
+# (이름, 헤더 판별 함수, 값 처리 함수) - 앞에 있는 규칙이 우선
+FIELD_PROCESSORS: List[Tuple[str, Callable[[str], bool], Callable[[str], Any]]] = [
+    ('business_number', lambda header: any(keyword in header for keyword in BUSINESS_NUMBER_KEYWORDS),
+     normalize_business_number),
+    ('email', lambda header: '이메일' in header, split_email),
+    ('date', lambda header: header in DATE_HEADERS, normalize_date),
+    ('amount', lambda header: header in AMOUNT_HEADERS, normalize_amount),
+]
+
+
+def register_field_processor(name: str, matcher: Callable[[str], bool],
+                             processor: Callable[[str], Any], first: bool = False) -> None:
+    """새 필드 유형 등록 (first=True이면 기존 규칙보다 우선)"""
+    rule = (name, matcher, processor)
+    if first:
+        FIELD_PROCESSORS.insert(0, rule)
+    else:
+        FIELD_PROCESSORS.append(rule)
+
+
+def classify_headers(headers: List[str]) -> List[Tuple[str, Callable[[str], Any]]]:
+    """헤더별 (필드 유형, 처리 함수) 목록 - 해당 없으면 passthrough"""
+    table = []
+    for header in headers:
+        for name, matcher, processor in FIELD_PROCESSORS:
+            if matcher(header):
+                table.append((name, processor))
+                break
+        else:
+            table.append(('passthrough', _passthrough))
+    return table
+
+
+# ===== 행 저장소 =====
+# 선택된 행마다 헤더 문자열을 키로 가진 dict를 만드는 대신, 시트당 하나의 RowSchema를
+# 공유하고 행은 값 튜플만 가진 __slots__ 객체로 보관한다.
+
+class RowSchema:
+    """시트 공통 컬럼 스키마 (헤더 → 값 위치)
+
+    같은 헤더가 여러 번 나오면 dict 매핑과 같이 마지막 컬럼 값을 사용한다.
+    """
+    
+    __slots__ = ('headers', 'keys', 'columns', 'positions')
+    
+    def __init__(self, headers: List[str]):
+        source = {}
+        for i, header in enumerate(headers):
+            source[header] = i
+        self.headers: Tuple[str, ...] = tuple(headers)
+        self.keys: Tuple[str, ...] = tuple(source)            # 행 키 (처음 나온 순서)
+        self.columns: Tuple[int, ...] = tuple(source.values())  # 키별 원본 컬럼 위치
+        self.positions: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class CompactRow(Mapping):
+    """공유 스키마 + 값 튜플로 된 행 (dict처럼 row['등록번호'], row.get(...) 사용)"""
+    
+    __slots__ = ('_schema', '_values')
+    
+    def __init__(self, schema: RowSchema, values: Tuple[Any, ...]):
+        self._schema = schema
+        self._values = values
+    
+    def __getitem__(self, key):
+        return self._values[self._schema.positions[key]]
+    
+    def get(self, key, default=None):
+        position = self._schema.positions.get(key)
+        return default if position is None else self._values[position]
+    
+    def __contains__(self, key) -> bool:
+        return key in self._schema.positions
+    
+    def __iter__(self):
+        return iter(self._schema.keys)
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._schema.keys, self._values))
+    
+    def __repr__(self) -> str:
+        return f"CompactRow({self.to_dict()!r})"
+
+
+class ProcessedRow:
+    """처리된 행 (기존 {'row_number', 'data'} dict와 같은 방식으로 접근 가능)"""
+    
+    __slots__ = ('row_number', 'data')
+    
+    def __init__(self, row_number: int, data: CompactRow):
+        self.row_number = row_number
+        self.data = data
+    
+    def __getitem__(self, key: str):
+        if key in ProcessedRow.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in ProcessedRow.__slots__ else default
+    
+    def __repr__(self) -> str:
+        return f"ProcessedRow(row_number={self.row_number}, data={self.data!r})"
+
+
+class SelectedRow(Mapping):
+    """행 데이터에 'excel_row'(엑셀 행 번호) 키를 더한 읽기 전용 뷰 (값은 복사하지 않음)"""
+    
+    __slots__ = ('_row', 'excel_row')
+    
+    def __init__(self, row: Mapping, excel_row: int):
+        self._row = row
+        self.excel_row = excel_row
+    
+    def __getitem__(self, key):
+        if key == 'excel_row':
+            return self.excel_row
+        return self._row[key]
+    
+    def get(self, key, default=None):
+        if key == 'excel_row':
+            return self.excel_row
+        return self._row.get(key, default)
+    
+    def __contains__(self, key) -> bool:
+        return key == 'excel_row' or key in self._row
+    
+    def __iter__(self):
+        yield from (key for key in self._row if key != 'excel_row')
+        yield 'excel_row'
+    
+    def __len__(self) -> int:
+        return len(self._row) + (0 if 'excel_row' in self._row else 1)
+    
+    def __repr__(self) -> str:
+        return f"SelectedRow(excel_row={self.excel_row}, data={self._row!r})"
+
+
+@dataclass
+class StreamedSheet:
+    """시트 로드 결과 (선택된 행만 보관)"""
+    header: Optional[List[str]] = None
+    rows: Dict[int, List[str]] = field(default_factory=dict)  # 선택된 행 번호 → 셀 문자열
+    max_row: int = 0
+    max_column: int = 0
+
+
+def _business_number_index(cached, headers: List[str], column_name: str) -> Optional[BusinessNumberIndex]:
+    """캐시된 시트(read_sheet 결과)의 사업자번호 컬럼으로 인덱스 생성 (컬럼이 없으면 None)"""
+    if column_name not in headers:
+        return None
+    column_idx = headers.index(column_name)
+    return BusinessNumberIndex.from_column(cached.frame.iloc[1:, column_idx].tolist(), first_row=2)
+
+
 class DataProcessor:
     """데이터 처리 클래스"""
     
@@ -405,65 +879,53 @@ class DataProcessor:
         self.file_path = file_path
         self.headers = None
         self.processed_data = []
+        self.business_number_index: Optional[BusinessNumberIndex] = None
+        self.column_processors: List[Tuple[str, Callable[[str], Any]]] = []
+        self.row_schema: Optional[RowSchema] = None
     
-    def process_excel_data(self, selected_rows: List[int]) -> bool:
-        """엑셀 데이터 처리"""
+    def process_excel_data(self, selected_rows) -> bool:
+        """엑셀 데이터 처리 (selected_rows: RowSelection 또는 행 번호 목록)"""
         if not self.file_path or not selected_rows:
             print("❌ 엑셀 파일 경로나 선택된 행이 없습니다.")
             return False
         
         try:
-            # openpyxl로 실제 사용된 범위 확인
-            from openpyxl import load_workbook
-            wb = load_workbook(self.file_path)
-            
-            if self.config.sheet_name in wb.sheetnames:
-                ws = wb[self.config.sheet_name]
-            else:
-                ws = wb.active
-                print(f"경고: '{self.config.sheet_name}' 시트를 찾을 수 없어 기본 시트({ws.title}) 사용")
+            selected_rows = RowSelection.from_rows(selected_rows)
             
-            max_row = ws.max_row
-            max_col = ws.max_column
-            print(f"시트 정보: {max_row}행 × {max_col}열")
+            # 시트를 한 번만 순회하며 헤더/선택 행/사업자번호 인덱스/크기를 함께 수집
+            sheet = self._stream_sheet(selected_rows)
             
-            # pandas로 데이터 읽기
-            df = pd.read_excel(self.file_path, sheet_name=self.config.sheet_name, header=None, 
-                             dtype=str, keep_default_na=False, engine='openpyxl', na_filter=False, nrows=max_row)
-            print(f"데이터 읽기 완료: {len(df)}행 × {len(df.columns)}열")
+            print(f"시트 정보: {sheet.max_row}행 × {sheet.max_column}열")
             
             # 헤더 설정
-            if len(df) < 1:
+            if sheet.header is None:
                 print("❌ 엑셀 파일에 데이터가 없습니다.")
                 return False
             
-            self.headers = [str(h).strip() for h in df.iloc[0].fillna("").tolist()]
+            self.headers = sheet.header
             print(f"헤더: {self.headers}")
+            print(f"사업자번호 인덱스 생성: {len(self.business_number_index or [])}개 번호")
+            
+            # 실제 데이터 범위(헤더 제외)와의 교집합만 처리
+            in_range = selected_rows.clip(2, sheet.max_row)
+            if len(in_range) < len(selected_rows):
+                print(f"⚠️ 선택한 {len(selected_rows) - len(in_range)}개 행은 데이터 범위(2-{sheet.max_row})를 벗어나 제외합니다.")
             
-            # 선택된 행들 처리
+            # 헤더 분류는 시트당 한 번, 변환은 컬럼 단위로 적용
+            self.column_processors = classify_headers(self.headers)
+            self.row_schema = RowSchema(self.headers)
+            row_numbers = list(in_range)
+            rows = [sheet.rows[row_num] for row_num in row_numbers]
+            columns = []
+            for i in self.row_schema.columns:
+                processor = self.column_processors[i][1]
+                columns.append([processor(row[i].strip()) if i < len(row) else "" for row in rows])
+            del rows
+            
+            # 선택된 행들 처리 (공유 스키마 + 값 튜플)
             self.processed_data = []
-            for row_num in selected_rows:
-                if row_num > len(df):
-                    print(f"⚠️ 행 {row_num}은 데이터 범위({len(df)})를 초과합니다.")
-                    continue
-                
-                # 행 데이터 추출
-                row_data = df.iloc[row_num - 1].fillna("").tolist()
-                
-                # 헤더와 데이터 매핑
-                row_dict = {}
-                for i, header in enumerate(self.headers):
-                    if i < len(row_data):
-                        value = str(row_data[i]).strip()
-                        row_dict[header] = self._process_field_data(header, value)
-                    else:
-                        row_dict[header] = ""
-                
-                self.processed_data.append({
-                    'row_number': row_num,
-                    'data': row_dict
-                })
-                
+            for row_num, values in zip(row_numbers, zip(*columns)):
+                self.processed_data.append(ProcessedRow(row_num, CompactRow(self.row_schema, values)))
                 print(f"✅ 행 {row_num} 처리 완료")
             
             print(f"✅ 총 {len(self.processed_data)}개 행 처리 완료")
@@ -473,33 +935,203 @@ class DataProcessor:
             print(f"❌ 엑셀 데이터 처리 실패: {e}")
             return False
     
-    def _process_field_data(self, header: str, value: str) -> str:
-        """필드별 데이터 처리"""
-        # 사업자번호 처리 (하이픈 제거)
-        if any(keyword in header for keyword in ['사업자번호', '사업자등록번호', '거래처등록번호', '등록번호']):
-            return ''.join(filter(str.isdigit, value))
-        
-        # 이메일 처리
-        elif '이메일' in header:
-            if '@' in value:
-                parts = value.split('@', 1)
-                return {'front': parts[0].strip(), 'back': parts[1].strip()}
+    def _stream_sheet(self, selected_rows) -> 'StreamedSheet':
+        """헤더/선택 행/사업자번호 인덱스/크기를 수집
+
+        excel_sheet_cache에 같은 내용의 파싱 결과가 있으면 그것을 사용하고, 없으면
+        읽기 전용 모드로 시트를 한 번 순회한다. 순회할 때는 선택된 행만 문자열 리스트로
+        보관하고 나머지 행은 사업자번호 컬럼만 인덱스에 반영하므로, 메모리 사용량은
+        시트 크기가 아니라 선택 행 수에 비례한다 (이 경로는 캐시를 만들지 않음).
+        """
+        cached = peek_sheet(self.file_path, self.config.sheet_name)
+        if cached is not None:
+            return self._sheet_from_cache(cached, selected_rows)
+        
+        from openpyxl import load_workbook
+        
+        wanted = RowSelection.from_rows(selected_rows)
+        wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            if self.config.sheet_name in wb.sheetnames:
+                ws = wb[self.config.sheet_name]
             else:
-                return {'front': value, 'back': ''}
+                ws = wb.active
+                print(f"경고: '{self.config.sheet_name}' 시트를 찾을 수 없어 기본 시트({ws.title}) 사용")
+            
+            sheet = StreamedSheet()
+            index = None
+            business_number_col = None
+            
+            for row_num, values in enumerate(ws.iter_rows(values_only=True), start=1):
+                sheet.max_row = row_num
+                if len(values) > sheet.max_column:
+                    sheet.max_column = len(values)
+                
+                if row_num == 1:
+                    sheet.header = [cell_to_str(value).strip() for value in values]
+                    if self.config.business_number_column in sheet.header:
+                        business_number_col = sheet.header.index(self.config.business_number_column)
+                        index = BusinessNumberIndex()
+                    else:
+                        print(f"⚠️ '{self.config.business_number_column}' 컬럼이 없어 사업자번호 인덱스를 만들지 않습니다.")
+                    continue
+                
+                if index is not None and business_number_col < len(values):
+                    index.add(row_num, values[business_number_col])
+                
+                if row_num in wanted:
+                    sheet.rows[row_num] = [cell_to_str(value) for value in values]
+        finally:
+            wb.close()
+        
+        self.business_number_index = index
+        return sheet
+    
+    def _sheet_from_cache(self, cached, selected_rows) -> 'StreamedSheet':
+        """캐시된 시트에서 헤더/선택 행/사업자번호 인덱스/크기를 수집"""
+        if cached.title != self.config.sheet_name:
+            print(f"경고: '{self.config.sheet_name}' 시트를 찾을 수 없어 기본 시트({cached.title}) 사용")
+        
+        sheet = StreamedSheet(max_row=cached.max_row, max_column=cached.max_column)
+        self.business_number_index = None
+        if cached.max_row == 0:
+            return sheet
         
-        return value
+        sheet.header = [value.strip() for value in cached.row_values(1)]
+        self.business_number_index = _business_number_index(cached, sheet.header, self.config.business_number_column)
+        if self.business_number_index is None:
+            print(f"⚠️ '{self.config.business_number_column}' 컬럼이 없어 사업자번호 인덱스를 만들지 않습니다.")
+        
+        selection = RowSelection.from_rows(selected_rows).clip(2, cached.max_row)
+        for row_num in selection:
+            sheet.rows[row_num] = cached.row_values(row_num)
+        return sheet
     
-    def get_processed_data(self) -> List[Dict]:
+    def get_processed_data(self) -> List[ProcessedRow]:
         """처리된 데이터 반환"""
         return self.processed_data
 
 
 class StatusRecorder:
-    """상태 기록 클래스"""
+    """상태 기록 클래스
+
+    기본은 호출마다 즉시 기록하며, 버퍼 모드에서는 (행, 열, 메시지)를 모아 두었다가
+    flush() 시점에 워크북을 한 번만 열고 한 번만 저장한다.
+    writer(ExcelWriteWorker)가 지정되면 실제 기록은 작업자 스레드에서 순서대로 실행되고
+    호출은 바로 반환된다 (확인이 필요하면 wait_for_writes()).
+    """
     
-    def __init__(self, config: SheetConfig, file_path: str):
+    def __init__(self, config: SheetConfig, file_path: str, buffered: bool = False,
+                 flush_threshold: int = 0, writer: Optional[ExcelWriteWorker] = None):
+        """
+        Args:
+            buffered: True이면 처음부터 버퍼 모드로 동작
+            flush_threshold: 보류 중인 기록이 이 개수에 도달하면 자동 flush (0이면 사용 안 함)
+            writer: 백그라운드 쓰기 작업자 (None이면 호출한 스레드에서 직접 기록)
+        """
         self.config = config
         self.file_path = file_path
+        self.flush_threshold = flush_threshold
+        self.writer = writer
+        self.last_write = None  # 마지막으로 제출한 쓰기 작업 (Future)
+        self._lock = threading.Lock()  # 작업자 스레드의 실패 복구와 _pending 접근 보호
+        self._pending: Dict[Tuple[int, int], str] = {}  # (행, 열) → 메시지, 같은 셀은 마지막 값만 유지
+        self._batch_depth = 1 if buffered else 0
+        self._atexit_registered = False
+        self.business_number_index: Optional[BusinessNumberIndex] = None  # DataProcessor와 공유
+        if buffered:
+            self._register_exit_flush()
+    
+    @property
+    def is_buffering(self) -> bool:
+        """버퍼 모드 여부"""
+        return self._batch_depth > 0
+    
+    @property
+    def pending_count(self) -> int:
+        """기록 대기 중인 셀 개수"""
+        return len(self._pending)
+    
+    @contextmanager
+    def batch(self):
+        """버퍼 모드 구간 (중첩 가능, 가장 바깥 구간이 끝날 때 예외가 나도 반드시 flush)
+
+        사용 예:
+            with recorder.batch():
+                for row in rows:
+                    recorder.write_success(row)
+        """
+        self._batch_depth += 1
+        self._register_exit_flush()
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def flush(self) -> bool:
+        """보류 중인 기록을 한 번의 열기/저장으로 반영 (작업자가 있으면 제출만 하고 반환)"""
+        with self._lock:
+            if not self._pending:
+                return True
+            cells = [(row, column, message) for (row, column), message in self._pending.items()]
+            self._pending.clear()
+        
+        print(f"[FLUSH] 상태 기록 {len(cells)}건 일괄 반영 중...")
+        return self._submit_cells(cells, restore_on_failure=True)
+    
+    def wait_for_writes(self, timeout: Optional[float] = None) -> bool:
+        """보류 기록을 flush하고 제출된 쓰기가 모두 끝날 때까지 대기"""
+        self.flush()
+        if self.writer is None:
+            return True
+        return self.writer.drain(timeout)
+    
+    def _submit_cells(self, cells: List[Tuple[int, int, str]], restore_on_failure: bool = False) -> bool:
+        """작업자에게 제출 (작업자가 없거나 이미 종료되었으면 직접 기록)"""
+        result = self._submit_job(cells, restore_on_failure)
+        return True if isinstance(result, Future) else result
+    
+    def _submit_job(self, cells: List[Tuple[int, int, str]], restore_on_failure: bool = False,
+                    report: Optional[str] = None):
+        """셀 기록 작업 제출
+
+        Returns:
+            작업자가 있으면 concurrent.futures.Future(기록 결과 bool), 없으면 기록 결과
+        """
+        if self.writer is not None:
+            try:
+                self.last_write = self.writer.submit(self._write_cells_job, cells, restore_on_failure, report)
+                return self.last_write
+            except RuntimeError:
+                pass  # 종료 처리 중 - 현재 스레드에서 직접 기록
+        return self._write_cells_job(cells, restore_on_failure, report)
+    
+    def _write_cells_job(self, cells: List[Tuple[int, int, str]], restore_on_failure: bool,
+                         report: Optional[str] = None) -> bool:
+        """셀 기록 실행 - 실패한 기록은 다음 flush에서 다시 시도할 수 있도록 되돌림
+
+        report가 있으면 실제 기록이 끝난 뒤 결과를 출력한다.
+        """
+        if self._write_cells(cells):
+            if report:
+                print(f"✅ {report} 완료")
+            return True
+        
+        if restore_on_failure:
+            with self._lock:
+                for row, column, message in cells:
+                    self._pending.setdefault((row, column), message)
+        if report:
+            print(f"❌ {report} 실패")
+        return False
+    
+    def _register_exit_flush(self):
+        """비정상 종료 시에도 남은 기록을 반영하도록 atexit 등록"""
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
     
     def write_success(self, row_number: int, message: str = None) -> bool:
         """성공 상태 기록"""
@@ -512,20 +1144,51 @@ class StatusRecorder:
         """에러 상태 기록"""
         return self._write_to_excel(row_number, error_message)
     
-    def write_error_to_matching_business_numbers(self, business_number: str, error_message: str = "번호오류") -> bool:
-        """같은 사업자번호의 모든 행에 에러 기록"""
+    def write_status(self, row_number: int, message: str) -> bool:
+        """설정된 상태 컬럼에 임의의 메시지 기록"""
+        return self._write_to_excel(row_number, message)
+    
+    def write_status_to_column(self, row_number: int, message: str, column: int) -> bool:
+        """지정한 컬럼(1-based)에 메시지 기록"""
+        return self._write_to_excel(row_number, message, column)
+    
+    def find_rows_by_business_number(self, business_number: str) -> List[int]:
+        """같은 사업자번호를 가진 엑셀 행 번호 목록 (인덱스 조회)"""
+        index = self._get_business_number_index()
+        if index is None:
+            return []
+        return index.lookup(business_number)
+    
+    def _get_business_number_index(self) -> Optional[BusinessNumberIndex]:
+        """연결된 인덱스 반환 - 없으면 시트를 한 번만 읽어 생성"""
+        if self.business_number_index is not None:
+            return self.business_number_index
+        
         try:
-            df = pd.read_excel(self.file_path, sheet_name=self.config.sheet_name)
+            cached = read_sheet(self.file_path, self.config.sheet_name)
+            if cached is None or cached.max_row == 0:
+                print(f"❌ 엑셀 파일을 읽을 수 없습니다: {self.file_path}")
+                return None
             
-            # 같은 등록번호를 가진 모든 행 찾기
-            target_business_number = str(business_number).replace('-', '').strip()
-            matching_rows = []
+            headers = [value.strip() for value in cached.row_values(1)]
+            self.business_number_index = _business_number_index(cached, headers, self.config.business_number_column)
+            if self.business_number_index is None:
+                print(f"❌ '{self.config.business_number_column}' 컬럼을 찾을 수 없습니다.")
+            return self.business_number_index
             
-            for idx, row in df.iterrows():
-                row_business_number = str(row.get(self.config.business_number_column, '')).replace('-', '').strip()
-                if row_business_number == target_business_number:
-                    excel_row_number = idx + 2  # pandas index 0부터, 엑셀 1부터, 헤더 고려해서 +2
-                    matching_rows.append(excel_row_number)
+        except Exception as e:
+            print(f"❌ 사업자번호 인덱스 생성 실패: {e}")
+            return None
+    
+    def write_error_to_matching_business_numbers(self, business_number: str, error_message: str = "번호오류"):
+        """같은 사업자번호의 모든 행에 에러 기록
+
+        Returns:
+            작업자가 있으면 concurrent.futures.Future(기록 결과 bool), 없으면 기록 결과
+            (일치 행이 없거나 바깥 batch()에 보류한 경우는 bool)
+        """
+        try:
+            matching_rows = self.find_rows_by_business_number(business_number)
             
             if not matching_rows:
                 print(f"❌ 등록번호 {business_number}와 일치하는 행을 찾을 수 없습니다.")
@@ -533,87 +1196,72 @@ class StatusRecorder:
             
             print(f"발견된 일치 행들: {matching_rows}")
             
-            # 모든 일치 행에 에러 기록
-            success_count = 0
-            for row_num in matching_rows:
-                if self._write_to_excel(row_num, error_message):
-                    success_count += 1
+            if self.is_buffering:
+                # 바깥 batch() 구간이 끝날 때 함께 기록
+                for row_num in matching_rows:
+                    self._write_to_excel(row_num, error_message)
+                return True
             
-            print(f"✅ {success_count}/{len(matching_rows)}개 행에 에러 기록 완료")
-            return success_count > 0
+            # 모든 일치 행에 에러 기록 (한 번의 열기/저장) - 결과는 실제 기록이 끝난 뒤 출력
+            column = self.config.status_column
+            return self._submit_job([(row_num, column, error_message) for row_num in matching_rows],
+                                    restore_on_failure=True, report=f"{len(matching_rows)}개 행 에러 기록")
             
         except Exception as e:
             print(f"❌ 같은 등록번호 에러 기록 실패: {e}")
             return False
     
-    def _write_to_excel(self, row_number: int, message: str) -> bool:
-        """엑셀에 메시지 기록"""
+    def _write_to_excel(self, row_number: int, message: str, column: int = None) -> bool:
+        """엑셀에 메시지 기록 (버퍼 모드에서는 보류 목록에 추가)"""
+        if column is None:
+            column = self.config.status_column
+        
+        if self.is_buffering:
+            with self._lock:
+                self._pending[(row_number, column)] = message
+                reached = self.flush_threshold and len(self._pending) >= self.flush_threshold
+            if reached:
+                return self.flush()
+            return True
+        
+        return self._submit_cells([(row_number, column, message)])
+    
+    def _write_cells(self, cells: List[Tuple[int, int, str]]) -> bool:
+        """여러 셀을 한 번에 기록"""
         # 방법 1: xlwings로 열린 파일에 직접 쓰기
-        if self._write_with_xlwings(row_number, message):
+        if self._write_with_xlwings(cells):
+            return True
+        
+        # 방법 2: 닫힌 파일의 시트 XML에서 해당 셀만 교체
+        if self._write_with_patch(cells):
             return True
         
-        # 방법 2: openpyxl로 파일 수정
-        return self._write_with_openpyxl(row_number, message)
+        # 방법 3: openpyxl로 파일 수정
+        return self._write_with_openpyxl(cells)
     
-    def _write_with_xlwings(self, row_number: int, message: str) -> bool:
-        """xlwings로 열린 엑셀 파일에 기록"""
+    def _write_with_xlwings(self, cells: List[Tuple[int, int, str]]) -> bool:
+        """xlwings로 열린 엑셀 파일에 기록 (범위 단위 쓰기, 저장은 세션이 모아서 1회)"""
+        session = get_workbook_session(self.file_path)
+        if not session.write_cells(self.config.sheet_name, cells):
+            return False
+        
+        self._log_written(cells, "xlwings")
+        return True
+    
+    def _write_with_patch(self, cells: List[Tuple[int, int, str]]) -> bool:
+        """xlsx 안의 시트 XML에서 해당 셀만 교체 (다른 시트/항목은 그대로)"""
         try:
-            import xlwings as xw
-            
-            app = None
-            try:
-                app = xw.apps.active if xw.apps else None
-            except:
-                pass
-            
-            if not app:
-                try:
-                    app = xw.App(visible=True, add_book=False)
-                except:
-                    return False
-            
-            if not (app and hasattr(app, 'books')):
+            if not patch_cells(self.file_path, self.config.sheet_name, cells):
                 return False
-            
-            # 열린 워크북 찾기
-            workbook_name = os.path.basename(self.file_path)
-            wb = None
-            
-            for book in app.books:
-                if book.name == workbook_name:
-                    wb = book
-                    break
-            
-            if not wb:
-                return False
-            
-            # 해당 시트 선택
-            ws = None
-            for sheet in wb.sheets:
-                if sheet.name == self.config.sheet_name:
-                    ws = sheet
-                    break
-            
-            if not ws:
-                ws = wb.sheets[0]  # 첫 번째 시트 사용
-            
-            # 지정된 컬럼에 메시지 기록
-            col_letter = self._get_column_letter(self.config.status_column)
-            ws.range(f'{col_letter}{row_number}').value = message
-            wb.save()
-            
-            print(f"✅ 행 {row_number} {col_letter}열에 '{message}' 기록 완료 (xlwings)")
-            return True
-            
-        except ImportError:
-            print("   xlwings가 설치되지 않았습니다.")
-            return False
-        except Exception as e:
-            print(f"   xlwings 기록 실패: {e}")
+        except OSError as e:
+            print(f"   xlsx 직접 패치 실패: {e}")
             return False
+        
+        self._log_written(cells, "xlsx 패치")
+        return True
     
-    def _write_with_openpyxl(self, row_number: int, message: str) -> bool:
-        """openpyxl로 파일에 직접 기록"""
+    def _write_with_openpyxl(self, cells: List[Tuple[int, int, str]]) -> bool:
+        """openpyxl로 파일에 직접 기록 (로드/저장은 1회)"""
         try:
             from openpyxl import load_workbook
             
@@ -625,19 +1273,28 @@ class StatusRecorder:
                 worksheet = workbook.active
             
             # 지정된 컬럼에 메시지 기록
-            worksheet.cell(row=row_number, column=self.config.status_column, value=message)
+            for row_number, column, message in cells:
+                worksheet.cell(row=row_number, column=column, value=message)
             
             workbook.save(self.file_path)
             workbook.close()
             
-            col_letter = self._get_column_letter(self.config.status_column)
-            print(f"✅ 행 {row_number} {col_letter}열에 '{message}' 기록 완료 (openpyxl)")
+            self._log_written(cells, "openpyxl")
             return True
             
         except Exception as e:
             print(f"❌ openpyxl 기록 실패: {e}")
             return False
     
+    def _log_written(self, cells: List[Tuple[int, int, str]], method: str):
+        """기록 결과 출력"""
+        if len(cells) == 1:
+            row_number, column, message = cells[0]
+            col_letter = self._get_column_letter(column)
+            print(f"✅ 행 {row_number} {col_letter}열에 '{message}' 기록 완료 ({method})")
+        else:
+            print(f"✅ {len(cells)}개 셀 일괄 기록 완료 ({method})")
+    
     def _get_column_letter(self, column_number: int) -> str:
         """컬럼 번호를 문자로 변환 (1=A, 2=B, ..., 17=Q)"""
         if column_number <= 26:
@@ -652,11 +1309,16 @@ class StatusRecorder:
 class ExcelUnifiedProcessor:
     """엑셀 데이터 통합 처리 메인 클래스"""
     
-    def __init__(self, sheet_type: str = "partner"):
+    def __init__(self, sheet_type: str = "partner", status_buffer: bool = False,
+                 status_flush_threshold: int = 0, background_writes: bool = False):
         """
         Args:
             sheet_type: "partner" (거래처) 또는 "transaction" (거래명세표)
+            status_buffer: True이면 상태 기록을 모아 두었다가 flush_status()/종료 시 일괄 저장
+            status_flush_threshold: 버퍼 모드에서 자동 flush할 보류 기록 개수 (0이면 사용 안 함)
+            background_writes: True이면 엑셀 쓰기를 공용 작업자 스레드에서 실행 (이벤트 루프 비차단)
         """
+        self.sheet_type = sheet_type
         if sheet_type == "partner":
             self.config = SheetConfig.get_partner_config()
         elif sheet_type == "transaction":
@@ -664,6 +1326,10 @@ class ExcelUnifiedProcessor:
         else:
             raise ValueError("sheet_type must be 'partner' or 'transaction'")
         
+        self.status_buffer = status_buffer
+        self.status_flush_threshold = status_flush_threshold
+        self.writer: Optional[ExcelWriteWorker] = get_excel_writer() if background_writes else None
+        
         self.file_manager = ExcelFileManager(self.config)
         self.row_selector = None
         self.data_processor = None
@@ -671,6 +1337,10 @@ class ExcelUnifiedProcessor:
         
         self.selected_rows = None
         self.processed_data = []
+        
+        # 중단된 실행 이어서 처리
+        self.checkpoint: Optional[RunCheckpoint] = None
+        self.resumed = False
     
     def initialize(self) -> bool:
         """초기화 - 파일 열기 및 컴포넌트 생성"""
@@ -684,16 +1354,23 @@ class ExcelUnifiedProcessor:
         # 컴포넌트 초기화
         self.row_selector = RowSelector(self.config, excel_file_path)
         self.data_processor = DataProcessor(self.config, excel_file_path)
-        self.status_recorder = StatusRecorder(self.config, excel_file_path)
+        self.status_recorder = StatusRecorder(self.config, excel_file_path,
+                                              buffered=self.status_buffer,
+                                              flush_threshold=self.status_flush_threshold,
+                                              writer=self.writer)
+        self.checkpoint = RunCheckpoint(self.sheet_type, excel_file_path)
         
         return True
     
     def select_rows(self) -> bool:
-        """행 선택"""
+        """행 선택 (끝나지 않은 이전 실행이 있으면 이어서 처리할지 먼저 확인)"""
         if not self.row_selector:
             print("❌ row_selector가 초기화되지 않았습니다.")
             return False
         
+        if self._resume_from_checkpoint():
+            return True
+        
         if not self.row_selector.show_row_selection_gui():
             print("❌ 행 선택이 취소되었습니다.")
             return False
@@ -713,8 +1390,85 @@ class ExcelUnifiedProcessor:
             return False
         
         self.processed_data = self.data_processor.get_processed_data()
+        
+        # 에러 기록 시 시트를 다시 읽지 않도록 인덱스 공유
+        if self.status_recorder and self.data_processor.business_number_index is not None:
+            self.status_recorder.business_number_index = self.data_processor.business_number_index
+        
+        self._start_checkpoint()
         return True
     
+    def _resume_from_checkpoint(self) -> bool:
+        """끝나지 않은 체크포인트가 있고 사용자가 이어서 처리를 선택하면 저장된 행 선택 사용"""
+        checkpoint = self.checkpoint
+        if checkpoint is None or not checkpoint.exists or not checkpoint.selection:
+            return False
+        
+        root = tk.Tk()
+        root.withdraw()
+        root.attributes('-topmost', True)
+        resume = messagebox.askyesno(
+            "이어서 처리",
+            f"완료되지 않은 이전 실행이 있습니다.\n\n{checkpoint.summary()}\n\n"
+            "완료된 항목은 건너뛰고 이어서 처리할까요?\n(아니오: 새로 행 선택)",
+            parent=root
+        )
+        root.destroy()
+        
+        if not resume:
+            checkpoint.discard()
+            return False
+        
+        selection = RowSelection.parse(checkpoint.selection, silent=True)
+        if not selection:
+            checkpoint.discard()
+            return False
+        
+        self.selected_rows = self.row_selector.selected_rows = selection
+        self.resumed = True
+        print(f"✅ 이전 실행 이어서 처리: {selection}")
+        return True
+    
+    def _start_checkpoint(self):
+        """선택 데이터 지문 확인 후 체크포인트 시작 (이어서 처리 중이면 기존 진행 상황 유지)"""
+        if self.checkpoint is None:
+            return
+        
+        headers = self.data_processor.headers or []
+        status_column = self.config.status_column
+        ignore = [headers[status_column - 1]] if 0 < status_column <= len(headers) else []
+        fingerprint = selection_fingerprint(((item.row_number, item.data) for item in self.processed_data), ignore)
+        
+        if self.resumed:
+            if fingerprint == self.checkpoint.fingerprint:
+                print(f"✅ 완료된 {len(self.checkpoint.completed)}건은 건너뜁니다.")
+                return
+            print("⚠️ 이전 실행 이후 선택한 행의 데이터가 바뀌어 처음부터 처리합니다.")
+            self.resumed = False
+        self.checkpoint.start(str(self.selected_rows), fingerprint)
+    
+    def is_group_completed(self, key: str) -> bool:
+        """이어서 처리 중 이미 완료된 그룹인지"""
+        return self.checkpoint is not None and self.checkpoint.is_completed(key)
+    
+    def mark_group_completed(self, key: str) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.mark_completed(key)
+    
+    def mark_group_failed(self, key: str, reason: str = "") -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.mark_failed(key, reason)
+    
+    def finish_run(self) -> None:
+        """실행 종료 - 실패한 그룹이 없으면 체크포인트 삭제, 있으면 다음 실행에서 다시 시도하도록 유지"""
+        if self.checkpoint is None or not self.checkpoint.exists:
+            return
+        failed = self.checkpoint.failed
+        if failed:
+            print(f"⚠️ 실패 {len(failed)}건 - 다음 실행에서 이어서 처리할 수 있습니다.")
+        else:
+            self.checkpoint.finish()
+    
     def record_success(self, row_number: int, message: str = None) -> bool:
         """성공 상태 기록"""
         if not self.status_recorder:
@@ -731,21 +1485,93 @@ class ExcelUnifiedProcessor:
         
         return self.status_recorder.write_error(row_number, error_message)
     
-    def record_error_for_business_number(self, business_number: str, error_message: str = "번호오류") -> bool:
-        """같은 사업자번호의 모든 행에 에러 기록"""
+    def record_error_for_business_number(self, business_number: str, error_message: str = "번호오류"):
+        """같은 사업자번호의 모든 행에 에러 기록 (작업자가 있으면 Future 반환 - StatusRecorder 참고)"""
         if not self.status_recorder:
             print("❌ status_recorder가 초기화되지 않았습니다.")
             return False
         
         return self.status_recorder.write_error_to_matching_business_numbers(business_number, error_message)
     
-    def get_processed_data(self) -> List[Dict]:
+    @contextmanager
+    def status_batch(self):
+        """상태 기록을 묶어서 한 번의 열기/저장으로 반영하는 구간"""
+        if not self.status_recorder:
+            print("❌ status_recorder가 초기화되지 않았습니다.")
+            yield None
+            return
+        
+        with self.status_recorder.batch() as recorder:
+            yield recorder
+    
+    def flush_status(self) -> bool:
+        """보류 중인 상태 기록 즉시 반영"""
+        if not self.status_recorder:
+            return True
+        return self.status_recorder.flush()
+    
+    def submit_write(self, fn: Callable[..., Any], *args, **kwargs):
+        """임의의 엑셀 쓰기 작업을 상태 기록과 같은 순서로 실행 (작업자가 없으면 즉시 실행)
+
+        Returns:
+            작업자가 있으면 concurrent.futures.Future, 없으면 fn의 반환값
+        """
+        if self.writer is None:
+            return fn(*args, **kwargs)
+        return self.writer.submit(fn, *args, **kwargs)
+    
+    def wait_for_writes(self, timeout: Optional[float] = None) -> bool:
+        """보류/제출된 엑셀 쓰기가 모두 끝날 때까지 대기"""
+        if self.status_recorder:
+            self.status_recorder.flush()
+        if self.writer is None:
+            return True
+        return self.writer.drain(timeout)
+    
+    async def wait_for_writes_async(self) -> None:
+        """코루틴용 wait_for_writes - 이벤트 루프를 막지 않음"""
+        if self.status_recorder:
+            self.status_recorder.flush()
+        if self.writer is not None:
+            await self.writer.drain_async()
+    
+    def find_rows_by_business_number(self, business_number: str) -> List[int]:
+        """같은 사업자번호를 가진 엑셀 행 번호 목록"""
+        if not self.status_recorder:
+            print("❌ status_recorder가 초기화되지 않았습니다.")
+            return []
+        
+        return self.status_recorder.find_rows_by_business_number(business_number)
+    
+    def get_processed_data(self) -> List[ProcessedRow]:
         """처리된 데이터 반환"""
         return self.processed_data
     
-    def get_selected_rows(self) -> List[int]:
+    def get_selected_rows(self) -> 'RowSelection':
         """선택된 행 반환"""
-        return self.selected_rows or []
+        return self.selected_rows or RowSelection()
+    
+    def select_file_and_process(self) -> Optional[Dict[str, Any]]:
+        """파일 열기 → 행 선택 → 데이터 처리를 한 번에 수행
+
+        Returns:
+            selected_rows / selected_data(행 + 'excel_row' 키) / excel_file_path / headers,
+            실패 또는 취소 시 None
+        """
+        if not self.initialize():
+            return None
+        if not self.select_rows():
+            return None
+        if not self.process_data():
+            return None
+        
+        selected_data = [SelectedRow(item.data, item.row_number) for item in self.processed_data]
+        return {
+            'selected_rows': self.selected_rows,
+            'selected_data': selected_data,
+            'excel_file_path': self.file_manager.excel_file_path,
+            'headers': self.data_processor.headers,
+        }
 
 
 # 편의 함수
@@ -753,9 +1579,9 @@ def create_partner_processor() -> ExcelUnifiedProcessor:
     """거래처 시트용 프로세서 생성"""
     return ExcelUnifiedProcessor("partner")
 
-def create_transaction_processor() -> ExcelUnifiedProcessor:
+def create_transaction_processor(**kwargs) -> ExcelUnifiedProcessor:
     """거래명세표 시트용 프로세서 생성"""
-    return ExcelUnifiedProcessor("transaction")
+    return ExcelUnifiedProcessor("transaction", **kwargs)
 
 
 if __name__ == "__main__":
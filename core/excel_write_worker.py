@@ -0,0 +1,234 @@
+# 📁 C:\APP\tax-bill\core\excel_write_worker.py
+# -*- coding: utf-8 -*-
+"""
+엑셀 쓰기 전용 백그라운드 작업자
+
+openpyxl 저장/xlwings COM 호출은 수백 ms~수 초가 걸리므로 Playwright 코루틴에서
+직접 호출하면 이벤트 루프가 멈추고 page.once("dialog", ...) 핸들러가 대화상자를
+놓칠 수 있다. 모든 엑셀 쓰기를 하나의 전용 스레드에서 제출 순서대로 실행하고,
+호출 측은 결과(Future)를 확인이 필요할 때만 기다린다.
+
+- 순서 보장: 단일 스레드 + FIFO 큐
+- 역압(backpressure): 큐가 가득 차면 submit()은 대기, submit_async()는 루프를 막지 않고 대기
+  (이벤트 루프 스레드에서 호출된 submit()은 루프를 멈추지 않도록 한도를 넘겨서라도 바로 넣음)
+- 종료 보장: drain()/shutdown()은 남은 작업을 모두 처리하며, 프로세스 종료 시 자동 호출
+- 유휴 작업: call_when_idle()로 등록한 콜백(예: 지연 저장)은 큐가 idle_delay 동안
+  비어 있을 때, 또는 drain()/shutdown() 시 한 번 실행된다
+"""
+
+import asyncio
+import atexit
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+_STOP = object()
+
+# 작업자 스레드에서 실행 중인 작업이 자신의 작업자를 찾을 수 있도록 보관
+_thread_state = threading.local()
+
+
+class ExcelWriteWorker:
+    """엑셀 쓰기 작업을 순서대로 처리하는 단일 스레드 작업자"""
+
+    def __init__(self, max_pending: int = 32, name: str = "excel-writer", idle_delay: float = 0.5):
+        self.name = name
+        self.idle_delay = idle_delay
+        self._queue: "queue.Queue" = queue.Queue()
+        self._slots = threading.Semaphore(max_pending)  # 대기 작업 수 한도 (꺼내는 시점에 반환)
+        self._idle_callbacks: Dict[Any, Callable[[], Any]] = {}  # 작업자 스레드에서만 접근
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.last_future: Optional[Future] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending_count(self) -> int:
+        """대기 중인 작업 수 (실행 중인 작업 제외)"""
+        return self._queue.qsize()
+
+    def start(self) -> 'ExcelWriteWorker':
+        """작업 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("종료된 엑셀 쓰기 작업자입니다.")
+            if not self.is_running:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+        return self
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """작업 제출 (큐가 가득 차면 빈자리가 날 때까지 대기)
+
+        이벤트 루프가 돌고 있는 스레드나 작업자 스레드에서 호출되면 기다리지 않는다.
+        코루틴 안의 동기 API(상태 기록 등)가 루프를 멈추지 않게 하기 위함이며,
+        역압이 필요한 코루틴은 submit_async()를 사용한다.
+        """
+        future, item = self._prepare(fn, args, kwargs)
+        must_not_block = _in_event_loop() or threading.current_thread() is self._thread
+        holds_slot = self._slots.acquire(blocking=not must_not_block)
+        self._queue.put(item + (holds_slot,))
+        return future
+
+    async def submit_async(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """코루틴용 작업 제출 - 큐가 가득 차도 이벤트 루프를 막지 않음"""
+        future, item = self._prepare(fn, args, kwargs)
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        self._queue.put(item + (True,))
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """작업을 제출하고 완료될 때까지 (루프를 막지 않고) 기다려 결과 반환"""
+        future = await self.submit_async(fn, *args, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    def call_when_idle(self, callback: Callable[[], Any], key: Any = None) -> None:
+        """큐가 잠시 비었을 때 한 번 실행할 콜백 등록 (같은 key는 한 번만, 작업자 스레드에서 호출)"""
+        self._idle_callbacks[callback if key is None else key] = callback
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """제출된 작업과 유휴 콜백이 모두 끝날 때까지 대기 (timeout 초과 시 False)"""
+        if self._closed or not self.is_running:
+            return self._queue.unfinished_tasks == 0
+        if threading.current_thread() is self._thread:
+            self._run_idle_callbacks()
+            return True
+
+        barrier = self.submit(self._run_idle_callbacks)
+        try:
+            barrier.result(timeout)
+        except FutureTimeoutError:
+            return False
+        except Exception:
+            pass
+        return True
+
+    async def drain_async(self) -> None:
+        """코루틴용 drain - 이벤트 루프를 막지 않음"""
+        if self._closed or not self.is_running:
+            return
+        barrier = await self.submit_async(self._run_idle_callbacks)
+        try:
+            await asyncio.wrap_future(barrier)
+        except Exception:
+            pass
+
+    def shutdown(self, wait: bool = True) -> None:
+        """남은 작업을 모두 처리한 뒤 스레드 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            atexit.unregister(self.shutdown)
+        except Exception:
+            pass
+
+        if self.is_running:
+            self._queue.put(_STOP)
+            if wait:
+                self._thread.join()
+
+    # 내부 구현
+    def _prepare(self, fn, args, kwargs):
+        if self._closed:
+            raise RuntimeError("종료된 엑셀 쓰기 작업자입니다.")
+        if not self.is_running:
+            self.start()
+        future: Future = Future()
+        self.last_future = future
+        return future, (future, fn, args, kwargs)
+
+    def _run(self):
+        _thread_state.worker = self
+        com_initialized = _co_initialize()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.idle_delay if self._idle_callbacks else None)
+                except queue.Empty:
+                    self._run_idle_callbacks()
+                    continue
+                try:
+                    if item is _STOP:
+                        self._run_idle_callbacks()
+                        return
+                    future, fn, args, kwargs, holds_slot = item
+                    if holds_slot:
+                        self._slots.release()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        print(f"❌ 엑셀 쓰기 작업 실패: {e}")
+                        future.set_exception(e)
+                finally:
+                    self._queue.task_done()
+        finally:
+            if com_initialized:
+                _co_uninitialize()
+
+    def _run_idle_callbacks(self):
+        callbacks = list(self._idle_callbacks.values())
+        self._idle_callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"❌ 엑셀 유휴 작업 실패: {e}")
+
+
+def _in_event_loop() -> bool:
+    """현재 스레드에서 asyncio 이벤트 루프가 실행 중인지"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _co_initialize() -> bool:
+    """xlwings(COM) 호출을 위해 작업 스레드에서 COM 초기화 (Windows 전용, 실패해도 무시)"""
+    try:
+        import pythoncom
+    except ImportError:
+        return False
+    try:
+        pythoncom.CoInitialize()
+        return True
+    except Exception:
+        return False
+
+
+def _co_uninitialize() -> None:
+    try:
+        import pythoncom
+        pythoncom.CoUninitialize()
+    except Exception:
+        pass
+
+
+def current_worker() -> Optional[ExcelWriteWorker]:
+    """현재 스레드가 작업자 스레드이면 그 작업자, 아니면 None"""
+    return getattr(_thread_state, 'worker', None)
+
+
+_default_writer: Optional[ExcelWriteWorker] = None
+_default_lock = threading.Lock()
+
+
+def get_excel_writer() -> ExcelWriteWorker:
+    """프로세스 공용 엑셀 쓰기 작업자 (같은 파일에 대한 쓰기가 한 줄로 처리되도록 공유)"""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None or _default_writer._closed:
+            _default_writer = ExcelWriteWorker().start()
+        return _default_writer
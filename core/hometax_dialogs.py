@@ -0,0 +1,172 @@
+# 📁 C:\APP\tax-bill\core\hometax_dialogs.py
+# -*- coding: utf-8 -*-
+"""
+홈택스 대화상자(alert/confirm) 라우터
+
+페이지마다 하나의 page.on("dialog") 리스너가 모든 대화상자를 받아 분류하고 바로 응답한 뒤,
+기다리고 있는 쪽(DialogExpectation)에 전달한다. 흐름은 버튼을 누르기 전에 필요한 대화상자를
+expect()로 등록하고, 마지막 대화상자가 오거나 오류 메시지가 오는 즉시 대기를 끝낸다.
+
+- 분류: 오류 / 확인 요청 / 성공 / 품목 등록 안내 / 담당자 추가 안내 / 기타
+- 응답: 품목 등록·담당자 추가 안내는 취소(dismiss), 그 밖에는 확인(accept)
+- 리스너가 하나뿐이므로 page.once 핸들러를 겹쳐 등록할 때처럼 대화상자를 놓치거나
+  두 번 응답하지 않는다 (버튼 클릭 전에 expect()하면 클릭 직후 뜬 대화상자도 받는다)
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+ERROR = 'error'
+CONFIRM = 'confirm'
+SUCCESS = 'success'
+ITEM_PROMPT = 'item_prompt'        # "품목 등록" 안내 (거래처 등록 후)
+CONTACT_PROMPT = 'contact_prompt'  # "담당자를 추가 등록" 안내 (거래처 등록 후)
+INFO = 'info'
+
+# 앞에 있는 분류부터 확인 ("비정상적인 등록번호"가 성공의 "정상적인"에 걸리지 않도록 오류 먼저)
+_RULES = (
+    (ITEM_PROMPT, ("품목 등록",)),
+    (CONTACT_PROMPT, ("담당자를 추가 등록",)),
+    (ERROR, ("비정상", "입력하세요", "오류", "실패", "이미 등록된", "할 수 없습니다", "잘못")),
+    (CONFIRM, ("하시겠습니까",)),
+    (SUCCESS, ("정상적인", "완료", "되었습니다", "처리되었", "저장되었", "등록되었", "성공")),
+)
+
+# 취소(dismiss)로 응답하는 분류
+DISMISS_KINDS = (ITEM_PROMPT, CONTACT_PROMPT)
+
+
+def classify_dialog(message: str) -> str:
+    """대화상자 메시지 분류"""
+    text = message or ""
+    for kind, keywords in _RULES:
+        if any(keyword in text for keyword in keywords):
+            return kind
+    return INFO
+
+
+@dataclass
+class DialogEvent:
+    """처리한 대화상자 하나"""
+    kind: str
+    message: str
+    dialog_type: str = "alert"
+    accepted: bool = True
+
+
+class DialogExpectation:
+    """기다리는 대화상자 묶음
+
+    count개를 받거나, until 분류를 받거나, stop_on 분류(기본: 오류)를 받으면 완료.
+    """
+
+    def __init__(self, router: 'DialogRouter', count: Optional[int], until: Sequence[str],
+                 stop_on: Sequence[str]):
+        self._router = router
+        self.count = count
+        self.until = tuple(until)
+        self.stop_on = tuple(stop_on)
+        self.events: List[DialogEvent] = []
+        self._done = asyncio.get_running_loop().create_future()
+
+    @property
+    def done(self) -> bool:
+        return self._done.done()
+
+    @property
+    def complete(self) -> bool:
+        """오류 없이 기다리던 대화상자를 모두 받았는지"""
+        return self.done and self.error is None
+
+    @property
+    def succeeded(self) -> bool:
+        """오류 없이 끝났고 마지막 대화상자가 성공 알림인지 (안내/확인 요청만 받았으면 False)"""
+        return self.complete and self.last is not None and self.last.kind == SUCCESS
+
+    @property
+    def error(self) -> Optional[DialogEvent]:
+        return next((event for event in self.events if event.kind in self.stop_on), None)
+
+    @property
+    def last(self) -> Optional[DialogEvent]:
+        return self.events[-1] if self.events else None
+
+    @property
+    def messages(self) -> List[str]:
+        return [event.message for event in self.events]
+
+    def _feed(self, event: DialogEvent) -> None:
+        if self.done:
+            return
+        self.events.append(event)
+        if (event.kind in self.stop_on or event.kind in self.until
+                or (self.count is not None and len(self.events) >= self.count)):
+            self._done.set_result(self.events)
+
+    async def wait(self, timeout: float) -> List[DialogEvent]:
+        """완료되거나 timeout(초)이 지날 때까지 대기하고 받은 대화상자 목록 반환"""
+        try:
+            await asyncio.wait_for(asyncio.shield(self._done), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.close()
+        return list(self.events)
+
+    def close(self) -> None:
+        """기다리지 않고 대기 등록 해제 (이후 대화상자는 받지 않음)"""
+        self._router._discard(self)
+
+
+class DialogRouter:
+    """페이지 하나의 모든 대화상자를 받아 분류/응답하고 기다리는 쪽에 전달"""
+
+    def __init__(self, page, dismiss_kinds: Sequence[str] = DISMISS_KINDS,
+                 classify: Callable[[str], str] = classify_dialog):
+        self.page = page
+        self.dismiss_kinds = tuple(dismiss_kinds)
+        self.classify = classify
+        self.history: List[DialogEvent] = []
+        self._expectations: List[DialogExpectation] = []
+        page.on("dialog", self._on_dialog)
+
+    @classmethod
+    def for_page(cls, page) -> 'DialogRouter':
+        """페이지의 라우터 (없으면 만들어 리스너 등록)"""
+        router = getattr(page, '_hometax_dialog_router', None)
+        if router is None:
+            router = cls(page)
+            page._hometax_dialog_router = router
+        return router
+
+    def expect(self, count: Optional[int] = 1, until: Sequence[str] = (),
+               stop_on: Sequence[str] = (ERROR,)) -> DialogExpectation:
+        """이후에 올 대화상자 대기 등록 (버튼 클릭 전에 호출)"""
+        expectation = DialogExpectation(self, count, until, stop_on)
+        self._expectations.append(expectation)
+        return expectation
+
+    async def _on_dialog(self, dialog) -> None:
+        message = dialog.message
+        kind = self.classify(message)
+        accept = kind not in self.dismiss_kinds
+        try:
+            if accept:
+                await dialog.accept()
+            else:
+                await dialog.dismiss()
+        except Exception as e:
+            print(f"   [WARN] 대화상자 응답 실패: {e}")
+
+        event = DialogEvent(kind, message, getattr(dialog, 'type', 'alert'), accept)
+        self.history.append(event)
+        print(f"   [ALERT] ({kind}{'' if accept else ', 취소'}) {message}")
+        for expectation in list(self._expectations):
+            expectation._feed(event)
+
+    def _discard(self, expectation: DialogExpectation) -> None:
+        try:
+            self._expectations.remove(expectation)
+        except ValueError:
+            pass
@@ -39,6 +39,9 @@ from hometax_security_manager import HomeTaxSecurityManager
 
 # 통합 엑셀 처리 모듈 import
 from excel_unified_processor import create_partner_processor
+from excel_sheet_cache import read_sheet
+from hometax_wait import settle, track_network, wait_for_state, wait_until_ready
+from hometax_dialogs import DialogRouter
 
 # 간단한 에러 처리 시스템
 class ErrorCode:
@@ -115,19 +118,11 @@ class ExcelRowSelector:
         # 첫 번째 행의 첫 번째 열 값 저장 (기존 로직 유지)
         if self.selected_rows and self.excel_file_path:
             try:
-                import pandas as pd
-                from openpyxl import load_workbook
-                
-                wb = load_workbook(self.excel_file_path)
-                ws = wb.active
-                max_row = ws.max_row
-                
-                df = pd.read_excel(self.excel_file_path, sheet_name="거래처", header=None, dtype=str, 
-                                 keep_default_na=False, engine='openpyxl', na_filter=False, nrows=max_row)
+                sheet = read_sheet(self.excel_file_path, "거래처")
                 
                 first_row = self.selected_rows[0]
-                if first_row <= len(df) and len(df.columns) > 0:
-                    self.selected_data = df.iloc[first_row-1, 0]
+                if sheet is not None and first_row <= sheet.max_row and sheet.max_column > 0:
+                    self.selected_data = sheet.row_values(first_row)[0]
                 else:
                     self.selected_data = None
                     
@@ -300,7 +295,7 @@ async def prepare_next_registration(main_page):
             except:
                 pass
             
-            await main_page.wait_for_timeout(1000)
+            await wait_until_ready(main_page, 1000)
             return True
             
         except:
@@ -339,7 +334,7 @@ async def fill_hometax_form(main_page, row_data, field_mapping, excel_selector,
                 await element.wait_for(state="visible", timeout=1000)
                 await element.clear()
                 await element.fill(str(business_number))
-                await main_page.wait_for_timeout(1000)
+                await wait_until_ready(main_page, 1000)
                 
                 success_count += 1
                 
@@ -376,7 +371,6 @@ async def fill_hometax_form(main_page, row_data, field_mapping, excel_selector,
                 try:
                     await element.clear(timeout=1000)
                     await element.fill(str(value), timeout=1000)
-                    await main_page.wait_for_timeout(200)
                     success_count += 1
                     continue  # 성공하면 다음 필드로
                 except Exception as normal_error:
@@ -408,25 +402,8 @@ async def fill_hometax_form(main_page, row_data, field_mapping, excel_selector,
         # 5. 최종 등록 버튼 클릭 및 Alert 처리
         try:
             
-            # Alert 리스너 설정
-            alert_handled = False
-            alert_message = ""
-            
-            async def handle_final_alert(dialog):
-                nonlocal alert_handled, alert_message
-                alert_message = dialog.message
-                
-                # 품목 등록 또는 담당자 추가 Alert인 경우 취소 클릭
-                if "품목 등록" in alert_message:
-                    await dialog.dismiss()  # 취소 버튼 클릭
-                elif "담당자를 추가 등록" in alert_message:
-                    await dialog.dismiss()  # 취소 버튼 클릭
-                else:
-                    await dialog.accept()  # 확인 버튼 클릭
-                
-                alert_handled = True
-
-            main_page.on("dialog", handle_final_alert)
+            # 등록 결과 Alert 대기 등록 (품목 등록/담당자 추가 안내는 라우터가 취소 클릭)
+            expectation = DialogRouter.for_page(main_page).expect(count=1)
 
             # 등록 버튼 클릭 (여러 방법 시도)
             register_btn = main_page.locator("#mf_txppWframe_btnRgt").first
@@ -445,15 +422,8 @@ async def fill_hometax_form(main_page, row_data, field_mapping, excel_selector,
                     except Exception as e3:
                         raise Exception("모든 등록 버튼 클릭 방법이 실패했습니다")
 
-            # Alert 대기 (더 긴 시간)
-            for i in range(100): # 10초 대기
-                if alert_handled:
-                    break
-                if i % 10 == 0:
-                    pass
-                await main_page.wait_for_timeout(100)
-
-            main_page.remove_listener("dialog", handle_final_alert)
+            # Alert 대기 (뜨는 즉시 진행, 최대 10초)
+            alert_handled = bool(await expectation.wait(10.0))
 
             if alert_handled:
                 # 등록 성공 시 엑셀 파일에 오늘 날짜 기록
@@ -476,6 +446,9 @@ async def handle_business_number_validation(main_page, business_number, excel_se
     try:
         confirm_btn = main_page.locator("#mf_txppWframe_btnValidCheck").first
         
+        # 확인 결과 Alert 대기 등록 (클릭 직후나 종사업장 선택 후 뜬 Alert도 받음)
+        expectation = DialogRouter.for_page(main_page).expect(count=1)
+        
         try:
             await confirm_btn.click(timeout=1000)
         except:
@@ -485,9 +458,11 @@ async def handle_business_number_validation(main_page, business_number, excel_se
                 try:
                     await main_page.evaluate("document.getElementById('mf_txppWframe_btnValidCheck').click()")
                 except:
+                    expectation.close()
                     return
 
-        await main_page.wait_for_timeout(1000)
+        # 확인 요청 처리(처리 중 표시)가 끝날 때까지 대기
+        await wait_until_ready(main_page, 3000)
         
         workplace_popup_selectors = [
             "#mf_txppWframe_ABTIBsnoUnitPopup2",
@@ -523,48 +498,19 @@ async def handle_business_number_validation(main_page, business_number, excel_se
                 except:
                     break
             
-            alert_handled = False
-            alert_message = ""
-            
-            async def handle_workplace_alert(dialog):
-                nonlocal alert_handled, alert_message
-                alert_message = dialog.message
-                await dialog.accept()
-                alert_handled = True
-            
-            main_page.on("dialog", handle_workplace_alert)
-            
-            for i in range(50):
-                if alert_handled:
-                    break
-                await main_page.wait_for_timeout(100)
-            
-            main_page.remove_listener("dialog", handle_workplace_alert)
+            # 종사업장 선택 후 Alert 대기 (최대 5초)
+            await expectation.wait(5.0)
             
         else:
-            alert_handled = False
-            alert_message = ""
-            
-            async def handle_alert(dialog):
-                nonlocal alert_handled, alert_message
-                alert_message = dialog.message
-                await dialog.accept()
-                alert_handled = True
-            
-            main_page.on("dialog", handle_alert)
-            
-            for i in range(50):
-                if alert_handled:
-                    break
-                await main_page.wait_for_timeout(100)
+            # Alert 대기 (뜨는 즉시 진행, 최대 5초)
+            events = await expectation.wait(5.0)
             
-            main_page.remove_listener("dialog", handle_alert)
-            
-            if alert_handled:
+            if events:
+                alert_message = events[-1].message
                 if "비정상적인 등록번호" in alert_message or "이미 등록된 사업자등록번호" in alert_message:
                     raise Exception(f"SKIP_TO_NEXT_ROW|{alert_message}")
         
-        await main_page.wait_for_timeout(2000)
+        await wait_until_ready(main_page, 3000)
         
         try:
             await main_page.wait_for_selector("#mf_txppWframe_txtTnmNm:not([disabled])", timeout=1000)
@@ -595,7 +541,7 @@ async def handle_other_special_fields(main_page, row_data, field_mapping):
                     direct_btn = main_page.locator("#mf_txppWframe_btnSubEmailDirect").first
                 
                 await direct_btn.click(timeout=1000)
-                await main_page.wait_for_timeout(300)
+                await wait_until_ready(main_page, 1000)
             except:
                 pass
 
@@ -700,11 +646,12 @@ async def main():
         playwright = await async_playwright().start()
         browser = await playwright.chromium.launch(headless=False)
         page = await browser.new_page()
+        track_network(page)  # settle()이 클릭 뒤 요청을 기다릴 수 있도록 첫 요청 전에 추적 시작
         main_page = page
         main_browser = browser
         
         await page.goto("https://hometax.go.kr/websquare/websquare.html?w2xPath=/ui/pp/index_pp.xml&menuCd=index3")
-        await page.wait_for_timeout(6000)
+        await settle(page, 6000)
         
         # 환경설정 로드
         login_mode, password = load_env_settings()
@@ -968,14 +915,14 @@ async def main():
         except:
             pass
         
-        await page.wait_for_timeout(2000)
+        await wait_until_ready(page, 3000)
         
         # 5. 계산서·영수증·카드 메뉴 클릭 (메인 페이지에서만 수행)
         try:
             await page.wait_for_selector("#mf_wfHeader_wq_uuid_359", timeout=30000)
             await page.click("#mf_wfHeader_wq_uuid_359")
             print("✅ 계산서·영수증·카드 메뉴 클릭 완료")
-            await page.wait_for_timeout(3000)
+            await wait_for_state(main_page.locator("#menuAtag_4601020000 > span"), "visible", 5000)
         except Exception as e:
             print(f"❌ 메뉴 클릭 실패: {e}")
             # raise 제거하고 계속 진행
@@ -983,7 +930,7 @@ async def main():
         try:
             await main_page.click("#menuAtag_4601020000 > span")
             print("✅ 거래처 및 품목관리 메뉴 클릭 성공")
-            await main_page.wait_for_timeout(1000)
+            await wait_for_state(main_page.locator("#menuAtag_4601020100 > span"), "visible", 3000)
         except Exception as sub_menu_error:
             print(f"⚠️ 거래처 및 품목관리 메뉴 클릭 오류: {str(sub_menu_error)}")
         
@@ -992,7 +939,7 @@ async def main():
         try:
             await main_page.click("#menuAtag_4601020100 > span")
             print("✅ 전자세금계산서 거래처 메뉴 클릭 성공")
-            await main_page.wait_for_timeout(1000)
+            await wait_for_state(main_page.locator("#mf_txppWframe_textbox1395"), "visible", 5000)
         except Exception as final_menu_error:
             print(f"⚠️ 전자세금계산서 거래처 메뉴 클릭 오류: {str(final_menu_error)}")
 
@@ -1001,7 +948,7 @@ async def main():
         try:
             await main_page.click("#mf_txppWframe_textbox1395")
             print("✅ 건별 등록 버튼 클릭 성공")
-            await main_page.wait_for_timeout(1000)
+            await wait_until_ready(main_page, 3000)
         except Exception as register_button_error:
             print(f"⚠️ 건별 등록 버튼 클릭 오류: {str(register_button_error)}")
 
@@ -1015,9 +962,17 @@ async def main():
             success_count = 0
             failed_count = 0
             
+            skipped_count = 0
+            
             for idx, row_info in enumerate(excel_selector.processed_data):
                 current_row_number = row_info['row_number']
                 row_data = row_info['data']
+                checkpoint_key = f"row:{current_row_number}"
+                
+                # 이전 실행에서 등록 완료된 행은 브라우저 작업 없이 건너뜀
+                if excel_selector.processor.is_group_completed(checkpoint_key):
+                    skipped_count += 1
+                    continue
                 
                 try:
                     # 각 거래처에 대해 폼 입력 실행
@@ -1029,16 +984,23 @@ async def main():
                     
                     if success_count_fields > 0:
                         success_count += 1
+                        excel_selector.processor.mark_group_completed(checkpoint_key)
                     else:
                         failed_count += 1
+                        excel_selector.processor.mark_group_failed(checkpoint_key, "입력 실패")
                         
                 except:
                     failed_count += 1
                     excel_selector.write_error_to_excel(current_row_number, "error")
+                    excel_selector.processor.mark_group_failed(checkpoint_key, "error")
                 
-                # 다음 거래처 등록을 위한 대기
+                # 다음 거래처 등록을 위한 대기 (화면 초기화 완료까지, 최대 3초)
                 if idx < len(excel_selector.processed_data) - 1:
-                    await main_page.wait_for_timeout(3000)
+                    await settle(main_page, 3000)
+            
+            if skipped_count:
+                print(f"⏭️ 이전 실행에서 완료되어 건너뛴 거래처: {skipped_count}건")
+            excel_selector.processor.finish_run()
                 
         except:
             pass
@@ -0,0 +1,190 @@
+# 📁 C:\APP\tax-bill\core\hometax_wait.py
+# -*- coding: utf-8 -*-
+"""
+홈택스 화면 준비 상태 대기
+
+고정 시간 대기(wait_for_timeout) 대신 화면이 실제로 준비되었는지를 조건으로 기다린다.
+조건이 만족되면 바로 다음 단계로 넘어가고, 만족되지 않아도 timeout(상한)이 지나면
+False를 반환하고 계속 진행한다 (기존 고정 대기와 같은 "최대 대기 후 진행" 동작).
+
+- 화면 처리 중 표시: WebSquare 처리 중 표시(processbar)가 사라질 때까지
+- 요소 상태: 선택자가 visible/attached/hidden 상태가 될 때까지
+- 필드 값: 입력 필드 값이 채워지고 settle_ms 동안 바뀌지 않을 때까지 (서버 응답으로 채워지는 합계 등)
+- 행 개수: 선택자에 해당하는 요소가 count개 이상이 될 때까지 (품목추가 후 품목 줄)
+- 네트워크: 페이지의 request/requestfinished/requestfailed 이벤트로 진행 중인 XHR/fetch를
+  세어, 진행 중인 요청이 없고 quiet_ms 동안 새 요청이 없을 때까지
+  (page.wait_for_load_state("networkidle")은 페이지가 이미 그 상태면 바로 반환하므로
+  화면 안 버튼 클릭 뒤의 새 XHR을 기다리지 못한다)
+
+처리 중 표시 선택자가 화면의 어떤 요소와도 맞지 않으면 wait_until_ready는 바로 True를
+반환한다. 그래서 settle()은 처리 중 표시와 별도로 네트워크 조건을 함께 기다린다.
+
+모든 함수는 시간 초과/오류에서 예외를 내지 않는다 (조건 대기는 False, 값 대기는 마지막 값 반환).
+"""
+
+import asyncio
+import time
+
+# 기존 고정 대기 대신 쓰는 기본 상한 (ms)
+DEFAULT_TIMEOUT = 5000
+
+# 조건 확인 간격 (ms)
+POLL_INTERVAL = 50
+
+# WebSquare 처리 중 표시 (화면에 보이는 것이 하나라도 있으면 처리 중)
+_BUSY_INDICATOR_JS = """() => {
+    const nodes = document.querySelectorAll("[id$='processbar'], [id*='___processbar'], .w2processbar, .w2modal_processbar");
+    for (const node of nodes) {
+        const style = window.getComputedStyle(node);
+        if (style.display !== 'none' && style.visibility !== 'hidden' && node.getClientRects().length > 0) {
+            return false;
+        }
+    }
+    return true;
+}"""
+
+# 세금계산서 품목 줄의 품목명 입력 필드 (줄 번호는 0부터)
+ITEM_ROW_SELECTOR = "[id^='mf_txppWframe_genEtxivLsatTop_'][id$='_edtLsatNmTop']"
+
+_COUNT_JS = "([selector, count]) => document.querySelectorAll(selector).length >= count"
+
+# 진행 중인 요청으로 세는 리소스 종류 (이미지/스크립트 등 정적 파일 제외)
+TRACKED_RESOURCE_TYPES = ("document", "xhr", "fetch")
+
+# 마지막 요청이 끝난 뒤(또는 대기 시작 후) 새 요청이 없어야 하는 시간 (ms)
+QUIET_MS = 300
+
+
+class NetworkTracker:
+    """페이지 하나의 진행 중인 요청 수 (요청 이벤트 리스너로 집계)"""
+
+    def __init__(self, page):
+        self.in_flight = set()
+        self.last_activity = time.monotonic()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    @classmethod
+    def for_page(cls, page) -> 'NetworkTracker':
+        """페이지의 추적기 (없으면 만들어 리스너 등록) - 클릭 전에 만들어 두어야 그 요청도 셈"""
+        tracker = getattr(page, '_hometax_network_tracker', None)
+        if tracker is None:
+            tracker = cls(page)
+            page._hometax_network_tracker = tracker
+        return tracker
+
+    def _started(self, request) -> None:
+        if getattr(request, 'resource_type', None) in TRACKED_RESOURCE_TYPES:
+            self.in_flight.add(request)
+            self.last_activity = time.monotonic()
+
+    def _finished(self, request) -> None:
+        if request in self.in_flight:
+            self.in_flight.discard(request)
+            self.last_activity = time.monotonic()
+
+    async def wait_idle(self, timeout: int = DEFAULT_TIMEOUT, quiet_ms: int = QUIET_MS) -> bool:
+        """진행 중인 요청이 없고 quiet_ms 동안 새 요청이 없을 때까지 대기
+
+        대기 시작 시점부터 quiet_ms는 항상 기다린다 (클릭 직후 아직 시작되지 않은 요청 대비).
+        """
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        while True:
+            now = time.monotonic()
+            quiet_since = max(self.last_activity, started)
+            if not self.in_flight and now - quiet_since >= quiet_ms / 1000:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(POLL_INTERVAL / 1000)
+
+
+def track_network(page) -> NetworkTracker:
+    """페이지의 요청 추적 시작 (페이지를 만든 직후 호출)"""
+    return NetworkTracker.for_page(page)
+
+
+async def wait_until_ready(page, timeout: int = DEFAULT_TIMEOUT) -> bool:
+    """WebSquare 처리 중 표시가 사라질 때까지 대기
+
+    처리 중 표시 선택자와 맞는 요소가 없으면 바로 True (화면 처리 여부를 알 수 없음 -
+    요청 완료까지 기다려야 하면 settle()을 사용).
+    """
+    try:
+        await page.wait_for_function(_BUSY_INDICATOR_JS, timeout=timeout, polling=POLL_INTERVAL)
+        return True
+    except Exception:
+        print(f"   [WAIT] 화면 처리 대기 시간 초과({timeout}ms) - 계속 진행")
+        return False
+
+
+async def wait_for_state(target, state: str = "visible", timeout: int = DEFAULT_TIMEOUT) -> bool:
+    """locator가 state(visible/attached/hidden/detached)가 될 때까지 대기"""
+    try:
+        await target.wait_for(state=state, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_count(page, selector: str, count: int, timeout: int = DEFAULT_TIMEOUT) -> bool:
+    """selector에 해당하는 요소가 count개 이상이 될 때까지 대기"""
+    try:
+        await page.wait_for_function(_COUNT_JS, arg=[selector, count], timeout=timeout, polling=POLL_INTERVAL)
+        return True
+    except Exception:
+        print(f"   [WAIT] {selector} {count}개 대기 시간 초과({timeout}ms) - 계속 진행")
+        return False
+
+
+async def wait_for_item_rows(page, count: int, timeout: int = DEFAULT_TIMEOUT) -> bool:
+    """세금계산서 품목 줄이 count줄 이상이 될 때까지 대기 (품목추가 클릭 후)"""
+    return await wait_for_count(page, ITEM_ROW_SELECTOR, count, timeout)
+
+
+async def wait_for_value(page, selector: str, timeout: int = DEFAULT_TIMEOUT, settle_ms: int = 200,
+                         allow_zero: bool = True) -> str:
+    """입력 필드 값이 채워지고 settle_ms 동안 그대로일 때 그 값 반환 (시간 초과 시 마지막 값)
+
+    allow_zero=False이면 "0"도 아직 채워지지 않은 값으로 본다 (서버 계산 전 합계 필드).
+    """
+    locator = page.locator(selector).first
+    deadline = time.monotonic() + timeout / 1000
+    last_value, stable_since = None, None
+
+    while True:
+        try:
+            value = (await locator.input_value(timeout=POLL_INTERVAL * 4)).strip()
+        except Exception:
+            value = ""
+        now = time.monotonic()
+
+        filled = bool(value) and (allow_zero or value.replace(',', '') not in ("0", "0.0"))
+        if filled and value == last_value:
+            if now - stable_since >= settle_ms / 1000:
+                return value
+        else:
+            last_value, stable_since = value, now
+
+        if now >= deadline:
+            print(f"   [WAIT] {selector} 값 대기 시간 초과({timeout}ms) - 현재 값 '{value}' 사용")
+            return value
+        await asyncio.sleep(POLL_INTERVAL / 1000)
+
+
+async def wait_for_network_idle(page, timeout: int = DEFAULT_TIMEOUT, quiet_ms: int = QUIET_MS) -> bool:
+    """진행 중인 XHR/fetch/문서 요청이 없고 quiet_ms 동안 새 요청이 없을 때까지 대기"""
+    idle = await NetworkTracker.for_page(page).wait_idle(timeout, quiet_ms)
+    if not idle:
+        print(f"   [WAIT] 네트워크 요청 대기 시간 초과({timeout}ms) - 계속 진행")
+    return idle
+
+
+async def settle(page, timeout: int = DEFAULT_TIMEOUT) -> bool:
+    """네트워크 요청과 화면 처리가 모두 끝날 때까지 대기 (두 조건이 같은 상한을 나눠 씀)"""
+    started = time.monotonic()
+    idle = await wait_for_network_idle(page, timeout)
+    remaining = max(int(timeout - (time.monotonic() - started) * 1000), POLL_INTERVAL)
+    return await wait_until_ready(page, remaining) and idle
@@ -0,0 +1,143 @@
+# 📁 C:\APP\tax-bill\core\run_checkpoint.py
+# -*- coding: utf-8 -*-
+"""
+실행 체크포인트 (중단된 세금계산서/거래처 등록 이어서 처리)
+
+실행마다 선택한 행, 선택 데이터 지문, 완료/실패한 그룹을
+~/.hometax/checkpoints/<종류>-<파일키>.json에 저장한다. 다음 실행에서 같은 파일을 열면
+이어서 처리할지 묻고, 이어서 처리하면 행 선택을 건너뛰고 완료된 그룹은 브라우저
+작업 없이 넘어간다.
+
+- 저장: 그룹이 끝날 때마다 임시 파일 + os.replace (중간에 죽어도 이전 내용 유지)
+- 지문: 선택 행의 셀 값 해시 (상태 기록 컬럼 제외) → 우리가 쓴 완료일/에러 표시로는
+  바뀌지 않고, 사용자가 데이터를 고쳤으면 바뀌어서 이전 진행 상황을 버린다
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Tuple
+
+CHECKPOINT_VERSION = 1
+
+DEFAULT_CHECKPOINT_DIR = Path.home() / ".hometax" / "checkpoints"
+
+
+def selection_fingerprint(rows: Iterable[Tuple[int, Mapping]], ignore: Iterable[str] = ()) -> str:
+    """(행 번호, 행 데이터) 목록의 내용 해시 (ignore 컬럼 제외)"""
+    ignore = set(ignore)
+    digest = hashlib.sha1()
+    for row_number, data in rows:
+        values = [(key, str(value)) for key, value in data.items() if key not in ignore]
+        digest.update(json.dumps([row_number, values], ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class RunCheckpoint:
+    """파일 하나에 대한 진행 상황 (종류별로 하나)"""
+
+    def __init__(self, kind: str, file_path: str, directory=None):
+        if directory is None:
+            directory = os.getenv("HOMETAX_CHECKPOINT_DIR") or DEFAULT_CHECKPOINT_DIR
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(file_path)).encode('utf-8')).hexdigest()[:16]
+        self.kind = kind
+        self.file_path = os.path.abspath(file_path)
+        self.path = Path(directory) / f"{kind}-{key}.json"
+        self.state: Dict = self._load()
+
+    # 조회
+    @property
+    def exists(self) -> bool:
+        return bool(self.state)
+
+    @property
+    def selection(self) -> str:
+        return self.state.get('selection', '')
+
+    @property
+    def fingerprint(self) -> str:
+        return self.state.get('fingerprint', '')
+
+    @property
+    def completed(self) -> set:
+        return set(self.state.get('completed', []))
+
+    @property
+    def failed(self) -> Dict[str, str]:
+        return dict(self.state.get('failed', {}))
+
+    def is_completed(self, key: str) -> bool:
+        return key in self.state.get('completed', [])
+
+    def summary(self) -> str:
+        """이어서 처리 확인 창에 보여줄 요약"""
+        return (f"선택 행: {self.selection}\n"
+                f"완료: {len(self.state.get('completed', []))}건, 실패: {len(self.state.get('failed', {}))}건\n"
+                f"마지막 기록: {self.state.get('updated', '-')}")
+
+    # 기록
+    def start(self, selection: str, fingerprint: str) -> None:
+        """새 실행 시작 (이전 진행 상황은 버림)"""
+        now = datetime.now().isoformat(timespec='seconds')
+        self.state = {
+            'version': CHECKPOINT_VERSION,
+            'kind': self.kind,
+            'file': self.file_path,
+            'selection': selection,
+            'fingerprint': fingerprint,
+            'completed': [],
+            'failed': {},
+            'started': now,
+            'updated': now,
+        }
+        self._save()
+
+    def mark_completed(self, key: str) -> None:
+        if not self.state:
+            return
+        if key not in self.state['completed']:
+            self.state['completed'].append(key)
+        self.state['failed'].pop(key, None)
+        self._save()
+
+    def mark_failed(self, key: str, reason: str = "") -> None:
+        if not self.state:
+            return
+        self.state['failed'][key] = reason
+        self._save()
+
+    def finish(self) -> None:
+        """모든 그룹 완료 - 체크포인트 삭제"""
+        self.discard()
+
+    def discard(self) -> None:
+        self.state = {}
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    # 내부 구현
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get('version') != CHECKPOINT_VERSION or state.get('kind') != self.kind:
+            return {}
+        return state
+
+    def _save(self) -> None:
+        self.state['updated'] = datetime.now().isoformat(timespec='seconds')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 체크포인트 저장 실패 (무시하고 계속): {e}")
+
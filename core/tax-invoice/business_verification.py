@@ -0,0 +1,200 @@
+# 📁 C:\APP\tax-bill\core\tax-invoice\business_verification.py
+# -*- coding: utf-8 -*-
+"""
+세금계산서 작성 화면의 공급받는자 등록번호 확인
+
+등록번호를 입력하고 확인 버튼을 누른 뒤 나올 수 있는 결과를 동시에 기다리고,
+가장 먼저 나온 결과로 바로 끝낸다 (고정 대기 없이 실제 응답 시간만큼만 대기).
+
+- Alert: "정상적인 사업자번호" → 확인 완료, 오류 메시지 → 번호오류
+- 종사업장 선택 창 → 닫고 미등록(주)
+- 상호 필드가 채워짐 → 확인 완료 (Alert보다 먼저 채워지는 경우)
+- 아무 결과도 없이 시간 초과 → 상호 필드 상태로 판단 (비어 있으면 미등록, 비활성이면 번호오류)
+
+엑셀 기록/beep 등 결과에 따른 처리는 호출하는 쪽에서 VerificationResult를 보고 한다.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from hometax_dialogs import DialogRouter, ERROR, SUCCESS
+from hometax_wait import wait_for_state
+
+BUSINESS_NUMBER_SELECTOR = "#mf_txppWframe_edtDmnrBsnoTop"
+CONFIRM_BUTTON_SELECTOR = "#mf_txppWframe_btnDmnrBsnoCnfrTop"
+COMPANY_NAME_SELECTOR = "#mf_txppWframe_edtDmnrTnmNmTop"
+BRANCH_POPUP_CLOSE_SELECTOR = "#mf_txppWframe_ABTIBsnoUnitPopup2_wframe_btnClose0"
+
+# 확인 결과를 기다리는 상한 (ms)
+VERIFY_TIMEOUT = 5000
+
+# 결과
+VERIFIED = 'verified'            # 확인 완료 - 세금계산서 입력 진행
+INVALID = 'invalid'              # 잘못된 등록번호 (오류 Alert 또는 상호 필드 비활성)
+BRANCH_OFFICE = 'branch_office'  # 종사업장 선택 창 (종사업장 번호 미등록)
+UNREGISTERED = 'unregistered'    # 확인은 되었지만 상호가 비어 있음 (거래처 미등록)
+CLICK_FAILED = 'click_failed'    # 확인 버튼을 누르지 못함
+
+# 결과별 엑셀 상태 표시 / beep 횟수
+_STATUS = {
+    INVALID: "번호오류",
+    BRANCH_OFFICE: "미등록(주)",
+    UNREGISTERED: "미등록",
+    CLICK_FAILED: "처리오류",
+}
+_BEEPS = {INVALID: 3, BRANCH_OFFICE: 1, UNREGISTERED: 2, CLICK_FAILED: 3}
+
+# 상호 필드가 확인 전 값과 다른 값으로 채워지고 입력 가능한 상태인지
+_COMPANY_NAME_FILLED_JS = """([selector, previous]) => {
+    const field = document.querySelector(selector);
+    if (!field || field.disabled || field.readOnly) {
+        return false;
+    }
+    const value = (field.value || '').trim();
+    return value !== '' && value !== previous;
+}"""
+
+# 경합 대상 (같은 시점에 끝나면 앞의 것을 결과로 사용)
+_DIALOG = 'dialog'
+_BRANCH_POPUP = 'branch_popup'
+_COMPANY_NAME = 'company_name'
+_PRIORITY = (_DIALOG, _BRANCH_POPUP, _COMPANY_NAME)
+
+
+@dataclass
+class VerificationResult:
+    """등록번호 확인 결과"""
+    outcome: str
+    message: str = ""
+    company_name: str = ""
+    elapsed: float = 0.0     # 확인 버튼 클릭부터 결과까지 (초)
+
+    @property
+    def ok(self) -> bool:
+        return self.outcome == VERIFIED
+
+    @property
+    def status(self) -> Optional[str]:
+        """엑셀 상태 컬럼에 기록할 값 (확인 완료면 None)"""
+        return _STATUS.get(self.outcome)
+
+    @property
+    def beeps(self) -> int:
+        return _BEEPS.get(self.outcome, 0)
+
+
+async def verify_business_number(page, business_number: str,
+                                 timeout: int = VERIFY_TIMEOUT) -> VerificationResult:
+    """등록번호 입력 → 확인 클릭 → 먼저 나온 결과 반환"""
+    company_field = page.locator(COMPANY_NAME_SELECTOR)
+    previous_name = await _input_value(company_field)
+
+    await page.locator(BUSINESS_NUMBER_SELECTOR).fill(business_number)
+
+    # 클릭 직후 뜬 Alert도 받도록 클릭 전에 대기 등록
+    expectation = DialogRouter.for_page(page).expect(count=1)
+    if not await _click_confirm(page):
+        expectation.close()
+        return VerificationResult(CLICK_FAILED, "확인 버튼 클릭 실패")
+    started = time.perf_counter()
+
+    tasks = {
+        asyncio.ensure_future(expectation.wait(timeout / 1000)): _DIALOG,
+        asyncio.ensure_future(wait_for_state(page.locator(BRANCH_POPUP_CLOSE_SELECTOR), "visible", timeout)): _BRANCH_POPUP,
+        asyncio.ensure_future(_wait_for_company_name(page, previous_name, timeout)): _COMPANY_NAME,
+    }
+    winner, value = await _first_result(tasks)
+    expectation.close()
+
+    if winner == _DIALOG:
+        event = value[-1]
+        if event.kind == ERROR:
+            result = VerificationResult(INVALID, event.message)
+        elif event.kind == SUCCESS:
+            result = VerificationResult(VERIFIED, event.message, await _input_value(company_field))
+        else:
+            # 알 수 없는 안내 - 상호 필드 상태로 판단
+            result = await _result_from_company_field(company_field, event.message)
+    elif winner == _BRANCH_POPUP:
+        try:
+            await page.locator(BRANCH_POPUP_CLOSE_SELECTOR).click()
+        except Exception as e:
+            print(f"      [WARN] 종사업장 선택 창 닫기 실패: {e}")
+        result = VerificationResult(BRANCH_OFFICE, "종사업장 선택 창")
+    elif winner == _COMPANY_NAME:
+        result = VerificationResult(VERIFIED, "상호 입력됨", await _input_value(company_field))
+    else:
+        result = await _result_from_company_field(company_field, f"응답 없음 ({timeout}ms)")
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def _first_result(tasks):
+    """참(truthy) 값으로 끝난 첫 번째 작업의 (이름, 값) - 모두 실패/시간 초과면 (None, None)"""
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished = {tasks[task]: task.result() for task in done
+                        if not task.cancelled() and task.exception() is None and task.result()}
+            for name in _PRIORITY:
+                if name in finished:
+                    return name, finished[name]
+        return None, None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _click_confirm(page) -> bool:
+    """확인 버튼 클릭 (일반 → 강제 → JavaScript 순서로 시도)"""
+    button = page.locator(CONFIRM_BUTTON_SELECTOR)
+    try:
+        await button.click(timeout=10000)
+        return True
+    except Exception as e:
+        print(f"      [WARN] 확인 버튼 클릭 실패 - 재시도: {e}")
+    try:
+        await button.click(force=True, timeout=2000)
+        return True
+    except Exception:
+        pass
+    try:
+        await page.evaluate(f"document.querySelector('{CONFIRM_BUTTON_SELECTOR}').click()")
+        return True
+    except Exception as e:
+        print(f"      [ERROR] 확인 버튼 클릭 실패: {e}")
+        return False
+
+
+async def _wait_for_company_name(page, previous: str, timeout: int) -> bool:
+    try:
+        await page.wait_for_function(_COMPANY_NAME_FILLED_JS, arg=[COMPANY_NAME_SELECTOR, previous],
+                                     timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def _input_value(locator) -> str:
+    try:
+        return (await locator.input_value(timeout=1000)).strip()
+    except Exception:
+        return ""
+
+
+async def _result_from_company_field(company_field, message: str) -> VerificationResult:
+    """상호 필드 상태로 판단 - 비활성: 번호오류, 비어 있음: 미등록, 값 있음: 확인 완료"""
+    try:
+        editable = await company_field.is_editable(timeout=1000)
+    except Exception:
+        editable = False
+    if not editable:
+        return VerificationResult(INVALID, f"{message} - 상호 입력 불가")
+    company_name = await _input_value(company_field)
+    if not company_name:
+        return VerificationResult(UNREGISTERED, f"{message} - 상호 없음")
+    return VerificationResult(VERIFIED, message, company_name)
@@ -2,9 +2,100 @@
 # Create at 2508312118 Ver1.00
 # -*- coding: utf-8 -*-
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
 
+from excel_sheet_cache import read_sheet
+
+# 거래명세표/거래처 시트의 컬럼 순서 (헤더 이름 대신 위치로 매핑)
+TRANSACTION_COLUMNS = ['작성일자', '등록번호', '상호', '품목코드', '품명', '규격', '수량', '단가', '공급가액', '세액']
+TRANSACTION_AMOUNT_COLUMNS = ['수량', '단가', '공급가액', '세액']
+CUSTOMER_COLUMNS = ['순번', '사업자등록번호', '거래처명', '대표자', '사업장주소', '업태', '종목']
+
+
+def _empty_frame(columns):
+    """빈 DataFrame"""
+    return pd.DataFrame(columns=columns)
+
+
+def _positional(df, columns):
+    """앞에서부터 위치 기준으로 컬럼 이름 지정 (부족한 컬럼은 빈 문자열)"""
+    df = df.iloc[:, :len(columns)].copy()
+    df.columns = columns[:df.shape[1]]
+    return df.reindex(columns=columns, fill_value='')
+
+
+def _strip(series):
+    """문자열 컬럼 정리"""
+    return series.fillna('').astype(str).str.strip()
+
+
+def normalize_business_numbers(series):
+    """사업자번호 컬럼 정규화 (숫자만 남김)"""
+    return series.fillna('').astype(str).str.replace(r'\D', '', regex=True)
+
+
+def to_int64(series):
+    """금액/수량 컬럼을 int64로 변환 (콤마 제거, 변환 불가 값은 0, 소수점 이하 버림)"""
+    numbers = pd.to_numeric(series.fillna('').astype(str).str.replace(',', '', regex=False).str.strip(),
+                            errors='coerce')
+    return numbers.fillna(0).astype('int64')
+
+
+def parse_dates(series):
+    """날짜 컬럼을 datetime64로 변환 (ISO 형식은 벡터 변환, 그 외 형식만 개별 해석)"""
+    text = _strip(series)
+    dates = pd.to_datetime(text, format='ISO8601', errors='coerce')
+    remaining = dates.isna() & (text != '')
+    if remaining.any():
+        dates[remaining] = pd.to_datetime(text[remaining], format='mixed', errors='coerce')
+    return dates
+
+
+def build_transaction_frame(raw):
+    """거래명세표 원본(문자열) → 형 변환된 DataFrame
+
+    작성일자가 비어 있는 행은 제외하며, 금액은 int64, 작성일은 datetime64,
+    등록번호는 숫자만 남긴다. '작성일자'는 YYYY-MM-DD 문자열로 유지한다.
+    """
+    raw = _positional(raw, TRANSACTION_COLUMNS)
+    raw = raw[_strip(raw['작성일자']) != '']
+    
+    frame = pd.DataFrame(index=raw.index)
+    dates = parse_dates(raw['작성일자'])
+    frame['작성일자'] = dates.dt.strftime('%Y-%m-%d').where(dates.notna(), _strip(raw['작성일자']))
+    frame['등록번호'] = normalize_business_numbers(raw['등록번호'])
+    for column in ['상호', '품목코드', '품명', '규격']:
+        frame[column] = _strip(raw[column])
+    for column in TRANSACTION_AMOUNT_COLUMNS:
+        frame[column] = to_int64(raw[column])
+    
+    # 계산된 총액 추가
+    frame['총액'] = frame['공급가액'] + frame['세액']
+    frame['작성일'] = dates
+    return frame.reset_index(drop=True)
+
+
+def build_customer_frame(raw):
+    """거래처 원본(문자열) → 정리된 DataFrame (거래처명이 있는 행만)"""
+    raw = _positional(raw, CUSTOMER_COLUMNS)
+    frame = pd.DataFrame({column: _strip(raw[column]) for column in CUSTOMER_COLUMNS})
+    frame['사업자등록번호'] = normalize_business_numbers(raw['사업자등록번호'])
+    return frame[frame['거래처명'] != ''].reset_index(drop=True)
+
+
+def _to_day(value):
+    """문자열/date/datetime → numpy datetime64[D] (해석 불가 시 None)"""
+    try:
+        day = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(day):
+        return None
+    return np.datetime64(day.date(), 'D')
+
+
 class ExcelDataManager:
     """엑셀 데이터 관리 클래스"""
     
@@ -12,6 +103,14 @@ class ExcelDataManager:
         self.excel_path = excel_path or r"C:\Users\man4k\OneDrive\문서\세금계산서.xlsx"
         self.transaction_data = []
         self.customer_data = []
+        self.transaction_df = None  # 형 변환된 거래명세표 (금액 int64, 작성일 datetime64)
+        self.customer_df = None
+        
+        # 조회용 인덱스 (build_indexes에서 생성)
+        self._customer_index = None
+        self._transactions_by_business_number = None
+        self._date_keys = None
+        self._date_positions = None
         
     def load_all_data(self):
         """모든 시트 데이터 로드"""
@@ -20,6 +119,8 @@ class ExcelDataManager:
             self.transaction_data = self.load_transaction_details()
             # 거래처 데이터 로드
             self.customer_data = self.load_customer_data()
+            # 조회용 인덱스 생성
+            self.build_indexes()
             
             print(f"데이터 로드 완료:")
             print(f"   거래명세표: {len(self.transaction_data)}개")
@@ -34,127 +135,159 @@ class ExcelDataManager:
     def load_transaction_details(self):
         """거래명세표 시트 데이터 로드"""
         try:
-            df = pd.read_excel(self.excel_path, sheet_name='거래명세표')
-            
-            # NaN 값 처리
-            df = df.fillna('')
+            # 모든 셀을 문자열로 읽은 뒤 컬럼 단위로 형 변환 (행 단위 변환 없음)
+            df = self._read_sheet_rows('거래명세표')
             
             # 컬럼명 대신 인덱스로 접근 (한글 인코딩 문제 해결)
             if len(df) == 0:
                 print("거래명세표 시트가 비어있습니다.")
+                self.transaction_df = _empty_frame(TRANSACTION_COLUMNS)
                 return []
             
-            # 컬럼 순서 확인 (첫 행으로 매핑)
-            col_names = df.columns.tolist()
-            print(f"컬럼 개수: {len(col_names)}")
+            print(f"컬럼 개수: {len(df.columns)}")
             
-            transactions = []
-            for idx, row in df.iterrows():
-                # 첫 번째 컬럼이 작성일자인지 확인
-                if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                    continue
-                
-                transaction = {
-                    '작성일자': str(row.iloc[0]).strip(),      # 첫 번째 컬럼
-                    '등록번호': str(row.iloc[1]).strip(),      # 두 번째 컬럼
-                    '상호': str(row.iloc[2]).strip(),          # 세 번째 컬럼
-                    '품목코드': str(row.iloc[3]).strip() if pd.notna(row.iloc[3]) else '',
-                    '품명': str(row.iloc[4]).strip(),          # 품명
-                    '규격': str(row.iloc[5]).strip(),          # 규격
-                    '수량': int(float(row.iloc[6])) if pd.notna(row.iloc[6]) else 0,    # 수량
-                    '단가': int(float(row.iloc[7])) if pd.notna(row.iloc[7]) else 0,    # 단가
-                    '공급가액': int(float(row.iloc[8])) if pd.notna(row.iloc[8]) else 0, # 공급가액
-                    '세액': int(float(row.iloc[9])) if pd.notna(row.iloc[9]) else 0,     # 세액
-                }
-                
-                # 계산된 총액 추가
-                transaction['총액'] = transaction['공급가액'] + transaction['세액']
-                
-                transactions.append(transaction)
+            self.transaction_df = build_transaction_frame(df)
+            transactions = self.transaction_df.drop(columns=['작성일']).to_dict('records')
             
             print(f"거래명세표에서 {len(transactions)}건의 유효 데이터 로드")
             return transactions
             
         except Exception as e:
             print(f"거래명세표 로드 오류: {e}")
+            self.transaction_df = _empty_frame(TRANSACTION_COLUMNS)
             return []
     
     def load_customer_data(self):
         """거래처 시트 데이터 로드"""
         try:
-            df = pd.read_excel(self.excel_path, sheet_name='거래처')
-            df = df.fillna('')
+            df = self._read_sheet_rows('거래처')
             
             if len(df) == 0:
                 print("거래처 시트가 비어있습니다.")
+                self.customer_df = _empty_frame(CUSTOMER_COLUMNS)
                 return []
             
-            customers = []
-            for idx, row in df.iterrows():
-                # 거래처명이 있는 행만 처리 (세 번째 컬럼)
-                if pd.isna(row.iloc[2]) or str(row.iloc[2]).strip() == '':
-                    continue
-                
-                customer = {
-                    '순번': row.iloc[0] if pd.notna(row.iloc[0]) else '',
-                    '사업자등록번호': str(row.iloc[1]).strip(),   # 사업자등록번호
-                    '거래처명': str(row.iloc[2]).strip(),        # 거래처명 
-                    '대표자': str(row.iloc[3]).strip(),          # 대표자
-                    '사업장주소': str(row.iloc[4]).strip(),      # 사업장주소
-                    '업태': str(row.iloc[5]).strip(),           # 업태
-                    '종목': str(row.iloc[6]).strip(),           # 종목
-                }
-                customers.append(customer)
+            self.customer_df = build_customer_frame(df)
+            customers = self.customer_df.to_dict('records')
             
             print(f"거래처에서 {len(customers)}개 데이터 로드")
             return customers
             
         except Exception as e:
             print(f"거래처 데이터 로드 오류: {e}")
+            self.customer_df = _empty_frame(CUSTOMER_COLUMNS)
             return []
     
+    def _read_sheet_rows(self, sheet_name):
+        """시트의 데이터 행(헤더 제외)을 문자열 DataFrame으로 로드 (파싱 결과 캐시 사용)"""
+        sheet = read_sheet(self.excel_path, sheet_name)
+        if sheet is None or sheet.title != sheet_name:
+            raise ValueError(f"'{sheet_name}' 시트를 읽을 수 없습니다.")
+        return sheet.frame.iloc[1:].reset_index(drop=True)
+    
+    def build_indexes(self):
+        """사업자등록번호 해시 인덱스와 작성일 정렬 인덱스 생성"""
+        # 거래처: 사업자등록번호 → 거래처 (같은 번호가 여러 행이면 첫 행)
+        self._customer_index = {}
+        for customer in self.customer_data:
+            self._customer_index.setdefault(customer['사업자등록번호'], customer)
+        
+        # 거래명세표: 등록번호 → 거래 목록 (시트 순서 유지)
+        self._transactions_by_business_number = {}
+        for tx in self.transaction_data:
+            self._transactions_by_business_number.setdefault(tx['등록번호'], []).append(tx)
+        
+        # 작성일: 날짜(일 단위) 오름차순 키 + 원래 위치 (같은 날짜는 시트 순서 유지)
+        df = self.transaction_df
+        if df is not None and len(df) == len(self.transaction_data):
+            days = df['작성일'].dt.normalize()
+            valid = days.notna().to_numpy()
+            positions = np.flatnonzero(valid)
+            keys = days.to_numpy(dtype='datetime64[ns]')[valid].astype('datetime64[D]')
+            order = np.argsort(keys, kind='stable')
+            self._date_keys = keys[order]
+            self._date_positions = positions[order]
+        else:
+            self._date_keys = np.array([], dtype='datetime64[D]')
+            self._date_positions = np.array([], dtype=np.int64)
+    
+    def _ensure_indexes(self):
+        """인덱스가 없으면 생성 (load_all_data를 거치지 않은 경우)"""
+        if self._customer_index is None:
+            self.build_indexes()
+    
     def get_transactions_by_date(self, target_date=None):
-        """특정 날짜의 거래 조회"""
+        """특정 날짜의 거래 조회 (정렬 인덱스 이진 탐색)"""
         if not target_date:
             target_date = datetime.now().strftime('%Y-%m-%d')
         
-        filtered = []
-        for tx in self.transaction_data:
-            tx_date = tx['작성일자']
-            # 날짜 형식 통일
-            if isinstance(tx_date, str) and len(tx_date) >= 10:
-                tx_date_str = tx_date[:10]  # 'YYYY-MM-DD' 부분만 추출
-                if tx_date_str == target_date:
-                    filtered.append(tx)
+        return self.get_transactions_by_date_range(target_date, target_date)
+    
+    def get_transactions_by_date_range(self, start_date, end_date):
+        """기간(시작일~종료일, 양 끝 포함)의 거래를 작성일 순으로 조회"""
+        self._ensure_indexes()
+        
+        start = _to_day(start_date)
+        end = _to_day(end_date)
+        if start is None or end is None or start > end:
+            return []
         
-        return filtered
+        lo = np.searchsorted(self._date_keys, start, side='left')
+        hi = np.searchsorted(self._date_keys, end, side='right')
+        return [self.transaction_data[i] for i in self._date_positions[lo:hi]]
+    
+    def get_transactions_by_business_number(self, business_number):
+        """등록번호의 모든 거래 조회"""
+        self._ensure_indexes()
+        business_number = ''.join(filter(str.isdigit, str(business_number)))
+        return list(self._transactions_by_business_number.get(business_number, []))
     
     def get_customer_by_business_number(self, business_number):
         """사업자등록번호로 거래처 조회"""
-        for customer in self.customer_data:
-            if customer['사업자등록번호'] == business_number:
-                return customer
-        return None
+        self._ensure_indexes()
+        business_number = ''.join(filter(str.isdigit, str(business_number)))
+        return self._customer_index.get(business_number)
     
     def get_transaction_summary(self):
         """거래 요약 정보"""
-        if not self.transaction_data:
+        df = self.transaction_df
+        if df is None or df.empty:
             return {}
         
-        total_supply = sum(tx['공급가액'] for tx in self.transaction_data)
-        total_tax = sum(tx['세액'] for tx in self.transaction_data)
-        total_amount = total_supply + total_tax
-        
-        unique_customers = set(tx['등록번호'] for tx in self.transaction_data)
+        total_supply = int(df['공급가액'].sum())
+        total_tax = int(df['세액'].sum())
         
         return {
-            '총_거래건수': len(self.transaction_data),
+            '총_거래건수': len(df),
             '총_공급가액': total_supply,
             '총_세액': total_tax,
-            '총액': total_amount,
-            '거래처_수': len(unique_customers)
+            '총액': total_supply + total_tax,
+            '거래처_수': int(df['등록번호'].nunique())
         }
     
+    def get_customer_summary(self):
+        """거래처(등록번호)별 거래 합계 - DataFrame 반환"""
+        df = self.transaction_df
+        if df is None or df.empty:
+            return _empty_frame(['등록번호', '상호', '거래건수', '공급가액', '세액', '총액'])
+        
+        return (df.groupby('등록번호', sort=True)
+                  .agg(상호=('상호', 'first'), 거래건수=('공급가액', 'size'),
+                       공급가액=('공급가액', 'sum'), 세액=('세액', 'sum'), 총액=('총액', 'sum'))
+                  .reset_index())
+    
+    def get_monthly_summary(self):
+        """작성월(YYYY-MM)별 거래 합계 - DataFrame 반환"""
+        df = self.transaction_df
+        if df is None or df.empty:
+            return _empty_frame(['작성월', '거래건수', '거래처_수', '공급가액', '세액', '총액'])
+        
+        dated = df[df['작성일'].notna()]
+        return (dated.groupby(dated['작성일'].dt.strftime('%Y-%m').rename('작성월'), sort=True)
+                     .agg(거래건수=('공급가액', 'size'), 거래처_수=('등록번호', 'nunique'),
+                          공급가액=('공급가액', 'sum'), 세액=('세액', 'sum'), 총액=('총액', 'sum'))
+                     .reset_index())
+    
     def print_transaction_summary(self):
         """거래 요약 정보 출력"""
         if not self.transaction_data:
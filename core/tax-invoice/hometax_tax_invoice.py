@@ -5,6 +5,7 @@ import asyncio
 import os
 import sys
 import subprocess
+from concurrent.futures import Future
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from datetime import datetime
@@ -15,7 +16,18 @@ from hometax_security_manager import HomeTaxSecurityManager
 import pandas as pd
 
 # 통합 엑셀 처리 모듈 import
-from excel_unified_processor import create_transaction_processor
+from excel_unified_processor import create_transaction_processor, RowSelection
+from invoice_plan import build_invoice_plan
+from hometax_wait import settle, track_network, wait_for_item_rows, wait_for_network_idle, wait_until_ready
+from line_item_fill import fill_fields, line_selector
+from invoice_summary import read_form_header
+from business_verification import CLICK_FAILED, VerificationResult, verify_business_number
+from transaction_record import coerce_record, coerce_records, normalize_business_number, valid_business_numbers
+from xlwings_session import get_workbook_session
+from xlsx_patch_writer import patch_cells, append_rows as append_xlsx_rows
+from excel_write_worker import current_worker
+from issuance_journal import IssuanceJournal, ITEMS_ENTERED, ON_HOLD, FAILED, SHEET_WRITTEN, group_id
+from openpyxl.utils import column_index_from_string
 
 # 공통 로그인 모듈 import
 from hometax_login_module import hometax_login_dispatcher
@@ -39,12 +51,51 @@ from hometax_transaction_processor import (
     clear_form_fields
 )
 
+# 세금계산서 시트 헤더 (시트가 없을 때 생성)
+TAX_INVOICE_HEADERS = ['공급일자', '등록번호', '상호', '이메일', '', '품목', '규격', '수량', '공급가액', '세액', '합계금액', '기간및건수']
+
+
+def _tax_invoice_row_values(tax_invoice_data):
+    """{열 문자: 값} → {열 번호: 값} (빈 값/잘못된 열 문자는 제외)"""
+    values = {}
+    for col_letter, value in tax_invoice_data.items():
+        if not value:
+            continue
+        try:
+            values[column_index_from_string(col_letter)] = value
+        except ValueError:
+            print(f"   [WARN] 알 수 없는 열 '{col_letter}' 무시")
+    return values
+
+
+def _last_used_row(worksheet, column=1):
+    """openpyxl 시트에서 column 열에 값이 있는 마지막 행 (시트 크기 끝에서 위로 탐색)"""
+    row = worksheet.max_row
+    while row > 0 and worksheet.cell(row=row, column=column).value is None:
+        row -= 1
+    return row
+
+
+def _write_succeeded(result):
+    """submit_write 결과(Future 또는 반환값)가 성공인지 (완료된 Future만 전달)"""
+    if isinstance(result, Future):
+        try:
+            return result.result(timeout=0) is not False
+        except Exception:
+            return False
+    return result is not False
+
+
+def _row_span(first_row, count):
+    return f"행 {first_row}" if count == 1 else f"행 {first_row}-{first_row + count - 1}"
+
+
 class TaxInvoiceExcelProcessor:
     """ExcelUnifiedProcessor 어댑터 클래스 - 기존 인터페이스 호환성 유지"""
     
     def __init__(self):
-        # 통합 프로세서 생성 - 거래명세표 시트용
-        self.processor = create_transaction_processor()
+        # 통합 프로세서 생성 - 거래명세표 시트용 (엑셀 쓰기는 백그라운드 작업자에서 실행)
+        self.processor = create_transaction_processor(background_writes=True)
         
         # 기존 인터페이스 호환을 위한 속성들 (통합 프로세서에서 위임)
         self.selected_rows = None
@@ -52,6 +103,14 @@ class TaxInvoiceExcelProcessor:
         self.excel_file_path = None
         self.headers = None
         
+        # 발급 결과 선기록 저널 (엑셀 반영 전 중단 대비)
+        self.journal = IssuanceJournal()
+        self.reconciled_rows = set()
+        
+        # 세금계산서 묶음 계획 (등록번호 + 공급 월, 16건씩) 및 현재 처리 중인 묶음
+        self.invoice_plan = None
+        self.current_group = None
+        
         # 호환성을 위한 속성 위임 
         self.field_mapping = getattr(self.processor, 'field_mapping', {})
         self.base_selectors = getattr(self.processor, 'base_selectors', {})
@@ -81,35 +140,34 @@ class TaxInvoiceExcelProcessor:
     def write_completion_to_excel_q_column(self, row_number, completion_message="완료"):
         """엑셀 파일의 거래명세표 시트 Q열(발행일)에 완료 메시지 작성 (단일 행)"""
         return self.processor.status_recorder.write_status_to_column(row_number, completion_message, 17)  # Q열 = 17번째 컬럼
+    
+    def status_batch(self):
+        """Q열 상태 기록을 그룹 단위로 묶어 한 번에 저장하는 구간 - 통합 프로세서로 위임"""
+        return self.processor.status_batch()
+    
+    def write_error_to_rows(self, rows, error_message="번호오류"):
+        """처리 중인 묶음의 행들 Q열에만 에러 메시지 작성 (같은 등록번호의 다른 묶음은 그대로)"""
+        with self.status_batch():
+            for row in rows:
+                self.write_error_to_excel_q_column(row['excel_row'], error_message)
         
       
     def write_error_to_all_matching_business_numbers(self, business_number, error_message="번호오류"):
-        """같은 사업자등록번호를 가진 모든 행의 Q열에 에러 메시지 작성"""
+        """같은 사업자등록번호를 가진 모든 행의 Q열에 에러 메시지 작성 (엑셀 쓰기 작업자에 제출)"""
+        return self.processor.submit_write(self._write_error_to_all_matching_business_numbers,
+                                           business_number, error_message)
+    
+    def _write_error_to_all_matching_business_numbers(self, business_number, error_message="번호오류"):
+        """같은 사업자등록번호를 가진 모든 행의 Q열에 에러 메시지 작성 (작업자 스레드에서 실행)"""
         if not self.excel_file_path:
             print("[ERROR] 엑셀 파일 경로가 없습니다.")
             return False
         
         try:
-            import pandas as pd
-            
             print(f"같은 등록번호({business_number})를 가진 모든 행에 Q열 에러 기록 중...")
             
-            # pandas로 데이터 읽기 (행 찾기용)
-            try:
-                df = pd.read_excel(self.excel_file_path, sheet_name='거래명세표')
-            except:
-                df = pd.read_excel(self.excel_file_path)  # 기본 시트 사용
-            
-            # 사업자등록번호 형식 통일 (하이픈 제거)
-            target_business_number = str(business_number).replace('-', '').strip()
-            
-            # 같은 등록번호를 가진 모든 행 찾기
-            matching_rows = []
-            for idx, row in df.iterrows():
-                row_business_number = str(row.get('등록번호', '')).replace('-', '').strip()
-                if row_business_number == target_business_number:
-                    excel_row_number = idx + 2  # pandas index는 0부터, 엑셀은 1부터, 헤더 고려하면 +2
-                    matching_rows.append(excel_row_number)
+            # 데이터 로드 시 만든 등록번호 인덱스에서 조회 (시트 재파싱 없음)
+            matching_rows = self.processor.find_rows_by_business_number(business_number)
             
             if not matching_rows:
                 print(f"[ERROR] 등록번호 {business_number}와 일치하는 행을 찾을 수 없습니다.")
@@ -117,59 +175,18 @@ class TaxInvoiceExcelProcessor:
             
             print(f"발견된 일치 행들: {matching_rows} (총 {len(matching_rows)}개)")
             
-            # 방법 1: xlwings를 사용해서 열린 엑셀 파일에 직접 쓰기 시도
-            try:
-                import xlwings as xw
-                
-                # 현재 열려있는 엑셀 앱에 연결
-                try:
-                    app = xw.apps.active
-                except:
-                    app = xw.App(visible=True, add_book=False)
-                
-                # 열린 워크북 찾기
-                workbook_name = self.excel_file_path.split("\\")[-1]  # 파일명만 추출
-                wb = None
-                
-                for book in app.books:
-                    if book.name == workbook_name:
-                        wb = book
-                        break
-                
-                if wb:
-                    # "거래명세표" 시트 선택
-                    ws = None
-                    for sheet in wb.sheets:
-                        if sheet.name == "거래명세표":
-                            ws = sheet
-                            break
-                    
-                    if not ws:
-                        ws = wb.sheets[0]  # 첫 번째 시트 사용
-                    
-                    # Q열(17번째 열)에 에러 메시지 기록
-                    updated_count = 0
-                    for row_number in matching_rows:
-                        try:
-                            ws.range(f'Q{row_number}').value = error_message
-                            updated_count += 1
-                            print(f"   행 {row_number} Q열에 '{error_message}' 작성 완료 (xlwings)")
-                        except Exception as e:
-                            print(f"   행 {row_number} Q열 작성 실패 (xlwings): {e}")
-                            continue
-                    
-                    # 저장
-                    wb.save()
-                    
-                    print(f"[OK] 등록번호 {business_number}의 모든 행 Q열 에러 기록 완료 (xlwings): {updated_count}/{len(matching_rows)}개 행")
-                    return True
-                    
-            except ImportError:
-                print("   xlwings가 설치되지 않았습니다. openpyxl 방법을 시도합니다...")
-            except Exception as e:
-                print(f"   xlwings 방법 실패: {e}")
+            # 방법 1: xlwings 세션으로 열린 엑셀 파일에 한 번에 기록 (저장은 작업이 잠시 멈출 때 1회)
+            session = get_workbook_session(self.excel_file_path)
+            if session.write_cells("거래명세표", [(row_number, 17, error_message) for row_number in matching_rows]):
+                print(f"[OK] 등록번호 {business_number}의 모든 행 Q열 에러 기록 완료 (xlwings): {len(matching_rows)}개 행")
+                return True
+            
+            # 방법 2: 닫힌 파일의 시트 XML에서 Q열 셀만 교체
+            if patch_cells(self.excel_file_path, "거래명세표", [(row_number, 17, error_message) for row_number in matching_rows]):
+                print(f"[OK] 등록번호 {business_number}의 모든 행 Q열 에러 기록 완료 (xlsx 패치): {len(matching_rows)}개 행")
+                return True
             
-            # 방법 2: openpyxl로 파일 직접 수정 (엑셀이 닫혀있을 때만 가능)
+            # 방법 3: openpyxl로 파일 직접 수정 (엑셀이 닫혀있을 때만 가능)
             from openpyxl import load_workbook
             
             workbook = load_workbook(self.excel_file_path)
@@ -211,73 +228,48 @@ class TaxInvoiceExcelProcessor:
             return False
     
     def write_tax_invoice_data(self, tax_invoice_data):
-        """세금계산서 시트에 데이터 기록"""
+        """세금계산서 시트에 데이터 기록 (엑셀 쓰기 작업자에 제출)"""
+        return self.write_tax_invoice_rows([tax_invoice_data])
+    
+    def write_tax_invoice_rows(self, rows):
+        """세금계산서 시트에 여러 요약 행을 한 번에 추가 (엑셀 쓰기 작업자에 제출)"""
+        return self.processor.submit_write(self._append_tax_invoice_rows, [dict(row) for row in rows])
+    
+    async def wait_for_writes(self):
+        """제출된 엑셀 쓰기가 모두 끝날 때까지 이벤트 루프를 막지 않고 대기"""
+        await self.processor.wait_for_writes_async()
+    
+    def _append_tax_invoice_rows(self, rows):
+        """세금계산서 시트 끝에 행 추가 (작업자 스레드에서 실행)"""
         if not self.excel_file_path:
             print("[ERROR] 엑셀 파일 경로가 없습니다.")
             return False
         
+        # 값이 있는 컬럼만 {열 번호: 값}으로 변환
+        value_rows = [_tax_invoice_row_values(row) for row in rows]
+        value_rows = [values for values in value_rows if values]
+        if not value_rows:
+            return True
+        
         try:
             from openpyxl import load_workbook
             
-            print(f"세금계산서 시트에 데이터 기록 중...")
+            print(f"세금계산서 시트에 데이터 기록 중... ({len(value_rows)}행)")
             
-            # 방법 1: xlwings를 사용해서 열린 엑셀 파일에 직접 쓰기 시도
-            try:
-                import xlwings as xw
-                
-                # 현재 열려있는 엑셀 앱에 연결
-                try:
-                    app = xw.apps.active
-                except:
-                    app = xw.App(visible=True, add_book=False)
-                
-                # 열린 워크북 찾기
-                workbook_name = self.excel_file_path.split("\\")[-1]
-                wb = None
-                
-                for book in app.books:
-                    if book.name == workbook_name:
-                        wb = book
-                        break
-                
-                if wb:
-                    # "세금계산서" 시트 찾기 또는 생성
-                    ws = None
-                    for sheet in wb.sheets:
-                        if sheet.name == "세금계산서":
-                            ws = sheet
-                            break
-                    
-                    if not ws:
-                        # 세금계산서 시트가 없으면 생성
-                        ws = wb.sheets.add("세금계산서")
-                        # 헤더 작성
-                        headers = ['공급일자', '등록번호', '상호', '이메일', '', '품목', '규격', '수량', '공급가액', '세액', '합계금액', '기간및건수']
-                        for i, header in enumerate(headers, 1):
-                            ws.range(f'{chr(64+i)}1').value = header
-                    
-                    # 마지막 행 찾기
-                    last_row = 1
-                    while ws.range(f'A{last_row}').value is not None:
-                        last_row += 1
-                    
-                    # 데이터 기록
-                    for col_letter, value in tax_invoice_data.items():
-                        if value:  # 값이 있을 때만 기록
-                            ws.range(f'{col_letter.upper()}{last_row}').value = value
-                    
-                    # 저장
-                    wb.save()
-                    
-                    print(f"[OK] 세금계산서 시트에 데이터 기록 완료 (xlwings): 행 {last_row}")
-                    return True
-                    
-            except ImportError:
-                print("   xlwings가 설치되지 않았습니다. openpyxl 방법을 시도합니다...")
-            except Exception as e:
-                print(f"   xlwings 방법 실패: {e}")
+            # 방법 1: xlwings 세션으로 열린 엑셀 파일에 추가 (마지막 행은 세션에서 한 번만 조회, 저장은 모아서 1회)
+            session = get_workbook_session(self.excel_file_path)
+            first_row = session.append_rows("세금계산서", value_rows, TAX_INVOICE_HEADERS)
+            if first_row:
+                print(f"[OK] 세금계산서 시트에 데이터 기록 완료 (xlwings): {_row_span(first_row, len(value_rows))}")
+                return True
+            
+            # 방법 2: 닫힌 파일의 세금계산서 시트 XML에 행만 추가 (시트가 없으면 openpyxl로 생성)
+            first_row = append_xlsx_rows(self.excel_file_path, "세금계산서", value_rows)
+            if first_row:
+                print(f"[OK] 세금계산서 시트에 데이터 기록 완료 (xlsx 패치): {_row_span(first_row, len(value_rows))}")
+                return True
             
-            # 방법 2: openpyxl로 파일 직접 수정
+            # 방법 3: openpyxl로 파일 직접 수정
             workbook = load_workbook(self.excel_file_path)
             
             # 세금계산서 시트 찾기 또는 생성
@@ -286,32 +278,22 @@ class TaxInvoiceExcelProcessor:
             else:
                 worksheet = workbook.create_sheet("세금계산서")
                 # 헤더 작성
-                headers = ['공급일자', '등록번호', '상호', '이메일', '', '품목', '규격', '수량', '공급가액', '세액', '합계금액', '기간및건수']
-                for i, header in enumerate(headers, 1):
+                for i, header in enumerate(TAX_INVOICE_HEADERS, 1):
                     worksheet.cell(row=1, column=i, value=header)
             
-            # 마지막 행 찾기
-            last_row = 1
-            while worksheet.cell(row=last_row, column=1).value is not None:
-                last_row += 1
-            
-            # 컬럼 매핑 (a=1, b=2, c=3, ...)
-            column_mapping = {
-                'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5, 'f': 6, 'g': 7, 'h': 8,
-                'i': 9, 'j': 10, 'k': 11, 'l': 12
-            }
+            # 마지막 행 찾기 (시트 크기에서 위로 탐색)
+            first_row = _last_used_row(worksheet) + 1
             
             # 데이터 기록
-            for col_letter, value in tax_invoice_data.items():
-                if value and col_letter.lower() in column_mapping:
-                    col_num = column_mapping[col_letter.lower()]
-                    worksheet.cell(row=last_row, column=col_num, value=value)
+            for offset, values in enumerate(value_rows):
+                for col_num, value in values.items():
+                    worksheet.cell(row=first_row + offset, column=col_num, value=value)
             
             # 파일 저장
             workbook.save(self.excel_file_path)
             workbook.close()
             
-            print(f"[OK] 세금계산서 시트에 데이터 기록 완료 (openpyxl): 행 {last_row}")
+            print(f"[OK] 세금계산서 시트에 데이터 기록 완료 (openpyxl): {_row_span(first_row, len(value_rows))}")
             return True
             
         except PermissionError as pe:
@@ -325,6 +307,92 @@ class TaxInvoiceExcelProcessor:
             print(f"[ERROR] 세금계산서 시트 기록 실패: {e}")
             return False
     
+    def journal_record(self, rows, business_number, state, **data):
+        """그룹 상태 변화를 저널에 기록 (엑셀을 건드리기 전에 호출)"""
+        if not self.excel_file_path:
+            return None
+        try:
+            return self.journal.record(self.excel_file_path, business_number,
+                                       [row['excel_row'] for row in rows], state, **data)
+        except OSError as e:
+            print(f"[WARN] 발급 저널 기록 실패: {e}")
+            return None
+    
+    def write_completion_dates(self, excel_rows, status_date):
+        """발급보류한 행들의 Q열에 완료일 기록 (한 번의 열기/저장)"""
+        with self.status_batch():
+            for row_number in excel_rows:
+                self.write_completion_to_excel_q_column(row_number, status_date)
+    
+    def mark_group_written(self, rows, business_number, *write_results, status_date=None):
+        """Q열 완료일을 기록하고, 앞서 제출한 엑셀 쓰기가 끝난 뒤 저널에 sheet_written 기록 (쓰기 작업자 순서 보장)"""
+        excel_rows = [row['excel_row'] for row in rows]
+        if status_date:
+            self.write_completion_dates(excel_rows, status_date)
+        self.processor.flush_status()
+        results = list(write_results) + [self.processor.status_recorder.last_write]
+        return self.processor.submit_write(self._mark_written, excel_rows, business_number, results)
+    
+    def _mark_written(self, excel_rows, business_number, results):
+        """작업자 스레드에서 실행 - 쓰기가 모두 성공했으면 저장 이후에 sheet_written 기록"""
+        if not all(_write_succeeded(result) for result in results if result is not None):
+            print(f"[WARN] 엑셀 반영 실패 - 다음 실행 시 저널에서 다시 기록합니다: {business_number}")
+            return False
+        
+        def record():
+            # 예약된 xlwings 저장을 여기서 직접 실행하고 (이미 저장되었으면 바로 True) 성공했을 때만 기록
+            if not get_workbook_session(self.excel_file_path).save():
+                print(f"[WARN] 엑셀 저장 실패 - 다음 실행 시 저널에서 다시 기록합니다: {business_number}")
+                return
+            self.journal.record(self.excel_file_path, business_number, excel_rows, SHEET_WRITTEN)
+        
+        # xlwings 저장은 작업자가 잠시 멈출 때 실행되므로 그때 저장 결과를 확인하고 기록
+        worker = current_worker()
+        if worker is None:
+            record()
+        else:
+            worker.call_when_idle(record, key=('journal', business_number, tuple(excel_rows)))
+        return True
+    
+    def reconcile_journal(self):
+        """이전 실행에서 발급보류 후 엑셀에 반영되지 못한 그룹을 한 번에 다시 기록"""
+        if not self.excel_file_path:
+            return 0
+        
+        for entry in self.journal.uncertain(self.excel_file_path):
+            print(f"[WARN] 발급보류 여부 확인 필요 (입력 도중 중단): 등록번호 {entry['business_number']}, 행 {entry['rows']}")
+        
+        pending = self.journal.pending(self.excel_file_path)
+        if not pending:
+            return 0
+        
+        print(f"[JOURNAL] 엑셀에 반영되지 않은 발급보류 {len(pending)}건을 다시 기록합니다...")
+        # 실시간 처리(mark_group_written)와 같은 셀: Q열 완료일 + 세금계산서 시트 요약 행
+        summary_rows = []
+        with self.status_batch():
+            for entry in pending:
+                self.write_completion_dates(entry['rows'], entry.get('status_date') or entry['ts'][:10])
+                if entry.get('tax_invoice'):
+                    summary_rows.append(entry['tax_invoice'])
+                else:
+                    print(f"[WARN] 세금계산서 요약이 없어 Q열만 기록합니다: 등록번호 {entry['business_number']}")
+        
+        results = [self.write_tax_invoice_rows(summary_rows)] if summary_rows else []
+        results.append(self.processor.status_recorder.last_write)
+        self.processor.wait_for_writes()
+        
+        if not all(_write_succeeded(result) for result in results if result is not None):
+            print("[ERROR] 저널 재기록 실패 - 엑셀 파일을 확인한 뒤 다시 실행하세요.")
+            return 0
+        
+        for entry in pending:
+            self.journal.record(self.excel_file_path, entry['business_number'], entry['rows'],
+                                SHEET_WRITTEN, reconciled=True)
+            self.reconciled_rows.update(entry['rows'])
+        self.journal.compact()
+        print(f"[OK] 저널 재기록 완료: {len(pending)}건")
+        return len(pending)
+    
     def check_and_open_excel_file(self):
         """세금계산서.xlsx 파일 체크 및 자동 열기 - 통합 프로세서로 위임"""
         return self.processor.file_manager.check_and_open_file()
@@ -336,49 +404,51 @@ class TaxInvoiceExcelProcessor:
         result = self.processor.select_file_and_process()
         if result:
             self.selected_rows = result.get('selected_rows')
-            self.selected_data = result.get('selected_data')
+            # 날짜/금액/등록번호는 여기서 한 번만 변환
+            self.selected_data = coerce_records(result.get('selected_data') or [])
             self.excel_file_path = result.get('excel_file_path')
             self.headers = result.get('headers')
+            
+            # 이전 실행의 미반영 발급보류를 먼저 엑셀에 기록하고 해당 행은 이번 처리에서 제외
+            if self.reconcile_journal():
+                self.selected_data = [row for row in self.selected_data
+                                      if row.get('excel_row') not in self.reconciled_rows]
+            
+            # 등록번호 검증번호가 틀린 행은 홈택스 조회 없이 번호오류 처리
+            self.selected_data = self.reject_invalid_business_numbers(self.selected_data)
+            
+            # 브라우저 입력 전에 묶음 계획을 만들어 출력
+            self.invoice_plan = build_invoice_plan(self.selected_data)
+            self.invoice_plan.print_summary()
         return result
        
     
-    def parse_row_selection(self, selection, silent=False):
-        """행 선택 문자열을 파싱하여 행 번호 리스트 반환 (hometax_excel_integration.py 방식)"""
-        if not selection.strip():
-            return []
+    def reject_invalid_business_numbers(self, rows):
+        """등록번호가 없거나 검증번호가 틀린 행을 Q열에 한 번에 기록하고 제외한 목록 반환"""
+        rows = coerce_records(rows or [])
+        if not rows:
+            return rows
         
-        rows = []
-        parts = selection.replace(" ", "").split(",")
+        valid = valid_business_numbers(row.business_number for row in rows)
+        if valid.all():
+            return rows
         
-        for part in parts:
-            if "-" in part:
-                # 범위 처리 (예: 2-5)
-                try:
-                    start, end = part.split("-", 1)
-                    start_row = int(start)
-                    end_row = int(end)
-                    if start_row <= end_row:
-                        rows.extend(range(start_row, end_row + 1))
-                    else:
-                        if not silent:
-                            print(f"[ERROR] 잘못된 범위: {part}")
-                except ValueError:
-                    if not silent:
-                        print(f"[ERROR] 잘못된 범위: {part}")
-            else:
-                # 단일 행 처리
-                try:
-                    row = int(part)
-                    if row > 1:  # 헤더 행 제외
-                        rows.append(row)
-                    else:
-                        if not silent:
-                            print(f"[ERROR] 잘못된 행 번호: {part}")
-                except ValueError:
-                    if not silent:
-                        print(f"[ERROR] 잘못된 행 번호: {part}")
-        
-        return sorted(set(rows))  # 중복 제거 및 정렬
+        rejected = [(row, "번호오류" if row.business_number else "번호없음")
+                    for row, ok in zip(rows, valid) if not ok]
+        with self.status_batch():
+            for row, message in rejected:
+                self.write_error_to_excel_q_column(row.excel_row, message)
+        
+        print(f"[WARN] 등록번호 검증 실패 {len(rejected)}행 - 처리에서 제외")
+        for row, message in rejected[:10]:
+            print(f"   행 {row.excel_row}: {row.get('등록번호', '')} ({row.get('상호', '')}) → {message}")
+        if len(rejected) > 10:
+            print(f"   ... 외 {len(rejected) - 10}행")
+        return [row for row, ok in zip(rows, valid) if ok]
+    
+    def parse_row_selection(self, selection, silent=False):
+        """행 선택 문자열을 구간 기반 RowSelection으로 파싱 (헤더 행 제외)"""
+        return RowSelection.parse(selection, silent=silent, min_row=2)
     
     def show_row_selection_gui(self):
         """행 선택 GUI 표시 - 통합 프로세서로 위임"""
@@ -391,9 +461,37 @@ class TaxInvoiceExcelProcessor:
         return result
 
     
+    def group_key(self, group_data):
+        """체크포인트/저널에서 쓰는 그룹 식별자"""
+        business_number = str(group_data[0].get('등록번호', '')).strip()
+        return group_id(business_number, [row.get('excel_row', 0) for row in group_data])
+    
+    def is_group_completed(self, group_data):
+        """이어서 처리 중 이미 완료된 그룹인지 - 통합 프로세서로 위임"""
+        return self.processor.is_group_completed(self.group_key(group_data))
+    
+    def mark_group_completed(self, group_data):
+        self.processor.mark_group_completed(self.group_key(group_data))
+    
+    def mark_group_failed(self, group_data, reason=""):
+        self.processor.mark_group_failed(self.group_key(group_data), reason)
+    
+    def finish_run(self):
+        """실행 종료 - 통합 프로세서로 위임"""
+        self.processor.finish_run()
+    
     def group_data_by_business_number(self):
-        """사업자번호별로 월 합계 세금계산서 그룹핑 (16건씩) - 통합 프로세서로 위임"""
-        return self.processor.data_processor.group_by_business_number()
+        """사업자번호 + 공급 월별로 월 합계 세금계산서 그룹핑 (16건 초과 시 여러 장으로 분할)"""
+        if self.invoice_plan is None:
+            self.invoice_plan = build_invoice_plan(self.selected_data or [])
+        return self.invoice_plan.groups()
+    
+    def rows_for_business_number(self, business_number):
+        """처리 중인 묶음의 행 (묶음이 없으면 선택 데이터에서 같은 등록번호 행 전체)"""
+        number = normalize_business_number(business_number)
+        if self.current_group and coerce_record(self.current_group[0]).business_number == number:
+            return list(self.current_group)
+        return [row for row in coerce_records(self.selected_data or []) if row.business_number == number]
         
     def get_processed_row_data(self, row_index):
         """선택된 행의 데이터를 홈택스 필드용으로 가공하여 반환 - 통합 프로세서로 위임"""
@@ -414,6 +512,7 @@ async def process_tax_invoices_with_selected_data(page, processor):
 async def process_selected_rows_sequentially(page, processor):
     """선택된 행들을 순차적으로 처리 (거래처별 그룹핑)"""
     print("\n=== 선택된 행들 순차 처리 시작 ===")
+    track_network(page)  # settle()이 클릭 뒤 요청을 기다릴 수 있도록 입력 전에 추적 시작
     
     groups = processor.group_data_by_business_number()
     if not groups:
@@ -424,34 +523,68 @@ async def process_selected_rows_sequentially(page, processor):
     
     processed_count = 0
     
+    skipped_count = 0
+    
     for group_idx, group_data in enumerate(groups, 1):
+        # 이전 실행에서 완료된 그룹(체크포인트/저널 재기록)은 브라우저 작업 없이 건너뜀
+        if processor.is_group_completed(group_data):
+            skipped_count += 1
+            continue
+        if processor.reconciled_rows and all(row.get('excel_row') in processor.reconciled_rows for row in group_data):
+            print(f"\n[{group_idx}/{len(groups)}] 이전 실행에서 발급보류 완료된 그룹 - 건너뜀")
+            processor.mark_group_completed(group_data)
+            skipped_count += 1
+            continue
+        
         try:
             first_row = group_data[0]
             business_number = str(first_row.get('등록번호', '')).strip()
             company_name = first_row.get('상호', '미상')
             
+            chunk = processor.invoice_plan.chunk_for_row(first_row.get('excel_row')) if processor.invoice_plan else None
+            
             print(f"\n[{group_idx}/{len(groups)}] 거래처 그룹 처리 시작")
             print(f"   거래처: {business_number} ({company_name})")
             print(f"   거래건수: {len(group_data)}건")
+            if chunk is not None and chunk.parts > 1:
+                print(f"   분할 발행: {chunk.part}/{chunk.parts}장")
             
-            await process_single_tax_invoice(page, group_data, processor)
+            processor.current_group = group_data
+            try:
+                failure = await process_single_tax_invoice(page, group_data, processor)
+            finally:
+                processor.current_group = None
             
-            processed_count += 1
+            # 발급보류까지 끝난 그룹만 완료로 기록 (실패한 그룹은 이어서 처리 시 다시 시도)
+            if failure is None:
+                processed_count += 1
+                processor.mark_group_completed(group_data)
+            else:
+                processor.mark_group_failed(group_data, failure)
             
             if group_idx < len(groups):
-                await page.wait_for_timeout(2000)
+                # 다음 거래처 입력 전 화면 초기화(요청/처리 중 표시) 완료 대기
+                await settle(page, 2000)
             
         except Exception as e:
             print(f"   [ERROR] [{group_idx}] 거래처 그룹 처리 중 오류: {e}")
+            processor.mark_group_failed(group_data, str(e))
             continue
     
     print(f"\n거래처별 순차 처리 완료!")
     print(f"   처리된 그룹 수: {processed_count} / {len(groups)}")
+    if skipped_count:
+        print(f"   이전 실행에서 완료되어 건너뛴 그룹 수: {skipped_count}")
+    
+    # 백그라운드 엑셀 쓰기 완료 확인
+    await processor.wait_for_writes()
+    print("[OK] 엑셀 기록 완료")
+    processor.finish_run()
     
     # 모든 거래처 처리 완료 후 로그아웃
     try:
         print("\n[LOGOUT] 모든 작업 완료 - 로그아웃 처리 중...")
-        await page.wait_for_timeout(2000)  # 안정화 대기
+        await wait_until_ready(page, 2000)  # 안정화 대기
         
         # 로그아웃 버튼 클릭
         logout_btn = page.locator("#mf_wfHeader_group1503")
@@ -460,14 +593,18 @@ async def process_selected_rows_sequentially(page, processor):
         print("[OK] 로그아웃 버튼 클릭 완료")
         
         # 로그아웃 확인 대기
-        await page.wait_for_timeout(3000)
+        await wait_for_network_idle(page, 3000)
         print("[OK] 로그아웃 처리 완료")
         
     except Exception as logout_error:
         print(f"[WARN] 로그아웃 처리 실패 (무시하고 계속): {logout_error}")
 
 async def process_single_tax_invoice(page, group_data, processor):
-    """월 합계 세금계산서 처리 (16건까지의 거래명세표)"""
+    """월 합계 세금계산서 처리 (16건까지의 거래명세표)
+
+    Returns:
+        발급보류까지 완료하면 None, 실패하면 Q열에 기록한 실패 사유
+    """
     try:
         first_row = group_data[0]
         business_number = str(first_row.get('등록번호', '')).strip()
@@ -476,12 +613,17 @@ async def process_single_tax_invoice(page, group_data, processor):
         
         if not business_number:
             print("[ERROR] 등록번호가 없습니다.")
-            for row in group_data:
-                processor.write_error_to_excel_q_column(row['excel_row'], "번호없음")
-            return
+            processor.write_error_to_rows(group_data, "번호없음")
+            return "번호없음"
 
-        # 사업자번호 검증
-        await input_business_number_and_verify(page, business_number, processor, first_row)
+        # 사업자번호 검증 - 확인되지 않으면 (오류는 기록됨) 이 거래처는 입력하지 않음
+        verification = await input_business_number_and_verify(page, business_number, processor)
+        if not verification.ok:
+            print(f"      [SKIP] 사업자번호 미확인({verification.status}) - 세금계산서 입력 건너뜀: {business_number}")
+            return verification.status or "번호오류"
+        
+        # 공급일자 월이 화면과 다르면 변경 (묶음 계획이 월별로 모아 변경 횟수를 줄임)
+        await check_and_update_supply_date(page, group_data[0])
         
         # 거래명세표 입력
         await input_transaction_details(page, group_data, processor)
@@ -489,20 +631,29 @@ async def process_single_tax_invoice(page, group_data, processor):
         # 발급보류 처리
         from hometax_transaction_processor import finalize_transaction_summary, write_to_tax_invoice_sheet
         
+        processor.journal_record(group_data, business_number, ITEMS_ENTERED)
+        # 홈택스가 정한 공급일자/거래처 값은 발급보류 후 화면이 초기화되기 전에 읽어 둠
+        form_header = await read_form_header(page)
         issuance_success = await finalize_transaction_summary(page, group_data, processor, business_number)
         
-        # 세금계산서 시트에 기록
+        # 세금계산서 시트에 기록 (발급보류 결과는 엑셀보다 저널에 먼저 기록)
         if issuance_success:
-            await write_to_tax_invoice_sheet(page, processor, group_data, business_number)
+            status_date = datetime.now().strftime("%Y-%m-%d")
+            processor.journal_record(group_data, business_number, ON_HOLD, status_date=status_date)
+            write_result = await write_to_tax_invoice_sheet(page, processor, group_data, business_number, form_header)
+            processor.mark_group_written(group_data, business_number, write_result, status_date=status_date)
             print(f"      [OK] 세금계산서 처리 완료: {business_number}")
-        else:
-            print(f"      [ERROR] 발급보류 실패: {business_number}")
-            processor.write_error_to_all_matching_business_numbers(business_number, "발급실패")
+            return None
+        
+        print(f"      [ERROR] 발급보류 실패: {business_number}")
+        processor.journal_record(group_data, business_number, FAILED)
+        processor.write_error_to_rows(group_data, "발급실패")
+        return "발급실패"
         
     except Exception as e:
         print(f"      사업자번호 검증 처리 실패: {e}")
-        business_number = group_data[0].get('등록번호', '알수없음').strip()
-        processor.write_error_to_all_matching_business_numbers(business_number, "처리오류")
+        processor.write_error_to_rows(group_data, "처리오류")
+        return "처리오류"
 
 
 async def input_transaction_details(page, group_data, processor):
@@ -520,29 +671,26 @@ async def input_transaction_details(page, group_data, processor):
                     add_btn = page.locator("#mf_txppWframe_btnLsatAddTop")
                     await add_btn.wait_for(state="visible", timeout=3000)
                     await add_btn.click()
-                    await page.wait_for_timeout(500)
+                    # 새 품목 줄이 생길 때까지 (기본 4줄 + 추가한 줄)
+                    await wait_for_item_rows(page, 4 + i + 1, 3000)
                     print(f"         품목 {i+1} 추가 완료")
                 except Exception as e:
                     print(f"         품목 {i+1} 추가 실패: {e}")
                     break
         
-        # 각 거래명세표 행 입력
+        # 모든 거래명세표 행을 한 번에 입력 (실패한 필드만 필드별 재입력)
+        values = {}
         for idx, row_data in enumerate(group_data):
-            try:
-                print(f"      [{idx+1}/{len(group_data)}] 거래명세표 입력 중...")
-                
-                # 품목별 입력 필드 ID 생성
-                row_idx = idx  # 0부터 시작
-                
-                # 각 필드에 데이터 입력
-                await input_transaction_item(page, row_idx, row_data, processor)
-                
-                print(f"         거래명세표 {idx+1} 입력 완료")
-                
-            except Exception as e:
-                print(f"         거래명세표 {idx+1} 입력 실패: {e}")
-                processor.write_error_to_excel(row_data.get('excel_row', 0), "명세표 입력 error")
-                continue
+            print(f"      [{idx+1}/{len(group_data)}] 거래명세표 값 준비")
+            values.update(transaction_item_values(idx, row_data))
+        
+        failed = await fill_fields(page, values)
+        # 금액 자동 계산 등 입력에 대한 화면 처리 완료 대기
+        await wait_until_ready(page, 1000)
+        
+        for idx in sorted({_line_index(selector) for selector in failed}):
+            print(f"         거래명세표 {idx+1} 입력 실패")
+            processor.write_error_to_excel(group_data[idx].get('excel_row', 0), "명세표 입력 error")
         
         print(f"      [OK] 모든 거래명세표 입력 완료: {len(group_data)}건")
         
@@ -552,213 +700,84 @@ async def input_transaction_details(page, group_data, processor):
 async def input_transaction_item(page, row_idx, row_data, processor):
     """개별 거래명세표 행 입력"""
     try:
-        print(f"            엑셀 데이터 키들: {list(row_data.keys())}")  # 디버깅용
-        # 입력 필드 매핑
-        field_mapping = {
-            'supply_date': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatSplDdTop",    # 일
-            'item_name': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatNmTop",        # 품목
-            'spec': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatRszeNmTop",        # 규격
-            'quantity': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatQtyTop",       # 수량
-            'unit_price': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatUtprcTop",   # 단가
-            'supply_amount': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatSplCftTop", # 공급가액
-            'tax_amount': f"#mf_txppWframe_genEtxivLsatTop_{row_idx}_edtLsatTxamtTop"    # 세액
-        }
-        
-        # 유연한 컬럼명 매핑을 위한 헬퍼 함수
-        def get_field_value(row_data, field_names, is_date=False, field_type=""):
-            """여러 가능한 컬럼명에서 값을 찾아 반환"""
-            for field_name in field_names:
-                if field_name in row_data and row_data[field_name]:
-                    value = str(row_data[field_name]).strip()
-                    if is_date and value:
-                        # 날짜 형식 정리 (YYYY-MM-DD, YYYY/MM/DD 등을 YYYYMMDD로 변환)
-                        value = value.replace('-', '').replace('/', '').replace('.', '')
-                        # 날짜에서 일자만 추출 (마지막 2자리)
-                        if len(value) >= 2:
-                            try:
-                                import pandas as pd
-                                date_obj = pd.to_datetime(row_data[field_name])
-                                value = str(date_obj.day)  # 일자만 추출
-                                print(f"            {field_type} 매핑: '{field_name}' = {row_data[field_name]} → 일자 {value}")
-                            except:
-                                value = value[-2:]  # 마지막 2자리만
-                                print(f"            {field_type} 매핑: '{field_name}' = {row_data[field_name]} → 일자 {value} (fallback)")
-                    else:
-                        print(f"            {field_type} 매핑: '{field_name}' = {value}")
-                    return value
-            print(f"            {field_type} 매핑: 해당 컬럼 없음 (시도한 컬럼들: {field_names})")
-            return ''
-        
-        # 데이터 매핑 (엑셀 컬럼 → HomeTax 필드) - 사용자 엑셀 컬럼명에 맞게 우선순위 조정
-        input_data = {
-            'supply_date': get_field_value(row_data, ['공급일자', '작성일자', '일자', '날짜', 'supply_date', 'date', 'supply_dt'], is_date=True, field_type="일자"),
-            'item_name': get_field_value(row_data, ['품목명', '품명', '품목', 'item_name', 'item', 'product', 'product_name', '상품명', 'name'], field_type="품목"),
-            'spec': get_field_value(row_data, ['규격', 'spec', 'specification', 'size'], field_type="규격"),
-            'quantity': get_field_value(row_data, ['수량', 'quantity', 'qty', 'amount'], field_type="수량"),
-            'unit_price': get_field_value(row_data, ['단가', 'unit_price', 'price', 'unitprice'], field_type="단가"),
-            'supply_amount': get_field_value(row_data, ['공급가액', 'supply_amount', 'amount', 'total'], field_type="공급가액"),
-            'tax_amount': get_field_value(row_data, ['세액', 'tax_amount', 'tax', 'vat'], field_type="세액")
-        }
+        failed = await fill_fields(page, transaction_item_values(row_idx, row_data))
+        if failed:
+            print(f"            입력 실패 필드: {failed}")
+            processor.write_error_to_excel(row_data.get('excel_row', 0), "명세표 입력 error")
         
-        # 각 필드에 데이터 입력
-        for field_key, selector in field_mapping.items():
-            try:
-                value = input_data.get(field_key, '')
-                if value:
-                    input_field = page.locator(selector)
-                    await input_field.wait_for(state="visible", timeout=2000)
-                    await input_field.clear()
-                    await input_field.fill(value)
-                    await page.wait_for_timeout(200)
-                    print(f"            {field_key}: {value}")
-                else:
-                    print(f"            {field_key}: (빈 값 - 건너뜀)")
-            except Exception as e:
-                print(f"            {field_key} 입력 실패: {e} (선택자: {selector})")
-                continue
+        # 금액 자동 계산 등 줄 입력에 대한 화면 처리 완료 대기
+        await wait_until_ready(page, 1000)
         
     except Exception as e:
         print(f"         개별 거래명세표 입력 실패: {e}")
         processor.write_error_to_excel(row_data.get('excel_row', 0), "개별 입력 error")
 
-async def input_business_number_and_verify(page, business_number, processor, row_data):
-    try:
-        # 1. 사업자번호 입력
-        await page.locator("#mf_txppWframe_edtDmnrBsnoTop").fill(business_number)
-
-        # 6. Alert 감지 리스너를 미리 설정
-        dialog_message = None
-        dialog_event = asyncio.Event()
-        dialog_detected = False
 
-        async def handle_dialog(dialog):
-            nonlocal dialog_message, dialog_detected
-            print(f"      Alert 감지: {dialog.message}")
-            dialog_message = dialog.message
-            dialog_detected = True
-            await dialog.accept()
-            dialog_event.set()
+def _line_index(selector):
+    """품목 줄 선택자의 줄 번호 (#mf_txppWframe_genEtxivLsatTop_3_edtLsatNmTop → 3)"""
+    return int(selector.split('genEtxivLsatTop_')[1].split('_')[0])
 
-        page.once("dialog", handle_dialog)
 
-        # 2. 확인 버튼 클릭 (타임아웃 방지를 위한 다단계 대기)
-        confirm_btn = page.locator("#mf_txppWframe_btnDmnrBsnoCnfrTop")
-        try:
-            # 버튼이 존재하고 클릭 가능할 때까지 대기 (더 긴 타임아웃)
-            await confirm_btn.wait_for(state="attached", timeout=15000)
-            await confirm_btn.wait_for(state="visible", timeout=5000)
-            await page.wait_for_timeout(1000)  # 추가 안정화 대기
-            await confirm_btn.click(timeout=10000)
-            print(f"      [OK] 사업자번호 확인 버튼 클릭 완료")
-        except Exception as click_error:
-            print(f"      [ERROR] 확인 버튼 클릭 실패 - 재시도: {click_error}")
-            # 재시도 로직 - 페이지 새로고침 후 다시 시도
-            await page.reload()
-            await page.wait_for_timeout(3000)
-            await page.locator("#mf_txppWframe_edtDmnrBsnoTop").fill(business_number)
-            await page.wait_for_timeout(1000)
-            await confirm_btn.click()
+# 엑셀 컬럼 후보 → 품목 줄 필드 (입력 순서)
+_ITEM_FIELD_COLUMNS = [
+    ('supply_date', 'edtLsatSplDdTop', ['공급일자', '작성일자', '일자', '날짜', 'supply_date', 'date', 'supply_dt'], "일자"),
+    ('item_name', 'edtLsatNmTop', ['품목명', '품명', '품목', 'item_name', 'item', 'product', 'product_name', '상품명', 'name'], "품목"),
+    ('spec', 'edtLsatRszeNmTop', ['규격', 'spec', 'specification', 'size'], "규격"),
+    ('quantity', 'edtLsatQtyTop', ['수량', 'quantity', 'qty', 'amount'], "수량"),
+    ('unit_price', 'edtLsatUtprcTop', ['단가', 'unit_price', 'price', 'unitprice'], "단가"),
+    ('supply_amount', 'edtLsatSplCftTop', ['공급가액', 'supply_amount', 'amount', 'total'], "공급가액"),
+    ('tax_amount', 'edtLsatTxamtTop', ['세액', 'tax_amount', 'tax', 'vat'], "세액"),
+]
 
-        # 잠시 대기하여 반응 확인
-        await page.wait_for_timeout(500)
 
-        # 3. Alert가 이미 감지되었는지 확인
-        if dialog_detected:
-            print("      Alert 이미 처리됨 - 종사업장 체크 건너뜀")
-            await page.wait_for_timeout(1000)
-            
-            # Alert 메시지에 따른 처리 분기
-            if dialog_message and "사업자등록번호를 입력하세요" in dialog_message:
-                print(f"      [ERROR] 사업자번호 입력 오류: {dialog_message}")
-                processor.write_error_to_all_matching_business_numbers(business_number, "번호오류")
-                raise Exception(f"사업자번호 입력 오류: {dialog_message}")
-            elif dialog_message and "정상적인 사업자번호" in dialog_message:
-                # 사업자번호 검증 완료 후 거래처 정보 수집
-                await collect_partner_info_after_verification(page, business_number, processor)
-                print("      사업자번호 검증 완료")
-                return
-            else:
-                print(f"      [WARN] 알 수 없는 Alert: {dialog_message}")
-                return
-        
-        # 4. Alert가 없으면 종사업장 메시지 박스 확인
-        try:
-            branch_popup_close_button = page.locator("#mf_txppWframe_ABTIBsnoUnitPopup2_wframe_btnClose0")
-            await branch_popup_close_button.wait_for(state="visible", timeout=1000)
-            
-            # 5. Yes이면 종사업장 메시지 박스의 닫기
-            print("      종사업장 메시지 박스 발견. 닫기 버튼 클릭.")
-            await branch_popup_close_button.click()
-            
-            # 6. 열려있는 세금계산서.xlsx 거래처 시트 q열의 해당거래처의 cell들에 "미등록(주)"라고 기록하고 beep 1회 울림
-            print("      엑셀에 '미등록(주)' 기록")
-            processor.write_error_to_all_matching_business_numbers(business_number, "미등록(주)")
-            await play_beep(1)
-            return # 종사업장 처리 후 함수 종료
+def transaction_item_values(row_idx, row_data):
+    """거래명세표 행 하나의 품목 줄 선택자 → 입력값 (사용자 엑셀 컬럼명 우선순위 적용)"""
+    values = {}
+    for field_key, field, field_names, field_type in _ITEM_FIELD_COLUMNS:
+        value = _item_field_value(row_data, field_names, is_date=(field_key == 'supply_date'), field_type=field_type)
+        if value:
+            values[line_selector(row_idx, field)] = value
+        else:
+            print(f"            {field_key}: (빈 값 - 건너뜀)")
+    return values
 
-        except Exception:
-            # 종사업장 팝업이 없으면 Alert 대기
-            print("      종사업장 메시지 박스 없음. Alert 대기 중...")
 
-            try:
-                # Alert가 뜰 때까지 최대 3초 대기
-                await asyncio.wait_for(dialog_event.wait(), timeout=3.0)
-                # 7. alert이 닫힌 후 1초 대기
-                await page.wait_for_timeout(1000)
-                
-                # Alert 메시지에 따른 처리 분기
-                if dialog_message and "사업자등록번호를 입력하세요" in dialog_message:
-                    print(f"      [ERROR] 사업자번호 입력 오류: {dialog_message}")
-                    processor.write_error_to_all_matching_business_numbers(business_number, "번호오류")
-                    raise Exception(f"사업자번호 입력 오류: {dialog_message}")
-                elif dialog_message and "정상적인 사업자번호" in dialog_message:
-                    # Alert 처리 완료 후 거래처 정보 수집
-                    await collect_partner_info_after_verification(page, business_number, processor)
-                    print("      Alert 처리 완료")
+def _item_field_value(row_data, field_names, is_date=False, field_type=""):
+    """여러 가능한 컬럼명에서 값을 찾아 반환"""
+    for field_name in field_names:
+        if field_name in row_data and row_data[field_name]:
+            value = str(row_data[field_name]).strip()
+            if is_date and value:
+                # 로드 시 변환된 공급일자에서 일자만 추출
+                supply_date = coerce_record(row_data).supply_date
+                if supply_date:
+                    value = str(supply_date.day)
+                    print(f"            {field_type} 매핑: '{field_name}' = {row_data[field_name]} → 일자 {value}")
                 else:
-                    print(f"      [WARN] 알 수 없는 Alert: {dialog_message}")
-            except asyncio.TimeoutError:
-                print("      Alert가 감지되지 않았습니다.")
-                # 리스너 제거
-                try:
-                    page.remove_listener("dialog", handle_dialog)
-                except:
-                    pass
-
-            # 8. #mf_txppWframe_edtDmnrTnmNmTop 필드가 active되어 입력 가능한지 체크
-            company_name_field = page.locator("#mf_txppWframe_edtDmnrTnmNmTop")
-            is_active = False
-            try:
-                # is_editable() 또는 is_enabled()로 활성 상태 확인
-                is_active = await company_name_field.is_editable(timeout=2000)
-            except Exception:
-                is_active = False
-
-            # 9. active가 되어 있어 입력 가능한가?
-            if is_active:
-                print("      상호명 필드가 활성화되어 있습니다.")
-                company_name = await company_name_field.input_value()
-                
-                # 9. yes이고 #mf_txppWframe_edtDmnrTnmNmTop 셀렉션 값이 null이면
-                if not company_name or company_name.strip() == "":
-                    print("      상호명 필드가 비어있습니다. '미등록'으로 기록합니다.")
-                    processor.write_error_to_all_matching_business_numbers(business_number, "미등록")
-                    await play_beep(2)
-                # 10. yes이고 #mf_txppWframe_edtDmnrTnmNmTop 셀렉션 값이 null이 아니면
-                else:
-                    print(f"      상호명 확인: {company_name}. 거래 내역 입력을 시작합니다.")
-                    # 거래 내역 입력 프로세스 호출
-                    await process_transaction_details(page, processor, row_data, business_number)
-            # 11. #mf_txppWframe_edtDmnrTnmNmTop 필드가 active되어 있지 않아 입력이 가능하지 않은 경우
+                    value = value.replace('-', '').replace('/', '').replace('.', '')[-2:]  # 마지막 2자리만
+                    print(f"            {field_type} 매핑: '{field_name}' = {row_data[field_name]} → 일자 {value} (fallback)")
             else:
-                print("      상호명 필드가 활성화되어 있지 않습니다. '번호오류'로 기록합니다.")
-                processor.write_error_to_all_matching_business_numbers(business_number, "번호오류")
-                await play_beep(3)
+                print(f"            {field_type} 매핑: '{field_name}' = {value}")
+            return value
+    print(f"            {field_type} 매핑: 해당 컬럼 없음 (시도한 컬럼들: {field_names})")
+    return ''
 
+async def input_business_number_and_verify(page, business_number, processor):
+    """등록번호 확인 - 결과에 따라 거래처 정보 수집 또는 엑셀에 오류 기록 후 결과 반환"""
+    try:
+        result = await verify_business_number(page, business_number)
     except Exception as e:
         print(f"   [ERROR] 등록번호 검증 중 심각한 오류 발생: {e}")
-        processor.write_error_to_all_matching_business_numbers(business_number, "처리오류")
-        await play_beep(3)
+        result = VerificationResult(CLICK_FAILED, str(e))
+
+    print(f"      [VERIFY] {business_number}: {result.outcome} ({result.elapsed:.2f}초) {result.message}")
+    if result.ok:
+        await collect_partner_info_after_verification(page, business_number, processor)
+        print(f"      사업자번호 검증 완료: {result.company_name}")
+    else:
+        processor.write_error_to_rows(processor.rows_for_business_number(business_number), result.status)
+        await play_beep(result.beeps)
+    return result
 
 
 async def input_supply_date(page, supply_date):
@@ -780,7 +799,7 @@ async def input_supply_date(page, supply_date):
         await date_input.fill(supply_date_str)
         print(f"   공급일자 입력 완료: {supply_date_str}")
         
-        await page.wait_for_timeout(500)
+        await wait_until_ready(page, 2000)
         
     except Exception as e:
         print(f"   [ERROR] 공급일자 입력 실패: {e}")
@@ -917,261 +936,6 @@ async def hometax_quick_login():
         print("❌ 세금계산서 자동화 프로세스 실패")
 
 
-def check_dependencies():
-    """필수 패키지 확인 및 설치"""
-    required_packages = ['openpyxl', 'psutil', 'xlwings', 'pywin32']
-    print("[INFO] 의존성 패키지 확인 중...")
-    
-    for package in required_packages:
-        try:
-            __import__(package.replace('pywin32', 'win32gui'))  # pywin32는 win32gui로 import
-            print(f"[OK] {package} 설치됨")
-        except ImportError:
-            print(f"[ERROR] {package} 미설치 - 자동 설치 중...")
-            try:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-                print(f"[OK] {package} 설치 완료")
-            except subprocess.CalledProcessError as e:
-                print(f"[ERROR] {package} 설치 실패: {e}")
-                print(f"수동 설치 필요: pip install {package}")
-
-
-async def collect_partner_info_after_verification(page, business_number, processor):
-    """사업자번호 검증 완료 후 거래처 정보 수집 및 저장"""
-    try:
-        print("      [COLLECT] 거래처 정보 수집 중...")
-        await page.wait_for_timeout(1000)  # 정보 로딩 대기
-        
-        # 거래처 정보 수집
-        partner_info = {}
-        
-        # 1. 상호명 수집
-        try:
-            company_name = await page.locator("#mf_txppWframe_edtDmnrTnmNmTop").input_value()
-            partner_info['company_name'] = company_name.strip() if company_name else ""
-            print(f"         상호: {partner_info['company_name']}")
-        except Exception as e:
-            print(f"         상호 수집 실패: {e}")
-            partner_info['company_name'] = ""
-        
-        # 2. 대표자명 수집
-        try:
-            representative_name = await page.locator("#mf_txppWframe_edtDmnrRprsFnmTop").input_value()
-            partner_info['representative_name'] = representative_name.strip() if representative_name else ""
-            print(f"         대표자: {partner_info['representative_name']}")
-        except Exception as e:
-            print(f"         대표자명 수집 실패: {e}")
-            partner_info['representative_name'] = ""
-        
-        print(f"      [OK] 거래처 정보 수집 완료: {partner_info}")
-        return partner_info
-        
-    except Exception as e:
-        print(f"      [ERROR] 거래처 정보 수집 실패: {e}")
-        return None
-
-
-if __name__ == "__main__":
-    print("홈택스 세금계산서 자동화 프로그램")
-    print("=" * 50)
-    
-    # 의존성 확인
-    check_dependencies()
-    
-            
-            # 최종 상태 확인
-            final_url = page.url
-            final_title = await page.title()
-            
-            print(f"\n=== 최종 로그인 결과 ===")
-            print(f"최종 URL: {final_url}")
-            print(f"최종 제목: {final_title}")
-            
-            if login_confirmed:
-                print("홈택스 자동 로그인 성공!")
-                
-                # Alert창 X버튼으로 닫기
-                print("\n=== Alert창 X버튼 닫기 ===")
-                try:
-                    # 정확한 X버튼 클릭
-                    close_button = page.locator("#mf_txppWframe_UTXPPABB29_wframe_btnCloseInvtSpec")
-                    await close_button.wait_for(state="visible", timeout=5000)
-                    await close_button.click()
-                    print("   X버튼으로 알림창 닫기 완료")
-                    await page.wait_for_timeout(2000)
-                    
-                except Exception as e:
-                    print(f"X버튼 클릭 실패: {e}")
-                    # 대체 방법으로 Alert 처리
-                    try:
-                        await page.evaluate("""
-                            if (window.confirm) window.confirm = function() { return true; };
-                            if (window.alert) window.alert = function() { return true; };
-                        """)
-                        print("   JavaScript Alert 무력화 완료")
-                    except:
-                        pass
-                
-                # 추가 메뉴 네비게이션
-                print("\n=== 메뉴 네비게이션 시작 ===")
-                await page.wait_for_timeout(3000)  # 더 긴 안정화 대기
-                
-                try:
-                    # 1단계: #mf_wfHeader_wq_uuid_333 선택 (Alert창 닫은 후 첫 번째 메뉴)
-                    print("1단계: 첫 번째 메뉴 선택 (#mf_wfHeader_wq_uuid_333)...")
-                    
-                    first_menu_selectors = [
-                        "#mf_wfHeader_wq_uuid_333",
-                        "*[id*='wq_uuid_333']",
-                        "*[id*='wfHeader'] *[id*='333']",
-                        "a[href*='333'], button[id*='333']"
-                    ]
-                    
-                    first_clicked = False
-                    for selector in first_menu_selectors:
-                        try:
-                            print(f"   시도: {selector}")
-                            first_menu = page.locator(selector).first
-                            await first_menu.wait_for(state="visible", timeout=3000)
-                            await first_menu.click()
-                            print(f"   첫 번째 메뉴 클릭 성공: {selector}")
-                            first_clicked = True
-                            break
-                        except:
-                            continue
-                    
-                    if not first_clicked:
-                        print("   첫 번째 메뉴를 찾을 수 없습니다 - 수동으로 선택하세요")
-                        await page.wait_for_timeout(10000)  # 수동 선택 대기
-                    else:
-                        await page.wait_for_timeout(2000)
-                    
-                    # 2단계: #combineMenuAtag_4601010100 > span 선택 (두 번째 메뉴)
-                    print("2단계: 두 번째 메뉴 선택 (#combineMenuAtag_4601010100)...")
-                    
-                    second_menu_selectors = [
-                        "#combineMenuAtag_4601010100 > span",
-                        "#combineMenuAtag_4601010100",
-                        "*[id*='combineMenu'][id*='4601010100'] > span",
-                        "*[id*='combineMenu'][id*='4601010100']",
-                        "a[href*='4601010100'] > span",
-                        "a[href*='4601010100']"
-                    ]
-                    
-                    second_clicked = False
-                    for selector in second_menu_selectors:
-                        try:
-                            print(f"   시도: {selector}")
-                            second_menu = page.locator(selector).first
-                            await second_menu.wait_for(state="visible", timeout=3000)
-                            await second_menu.click()
-                            print(f"   두 번째 메뉴 클릭 성공: {selector}")
-                            second_clicked = True
-                            break
-                        except:
-                            continue
-                    
-                    if not second_clicked:
-                        print("   두 번째 메뉴를 찾을 수 없습니다 - 수동으로 선택하세요")
-                        await page.wait_for_timeout(10000)  # 수동 선택 대기
-                    else:
-                        await page.wait_for_timeout(2000)
-                    
-                    # 2단계 메뉴 클릭 후 팝업 처리
-                    print("3단계: 2단계 메뉴 클릭 후 팝업 처리...")
-                    await page.wait_for_timeout(2000)  # 팝업이 나타날 시간 대기
-                    
-                    try:
-                        # Alert 대화상자 자동 처리
-                        alert_count = 0
-                        def handle_second_dialog(dialog):
-                            nonlocal alert_count
-                            alert_count += 1
-                            print(f"   Alert {alert_count} 감지 및 처리: '{dialog.message}'")
-                            asyncio.create_task(dialog.accept())
-                        
-                        page.on("dialog", handle_second_dialog)
-                        
-                        # 새 팝업창 확인 및 닫기
-                        popup_processed = False
-                        for check in range(5):  # 5초간 확인
-                            await page.wait_for_timeout(1000)
-                            
-                            # 새로운 팝업창 확인
-                            try:
-                                context_pages = page.context.pages
-                                if len(context_pages) > 1:
-                                    print(f"   새 팝업창 감지: {len(context_pages) - 1}개")
-                                    
-                                    # 메인 페이지가 아닌 모든 창 닫기
-                                    for popup_page in context_pages:
-                                        if popup_page != page:
-                                            try:
-                                                await popup_page.close()
-                                                print("   새 팝업창 닫기 완료")
-                                                popup_processed = True
-                                            except:
-                                                pass
-                            except:
-                                pass
-                            
-                            # Alert 처리됨 확인
-                            if alert_count > 0:
-                                print(f"   Alert {alert_count}개 처리 완료")
-                                popup_processed = True
-                        
-                        # 알림창 확인 버튼으로 닫기
-                        try:
-                            print("   알림창 확인 버튼 찾는 중...")
-                            notification_confirm = page.locator("#mf_txppWframe_UTEETZZD02_wframe_btnProcess")
-                            await notification_confirm.wait_for(state="visible", timeout=3000)
-                            await notification_confirm.click()
-                            print("   알림창 확인 버튼 클릭 완료")
-                            popup_processed = True
-                            await page.wait_for_timeout(1000)
-                        except Exception as e:
-                            print(f"   알림창 확인 버튼 없음 또는 클릭 실패: {e}")
-                        
-                        # Alert 핸들러 제거
-                        page.remove_listener("dialog", handle_second_dialog)
-                        
-                        if popup_processed:
-                            print("   팝업/Alert 처리 완료")
-                        else:
-                            print("   팝업/Alert 없음 - 정상 진행")
-                            
-                    except Exception as popup_error:
-                        print(f"   팝업 처리 중 오류: {popup_error}")
-                    
-                    await page.wait_for_timeout(2000)
-                    print("전체 메뉴 네비게이션 완료!")
-                    
-                except Exception as nav_error:
-                    print(f"[ERROR] 메뉴 네비게이션 오류: {nav_error}")
-                    print("   수동으로 메뉴를 선택해주세요.")
-                
-            else:
-                print("[WARN]  로그인 상태 확인 필요")
-                print("   브라우저에서 직접 확인해주세요.")
-            
-            print(f"\n=== 세금계산서 자동 처리 시작 ===")
-            
-            # 선택된 엑셀 데이터를 이용한 세금계산서 자동화
-            print("선택된 거래명세표 데이터로 세금계산서 자동화를 시작합니다.")
-            print("1. 등록번호 검증 및 자동 입력")
-            print("2. 공급일자 자동 입력")  
-            print("3. 에러 처리 (번호 error, 미등록 구분)")
-            
-            await process_tax_invoices_with_selected_data(page, processor)
-            
-            print(f"\n=== 처리 완료 - 결과 확인 시간 (15초) ===")
-            await page.wait_for_timeout(15000)
-            
-        except Exception as e:
-            print(f"오류: {e}")
-        finally:
-            await browser.close()
-
 def check_dependencies():
     """필수 패키지 확인 및 설치"""
     required_packages = ['openpyxl', 'psutil', 'xlwings', 'pywin32']
@@ -1194,7 +958,7 @@ async def collect_partner_info_after_verification(page, business_number, process
     """사업자번호 검증 완료 후 거래처 정보 수집 및 저장"""
     try:
         print("      [COLLECT] 거래처 정보 수집 중...")
-        await page.wait_for_timeout(1000)  # 정보 로딩 대기
+        await wait_until_ready(page, 3000)  # 정보 로딩 대기
         
         # 거래처 정보 수집
         partner_info = {}
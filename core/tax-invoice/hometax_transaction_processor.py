@@ -8,14 +8,25 @@ Transaction Detail Input Process for HomeTax Automation
 이 모듈은 HomeTax 세금계산서 작성 시 거래 내역을 입력하는 모든 기능을 포함합니다.
 """
 
-import asyncio
 import pandas as pd
 from datetime import datetime
 from hometax_utils import (
-    play_beep, format_date, FieldCollector, SelectorManager,
-    DialogHandler, get_date_columns, get_item_name_columns,
-    get_cash_amount_columns, validate_page_state, format_date_range
+    play_beep, format_date, DialogHandler, get_item_name_columns, validate_page_state
 )
+from transaction_record import coerce_record, coerce_records
+from invoice_plan import MAX_ITEMS_PER_INVOICE
+from hometax_wait import settle, wait_for_item_rows, wait_until_ready
+from hometax_dialogs import DialogRouter, ERROR, SUCCESS
+from line_item_fill import fill_fields, line_selector
+from invoice_summary import build_sheet_summary, combine_email, read_form_header
+from issuance_journal import VERIFIED, ITEMS_ENTERED, ON_HOLD, SUMMARY, FAILED
+
+
+def _journal(processor, work_rows, business_number, state, **data):
+    """발급 저널 기록 (저널을 지원하는 프로세서에서만)"""
+    record = getattr(processor, 'journal_record', None)
+    if record is not None:
+        record(work_rows, business_number, state, **data)
 
 
 async def process_transaction_details(page, processor, first_row_data, business_number):
@@ -30,6 +41,7 @@ async def process_transaction_details(page, processor, first_row_data, business_
             return
             
         print(f"   [DATA] 처리할 거래 건수: {len(work_rows)}건")
+        _journal(processor, work_rows, business_number, VERIFIED)
         
         # 2. 공급일자 비교 및 변경
         await check_and_update_supply_date(page, work_rows[0])
@@ -37,28 +49,38 @@ async def process_transaction_details(page, processor, first_row_data, business_
         # 3. 거래 내역 입력 (건수에 따라 다른 방식)
         if len(work_rows) <= 4:
             await input_transaction_items_basic(page, work_rows)
-        elif len(work_rows) <= 16:
+        elif len(work_rows) <= MAX_ITEMS_PER_INVOICE:
             await input_transaction_items_extended(page, work_rows)
         else:
-            print("   [WARN] 16건 초과 - 분할 처리가 필요합니다.")
-            # 16건씩 분할 처리 로직은 별도로 구현 필요
-            work_rows = work_rows[:16]  # 임시로 16건만 처리
-            await input_transaction_items_extended(page, work_rows)
+            # 묶음 계획(invoice_plan)에서 16건씩 나누므로 여기까지 오면 안 됨 - 일부만 발행하지 않음
+            raise ValueError(f"한 장에 {len(work_rows)}건 - {MAX_ITEMS_PER_INVOICE}건 초과 묶음은 분할 계획이 필요합니다.")
+        
+        _journal(processor, work_rows, business_number, ITEMS_ENTERED)
         
         # 4. 합계 확정 (결제방법 분류) - 발급보류 포함
+        # 홈택스가 정한 공급일자/거래처 값은 발급보류 후 화면이 초기화되기 전에 읽어 둠
+        form_header = await read_form_header(page)
         success = await finalize_transaction_summary(page, work_rows, processor, business_number)
         
         # 5. 발급보류 성공 후에만 세금계산서 시트에 기록 및 Q열 완료 표시
         if success:
-            # 세금계산서 시트에 기록
-            await write_to_tax_invoice_sheet(page, processor, work_rows, business_number)
-            
-            # Q열에 완료 표시
-            from datetime import datetime
             today_date = datetime.now().strftime("%Y-%m-%d")
             
-            for row_data in work_rows:
-                processor.write_completion_to_excel_q_column(row_data['excel_row'], today_date)
+            # 엑셀을 건드리기 전에 발급보류 완료를 저널에 기록
+            _journal(processor, work_rows, business_number, ON_HOLD, status_date=today_date)
+            
+            # 세금계산서 시트에 기록
+            write_result = await write_to_tax_invoice_sheet(page, processor, work_rows, business_number, form_header)
+            
+            # Q열 완료일은 그룹 전체를 한 번의 열기/저장으로 기록하고, 엑셀 반영이 끝나면 저널에 완료 표시
+            if hasattr(processor, 'mark_group_written'):
+                processor.mark_group_written(work_rows, business_number, write_result, status_date=today_date)
+            else:
+                with processor.status_batch():
+                    for row_data in work_rows:
+                        processor.write_completion_to_excel_q_column(row_data['excel_row'], today_date)
+        else:
+            _journal(processor, work_rows, business_number, FAILED)
         
         print("   [OK] 거래 내역 입력 프로세스 완료!")
         
@@ -66,24 +88,26 @@ async def process_transaction_details(page, processor, first_row_data, business_
         print(f"   [ERROR] 거래 내역 입력 프로세스 오류: {e}")
         # 오류 발생 시 Q열에 오류 표시
         if 'work_rows' in locals():
-            for row_data in work_rows:
-                processor.write_error_to_excel_q_column(row_data['excel_row'], "처리오류")
+            with processor.status_batch():
+                for row_data in work_rows:
+                    processor.write_error_to_excel_q_column(row_data['excel_row'], "처리오류")
 
 
 def get_same_business_number_rows(processor, business_number):
-    """동일 사업자번호를 가진 모든 행 데이터 반환"""
+    """처리 중인 세금계산서 묶음의 행 데이터 반환 (묶음이 없으면 동일 사업자번호 전체)"""
     try:
         print(f"   🔍 사업자번호 '{business_number}' 관련 데이터 검색 중...")
         
-        # selected_data에서 해당 사업자번호와 일치하는 모든 행 찾기
-        if not hasattr(processor, 'selected_data') or not processor.selected_data:
+        # 묶음 계획을 지원하는 프로세서는 현재 묶음(16건 이하)을 그대로 사용
+        rows_for_business_number = getattr(processor, 'rows_for_business_number', None)
+        if rows_for_business_number is not None:
+            matching_rows = rows_for_business_number(business_number)
+        elif not getattr(processor, 'selected_data', None):
             print("   [ERROR] 처리할 데이터가 없습니다.")
             return []
-        
-        matching_rows = []
-        for row_data in processor.selected_data:
-            if str(row_data.get('등록번호', '')).strip() == business_number.strip():
-                matching_rows.append(row_data)
+        else:
+            matching_rows = [row_data for row_data in processor.selected_data
+                             if str(row_data.get('등록번호', '')).strip() == business_number.strip()]
         
         if not matching_rows:
             print("   [ERROR] 일치하는 사업자번호 데이터가 없습니다.")
@@ -105,8 +129,7 @@ async def check_and_update_supply_date(page, first_row):
     try:
         print("   [DATE] 공급일자 확인 중...")
         
-        excel_date = _get_excel_date(first_row)
-        excel_date_obj = _parse_date(excel_date)
+        excel_date_obj = _get_excel_date(first_row)
         
         # HomeTax 현재 공급일자 가져오기
         hometax_date_input = page.locator("#mf_txppWframe_calWrtDtTop_input")
@@ -127,27 +150,14 @@ async def check_and_update_supply_date(page, first_row):
 
 
 def _get_excel_date(first_row):
-    """엑셀에서 날짜 데이터 추출"""
-    for col in get_date_columns():
-        if col in first_row and pd.notna(first_row[col]):
-            print(f"   [DATA] Excel {col}: {first_row[col]}")
-            return first_row[col]
+    """엑셀 행의 공급일자 (로드 시 변환된 값, 없으면 오늘)"""
+    supply_date = coerce_record(first_row).supply_date
+    if supply_date:
+        print(f"   [DATA] Excel 공급일자: {supply_date}")
+        return supply_date
     
     print("   [WARN] Excel에서 날짜를 찾을 수 없어 현재 날짜를 사용합니다.")
-    return datetime.now()
-
-
-def _parse_date(date_value):
-    """날짜 값을 datetime 객체로 변환"""
-    if isinstance(date_value, pd.Timestamp):
-        return date_value
-    elif isinstance(date_value, str):
-        try:
-            return pd.to_datetime(date_value)
-        except:
-            return datetime.now()
-    else:
-        return datetime.now()
+    return datetime.now().date()
 
 
 def _dates_differ_by_month(date1, date2):
@@ -170,7 +180,7 @@ async def _handle_date_mismatch(page, excel_date_obj, hometax_date_input):
     new_date_str = excel_date_obj.strftime("%Y%m%d")
     await hometax_date_input.clear()
     await hometax_date_input.fill(new_date_str)
-    await page.wait_for_timeout(500)
+    await wait_until_ready(page, 2000)
     
     print(f"   [OK] 공급일자 변경 완료: {new_date_str}")
 
@@ -180,9 +190,7 @@ async def input_transaction_items_basic(page, work_rows):
     try:
         print(f"   [INPUT] 기본 거래 내역 입력: {len(work_rows)}건")
         
-        for i, row_data in enumerate(work_rows, 1):
-            await input_single_transaction_item(page, i, row_data)
-            await page.wait_for_timeout(300)
+        await _fill_line_items(page, work_rows)
         
         print("   [OK] 기본 거래 내역 입력 완료")
         
@@ -206,7 +214,8 @@ async def input_transaction_items_extended(page, work_rows):
                     add_button = page.locator("#mf_txppWframe_btnLsatAddTop")
                     await add_button.wait_for(state="visible", timeout=3000)
                     await add_button.click()
-                    await page.wait_for_timeout(500)
+                    # 새 품목 줄이 생길 때까지 (기본 4줄 + 추가한 줄)
+                    await wait_for_item_rows(page, 4 + add_count + 1, 3000)
                     print(f"   ➕ 품목 추가 {add_count + 1}/{items_to_add}")
                     
                 except Exception as add_error:
@@ -214,9 +223,7 @@ async def input_transaction_items_extended(page, work_rows):
                     break
         
         # 모든 거래 내역 입력
-        for i, row_data in enumerate(work_rows, 1):
-            await input_single_transaction_item(page, i, row_data)
-            await page.wait_for_timeout(300)
+        await _fill_line_items(page, work_rows)
         
         print("   [OK] 확장 거래 내역 입력 완료")
         
@@ -230,12 +237,13 @@ async def input_single_transaction_item(page, row_idx, row_data):
         print(f"   [INPUT] {row_idx}번째 거래 내역 입력 중...")
         idx = row_idx - 1  # 0-based index
         
-        await _input_date_field(page, idx, row_data)
-        await _input_item_name_field(page, idx, row_data)
-        await _input_basic_fields(page, idx, row_data)
-        await _input_remark_field(page, idx, row_data)
+        failed = await fill_fields(page, _line_item_values(idx, row_data), optional=[_remark_selector(idx)])
+        await wait_until_ready(page, 1000)
         
-        print(f"   [OK] {row_idx}번째 거래 내역 입력 완료")
+        if failed:
+            print(f"   [WARN] {row_idx}번째 거래 내역 일부 필드 입력 실패: {failed}")
+        else:
+            print(f"   [OK] {row_idx}번째 거래 내역 입력 완료")
         
     except Exception as e:
         print(f"   [ERROR] {row_idx}번째 거래 내역 입력 오류: {e}")
@@ -264,7 +272,8 @@ async def finalize_transaction_summary(page, work_rows, processor, business_numb
         
         # 발급보류 버튼 클릭 및 연속 Alert 처리
         try:
-            await page.wait_for_timeout(1000)  # 1초 대기
+            # 결제방법/영수·청구 입력 반영(화면 처리) 완료 대기
+            await wait_until_ready(page, 3000)
             
             # 발급보류 버튼 확인 및 클릭
             issue_button = page.locator("#mf_txppWframe_btnIsnRsrv")
@@ -272,146 +281,27 @@ async def finalize_transaction_summary(page, work_rows, processor, business_numb
             
             print("   [FORM] 발급보류 버튼 클릭 시도...")
             
-            # 연속 Alert 처리를 위한 통합 핸들러
-            dialog_count = 0
-            max_dialogs = 2
-            all_dialogs_handled = False
-            
-            async def handle_consecutive_dialogs(dialog):
-                nonlocal dialog_count, all_dialogs_handled
-                dialog_count += 1
-                
-                print(f"   [ALERT] Alert {dialog_count}/2: {dialog.message}")
-                await dialog.accept()  # 확인 클릭
-                
-                if dialog_count == 1:
-                    print("   [OK] 발급보류 확인 다이얼로그 - 확인 클릭")
-                elif dialog_count == 2:
-                    print("   [OK] 발급보류 성공 다이얼로그 - 확인 클릭")
-                    all_dialogs_handled = True
-                
-                # 아직 더 처리할 dialog가 있다면 계속 리스너 유지
-                if dialog_count < max_dialogs:
-                    page.once("dialog", handle_consecutive_dialogs)
-            
-            # 첫 번째 dialog 리스너 설정
-            page.once("dialog", handle_consecutive_dialogs)
+            # 발급보류 확인 요청 → (안내) → 성공 알림을 기다림 (성공/오류 메시지가 오면 즉시 종료)
+            expectation = DialogRouter.for_page(page).expect(count=3, until=(SUCCESS,))
             
             # 발급보류 버튼 클릭
             await issue_button.click()
             print("   [FORM] 발급보류 버튼 클릭 완료")
             
-            # 모든 다이얼로그 처리 완료까지 대기 (최대 10초)
-            wait_time = 0
-            max_wait_time = 10.0
+            # 성공 알림이 오는 즉시 다음 단계로 (최대 12초)
+            await expectation.wait(12.0)
             
-            while not all_dialogs_handled and wait_time < max_wait_time:
-                await page.wait_for_timeout(200)
-                wait_time += 0.2
-                
-                # 진행 상황 로깅
-                if wait_time % 2.0 < 0.2:
-                    print(f"   [WAIT] Alert 처리 대기 중... ({dialog_count}/2 완료, {wait_time:.1f}초 경과)")
-            
-            if not all_dialogs_handled:
-                print(f"   [WARN] 모든 Alert가 처리되지 않았습니다. ({dialog_count}/2 처리됨)")
-                # 다시 한 번 더 시도해보자
-                await page.wait_for_timeout(2000)
-                
-                # 추가 시도: 다양한 방법으로 Alert 감지 및 처리
-                try:
-                    # 방법 1: JavaScript로 직접 Alert 확인 및 처리
-                    result = await page.evaluate("""
-                        () => {
-                            return {
-                                hasAlert: typeof window.alert !== 'function',
-                                hasConfirm: typeof window.confirm !== 'function',
-                                documentReady: document.readyState,
-                                activeElement: document.activeElement ? document.activeElement.tagName : null
-                            };
-                        }
-                    """)
-                    print(f"   [DEBUG] JavaScript 상태: {result}")
-                    
-                    # 방법 2: 홈택스 특정 Alert 요소 확인 및 클릭 시도
-                    hometax_alerts = await page.query_selector_all("div[id*='alert'], div[class*='alert'], div[id*='dialog'], div[class*='popup']")
-                    if hometax_alerts:
-                        print(f"   [DEBUG] 홈택스 Alert 요소 {len(hometax_alerts)}개 발견")
-                        
-                        # 각 Alert 요소에서 확인 버튼 찾아서 클릭
-                        for i, alert_element in enumerate(hometax_alerts):
-                            try:
-                                # Alert 내부의 확인 버튼들을 찾아서 클릭 시도
-                                confirm_buttons = await alert_element.query_selector_all("button, input[type='button'], .btn, [onclick*='확인'], [onclick*='OK']")
-                                for btn in confirm_buttons:
-                                    try:
-                                        btn_text = await btn.text_content() or ""
-                                        btn_value = await btn.get_attribute("value") or ""
-                                        if "확인" in btn_text or "OK" in btn_text.upper() or "확인" in btn_value:
-                                            await btn.click()
-                                            print(f"   [OK] Alert {i+1}의 확인 버튼 클릭 완료: '{btn_text or btn_value}'")
-                                            success_dialog_handled = True
-                                            break
-                                    except Exception as btn_error:
-                                        continue
-                                        
-                                if success_dialog_handled:
-                                    break
-                                    
-                            except Exception as alert_error:
-                                print(f"   [DEBUG] Alert {i+1} 처리 실패: {alert_error}")
-                                continue
-                    
-                    # 방법 3: JavaScript로 직접 확인 버튼 클릭 시도
-                    if not success_dialog_handled:
-                        try:
-                            js_click_result = await page.evaluate("""
-                                () => {
-                                    // 다양한 확인 버튼 선택자들 시도
-                                    const selectors = [
-                                        'button:contains("확인")',
-                                        'input[value="확인"]',
-                                        'button:contains("OK")',
-                                        '[onclick*="확인"]',
-                                        '.btn:contains("확인")',
-                                        'button[type="button"]:contains("확인")'
-                                    ];
-                                    
-                                    let clicked = false;
-                                    document.querySelectorAll('button, input[type="button"], .btn').forEach(btn => {
-                                        const text = btn.textContent || btn.value || '';
-                                        if ((text.includes('확인') || text.includes('OK')) && btn.offsetParent !== null) {
-                                            btn.click();
-                                            clicked = true;
-                                            return true;
-                                        }
-                                    });
-                                    
-                                    return { clicked: clicked };
-                                }
-                            """)
-                            if js_click_result.get('clicked'):
-                                print("   [OK] JavaScript로 확인 버튼 클릭 완료")
-                                success_dialog_handled = True
-                        except Exception as js_click_error:
-                            print(f"   [DEBUG] JavaScript 클릭 실패: {js_click_error}")
-                        
-                    # 방법 4: 페이지 소스에서 성공 메시지 확인 (최종 확인용)
-                    page_content = await page.content()
-                    success_keywords = ["성공", "완료", "처리되었습니다", "저장되었습니다"]
-                    found_keywords = [keyword for keyword in success_keywords if keyword in page_content]
-                    if found_keywords:
-                        print(f"   [DEBUG] 성공 관련 키워드 발견: {found_keywords}")
-                        
-                except Exception as js_error:
-                    print(f"   [DEBUG] 추가 확인 실패: {js_error}")
+            if expectation.error is not None:
+                print(f"   [ERROR] 발급보류 오류 메시지: {expectation.error.message}")
+            elif not expectation.succeeded:
+                print(f"   [WARN] 발급보류 성공 알림을 받지 못했습니다: {expectation.messages}")
             
-            # 폼 초기화 확인 및 대기
-            await page.wait_for_timeout(2000)  # 폼 클리어 대기
+            # 폼 초기화 확인 및 대기 (요청/화면 처리가 끝날 때까지, 최대 3초)
+            await settle(page, 3000)
             print("   [OK] 전자세금계산서 입력 화면 클리어 완료")
             
-            # 성공 여부 반환
-            issuance_success = all_dialogs_handled  # 모든 다이얼로그가 처리되면 성공으로 간주
+            # 성공 알림을 받았을 때만 성공 (확인 요청/안내만 받은 경우는 실패)
+            issuance_success = expectation.succeeded
             
         except Exception as e:
             print(f"   [ERROR] 발급보류 처리 실패: {e}")
@@ -429,7 +319,7 @@ async def verify_and_calculate_credit(page, work_rows, cash_amount, check_amount
     """합계금액 검증 및 외상미수금 계산"""
     try:
         # 실제 거래 합계 계산
-        actual_total = sum(float(row.get('합계금액', 0) or 0) for row in work_rows)
+        actual_total = sum(record.amount('합계금액') for record in coerce_records(work_rows))
         
         # HomeTax 합계금액 가져오기 (여러 방법 시도)
         total_field = page.locator("#mf_txppWframe_edtTotaAmtHeaderTop")
@@ -484,45 +374,13 @@ async def handle_issuance_alerts(page):
     try:
         print("   [ALERT] 발급보류 후 Alert 처리 대기 중...")
         
-        # 발급보류 버튼 클릭 후 잠시 더 대기 (시스템 처리 시간)
-        await page.wait_for_timeout(2000)  # 2초 대기
-        
-        # Alert 처리를 위한 통합 함수
-        async def wait_for_alert(alert_name, timeout_sec):
-            try:
-                dialog_event = asyncio.Event()
-                dialog_message = None
-
-                async def handle_dialog(dialog):
-                    nonlocal dialog_message
-                    dialog_message = dialog.message
-                    print(f"   [MSG] {alert_name} Alert 감지: {dialog_message}")
-                    await dialog.accept()
-                    dialog_event.set()
-
-                page.once("dialog", handle_dialog)
-                
-                # Alert 대기
-                await asyncio.wait_for(dialog_event.wait(), timeout=timeout_sec)
-                print(f"   [OK] {alert_name} Alert 처리 완료")
-                await page.wait_for_timeout(500)  # Alert 처리 후 잠시 대기
-                return True
-                
-            except asyncio.TimeoutError:
-                print(f"   [INFO] {alert_name} Alert 없음 (timeout: {timeout_sec}초)")
-                return False
-        
-        # 첫 번째 Alert 처리 (더 긴 대기 시간)
-        await wait_for_alert("첫 번째", 7.0)
-        
-        # 두 번째 Alert 처리 (첫 번째 Alert 후 나타남)
-        await wait_for_alert("두 번째", 5.0)
-        
-        # 추가 Alert 확인 (혹시나 더 있을 수 있음)
-        await wait_for_alert("추가", 3.0)
-        
-        # 최종 대기
-        await page.wait_for_timeout(1000)
+        # 확인 요청 → 성공 알림 (+ 추가 안내) - 성공/오류 메시지가 오면 바로 종료 (최대 12초)
+        expectation = DialogRouter.for_page(page).expect(count=3, until=(SUCCESS,), stop_on=(ERROR,))
+        events = await expectation.wait(12.0)
+        if not events:
+            print("   [INFO] 발급보류 후 Alert 없음 (timeout: 12초)")
+        for index, event in enumerate(events, 1):
+            print(f"   [OK] Alert {index} 처리 완료: {event.message}")
         
     except Exception as e:
         print(f"   [ERROR] Alert 처리 오류: {e}")
@@ -603,7 +461,6 @@ async def clear_form_fields(page):
                 if await element.is_visible():
                     await element.clear()
                     cleared_count += 1
-                    await page.wait_for_timeout(50)  # 짧은 대기
             except Exception as field_error:
                 # 개별 필드 초기화 실패는 무시하고 계속 진행
                 pass
@@ -627,631 +484,126 @@ async def clear_form_fields(page):
                         if await element.is_visible():
                             await element.clear()
                             cleared_count += 1
-                            await page.wait_for_timeout(30)
                     except:
                         pass
                         
             except Exception:
                 pass
         
+        # 필드마다 고정 대기하는 대신 모두 지운 뒤 합계 재계산(처리 중 표시)이 끝날 때까지 한 번 대기
+        await wait_until_ready(page, 2000)
         print(f"   🔄 폼 필드 초기화 완료: {cleared_count}개 필드 초기화됨")
         
     except Exception as e:
         print(f"   [ERROR] 폼 필드 초기화 오류 (계속 진행): {e}")
 
 
-async def write_to_tax_invoice_sheet(page, processor, work_rows, business_number):
-    """세금계산서 시트에 기록"""
+async def write_to_tax_invoice_sheet(page, processor, work_rows, business_number, form_header=None):
+    """세금계산서 시트에 기록
+
+    요약(품목, 금액 합계, 기간및건수)은 거래명세표 행에서 계산하고, 홈택스가 정하는 값
+    (공급일자, 상호, 이메일)만 form_header(발급보류 전에 read_form_header로 읽은 값)나
+    검증 때 수집한 거래처 정보에서 가져온다. form_header가 없으면 지금 화면에서 한 번 읽는다.
+    """
     try:
         print("   [FORM] 세금계산서 시트 기록 중...")
         
-        # 값이 초기화되는 문제 방지 - 페이지 안정화 대기
-        print("   [WAIT] 페이지 안정화 대기 중...")
-        await page.wait_for_timeout(3000)  # 3초 대기로 초기화 방지
-        
-        # 페이지 로딩 완료 확인
-        try:
-            await page.wait_for_load_state("networkidle", timeout=5000)
-            print("   [OK] 네트워크 안정화 완료")
-        except:
-            print("   [WARN] 네트워크 안정화 대기 시간 초과 - 계속 진행")
-        
-        # 페이지 상태 검증 함수
-        async def is_page_valid():
-            """페이지가 유효한 상태인지 확인"""
-            try:
-                # 페이지가 닫혔는지 확인
-                if page.is_closed():
-                    print("   [ERROR] 페이지가 이미 닫혔습니다.")
-                    return False
-                
-                # 브라우저 컨텍스트가 유효한지 확인
-                await page.evaluate("() => document.readyState")
-                return True
-            except Exception as e:
-                print(f"   [ERROR] 페이지 상태 검증 실패: {e}")
-                return False
-        
-        # 페이지 상태 검증
-        if not await is_page_valid():
-            print("   [ERROR] 페이지가 유효하지 않아 필드 수집을 건너뜁니다.")
-            return
-        
-        # 필드값 수집
-        print("   [COLLECT] 필드값 수집 시작...")
-        
-        # FieldCollector 인스턴스 생성
-        collector = FieldCollector()
-        
-        # 공급일자 수집
-        supply_date = await collector.get_field_value(page, "#mf_txppWframe_calWrtDtTop_input", "공급일자")
-        if not supply_date:
-            print("   [RETRY] 공급일자 재시도...")
-            await page.wait_for_timeout(1000)
-            supply_date = await collector.get_field_value(page, "#mf_txppWframe_calWrtDtTop_input", "공급일자")
-        
-        # 거래처 정보 우선 캐시에서 가져오기
-        partner_info = None
-        if hasattr(processor, 'partner_info_cache') and business_number in processor.partner_info_cache:
-            partner_info = processor.partner_info_cache[business_number]
-            print(f"   [CACHE] 캐시된 거래처 정보 사용: {partner_info['company_name']}")
-        
-        # 상호명 - 캐시 우선, 없으면 페이지에서 수집
-        company_name = ""
-        if partner_info and partner_info.get('company_name'):
-            company_name = partner_info['company_name']
-            print(f"   [CACHE] 상호명 (캐시): {company_name}")
-        else:
-            # 상호명 수집 (다중 선택자 시도)
-            for selector in SelectorManager.COMPANY_NAME_SELECTORS:
-                print(f"   [TRY] 상호명 수집 시도: {selector}")
-                company_name = await collector.get_field_value(page, selector, f"상호({selector})", wait_time=5000)
-                if company_name and company_name.strip():
-                    print(f"   [SUCCESS] 상호명 수집 성공: '{company_name}'")
-                    break
-                await page.wait_for_timeout(200)
-        
-        if not company_name:
-            # 마지막 시도: JavaScript로 직접 찾기
-            try:
-                company_name = await page.evaluate("""
-                    () => {
-                        // 다양한 방법으로 상호명 필드 찾기
-                        const selectors = [
-                            '#mf_txppWframe_edtDmnrTnmNmTop',
-                            'input[id*="DmnrTnmNm"]',
-                            'input[placeholder*="상호"]'
-                        ];
-                        
-                        for (let selector of selectors) {
-                            const el = document.querySelector(selector);
-                            if (el && el.value && el.value.trim()) {
-                                return el.value.trim();
-                            }
-                        }
-                        return '';
-                    }
-                """)
-                if company_name:
-                    print(f"   [SUCCESS] 상호명 JavaScript 수집 성공: '{company_name}'")
-            except Exception as e:
-                print(f"   [WARN] 상호명 JavaScript 수집 실패: {e}")
-        
-        print(f"   [RESULT] 최종 상호명: '{company_name}'")
-        
-        # 이메일 - 캐시 우선, 없으면 페이지에서 수집
-        email_combined = ""
-        if partner_info and partner_info.get('full_email'):
-            email_combined = partner_info['full_email']
-            print(f"   [CACHE] 이메일 (캐시): {email_combined}")
-        else:
-            # 이메일 정보 가져오기 (강화된 방법)
-            print("   [EMAIL] 이메일 정보 수집 시작...")
-            
-            # 이메일 ID 수집 - 다중 선택자 시도
-            email_id = ""
-            email_id_selectors = [
-                "#mf_txppWframe_edtDmnrMchrgEmlIdTop",
-                "#mf_txppWframe_edtDmnrMchrgEmlIdTop_input",
-                "input[id*='MchrgEmlId']",
-                "input[name*='emailId']",
-                "[placeholder*='이메일'][placeholder*='ID']"
-            ]
-            
-            for selector in email_id_selectors:
-                email_id = await get_field_value(selector, f"이메일ID({selector})")
-                if email_id:
-                    print(f"   [EMAIL-ID] 수집 성공: '{email_id}'")
-                    break
-            
-            # 이메일 도메인 수집 - 다중 선택자 시도
-            email_domain = ""
-            email_domain_selectors = [
-                "#mf_txppWframe_edtDmnrMchrgEmlDmanTop",
-                "#mf_txppWframe_edtDmnrMchrgEmlDmanTop_input", 
-                "input[id*='MchrgEmlDman']",
-                "input[name*='emailDomain']",
-                "[placeholder*='이메일'][placeholder*='도메인']"
-            ]
-            
-            for selector in email_domain_selectors:
-                email_domain = await get_field_value(selector, f"이메일도메인({selector})")
-                if email_domain:
-                    print(f"   [EMAIL-DOMAIN] 수집 성공: '{email_domain}'")
-                    break
-        
-        # JavaScript로 이메일 정보 추가 수집 시도
-        if not email_id or not email_domain:
-            try:
-                email_data = await page.evaluate("""
-                    () => {
-                        const result = {id: '', domain: ''};
-                        
-                        // ID 찾기
-                        const idSelectors = [
-                            '#mf_txppWframe_edtDmnrMchrgEmlIdTop',
-                            'input[id*="MchrgEmlId"]'
-                        ];
-                        for (let selector of idSelectors) {
-                            const el = document.querySelector(selector);
-                            if (el && el.value && el.value.trim()) {
-                                result.id = el.value.trim();
-                                break;
-                            }
-                        }
-                        
-                        // 도메인 찾기
-                        const domainSelectors = [
-                            '#mf_txppWframe_edtDmnrMchrgEmlDmanTop',
-                            'input[id*="MchrgEmlDman"]'
-                        ];
-                        for (let selector of domainSelectors) {
-                            const el = document.querySelector(selector);
-                            if (el && el.value && el.value.trim()) {
-                                result.domain = el.value.trim();
-                                break;
-                            }
-                        }
-                        
-                        return result;
-                    }
-                """)
-                
-                if not email_id and email_data.get('id'):
-                    email_id = email_data['id']
-                    print(f"   [EMAIL-ID] JavaScript 수집 성공: '{email_id}'")
-                
-                if not email_domain and email_data.get('domain'):
-                    email_domain = email_data['domain']
-                    print(f"   [EMAIL-DOMAIN] JavaScript 수집 성공: '{email_domain}'")
-                    
-            except Exception as e:
-                print(f"   [WARN] 이메일 JavaScript 수집 실패: {e}")
-        
-            # JavaScript로 이메일 정보 추가 수집 시도
-            if not email_id or not email_domain:
-                try:
-                    email_data = await page.evaluate("""
-                        () => {
-                            const result = {id: '', domain: ''};
-                            
-                            // ID 찾기
-                            const idSelectors = [
-                                '#mf_txppWframe_edtDmnrMchrgEmlIdTop',
-                                'input[id*="MchrgEmlId"]'
-                            ];
-                            
-                            for (let sel of idSelectors) {
-                                const el = document.querySelector(sel);
-                                if (el && el.value && el.value.trim()) {
-                                    result.id = el.value.trim();
-                                    break;
-                                }
-                            }
-                            
-                            // Domain 찾기
-                            const domainSelectors = [
-                                '#mf_txppWframe_edtDmnrMchrgEmlDmanTop',
-                                'input[id*="MchrgEmlDman"]'
-                            ];
-                            
-                            for (let sel of domainSelectors) {
-                                const el = document.querySelector(sel);
-                                if (el && el.value && el.value.trim()) {
-                                    result.domain = el.value.trim();
-                                    break;
-                                }
-                            }
-                            
-                            return result;
-                        }
-                    """)
-                    
-                    if email_data['id'] and not email_id:
-                        email_id = email_data['id']
-                        print(f"   [EMAIL-ID] JavaScript 수집 성공: '{email_id}'")
-                    if email_data['domain'] and not email_domain:
-                        email_domain = email_data['domain']
-                        print(f"   [EMAIL-DOMAIN] JavaScript 수집 성공: '{email_domain}'")
-                        
-                except Exception as e:
-                    print(f"   [WARN] 이메일 JavaScript 수집 실패: {e}")
-            
-            # 이메일 조합 - 강화된 로직
-            if email_id and email_domain:
-                email_combined = f"{email_id}@{email_domain}"
-                print(f"   [EMAIL] 완전한 이메일 조합 성공: '{email_combined}'")
-            elif email_id and not email_domain:
-                # ID만 있고 도메인이 없는 경우 - ID에 @가 포함되어 있는지 확인
-                if "@" in email_id:
-                    email_combined = email_id  # 이미 완전한 이메일
-                    print(f"   [EMAIL] 완성된 이메일 ID 사용: '{email_combined}'")
-                else:
-                    email_combined = email_id  # 도메인 없으면 ID만
-                    print(f"   [EMAIL] ID만 사용: '{email_combined}'")
-            elif not email_id and email_domain:
-                email_combined = f"@{email_domain}"  # ID 없으면 @도메인만
-                print(f"   [EMAIL] 도메인만 사용: '{email_combined}'")
-            else:
-                email_combined = ""  # 둘 다 없으면 빈 값
-                print(f"   [EMAIL] 이메일 정보 없음")
-        
-        print(f"   [RESULT] 최종 이메일: '{email_combined}'")
-        
-        # 합계 금액들 수집 (강화된 방법)
-        print("   [AMOUNT] 금액 정보 수집 시작...")
-        
-        # 공급가액 수집 - 다중 방법 시도
-        print("   [SUPPLY] 공급가액 수집 시도...")
-        total_supply_raw = ""
-        supply_selectors = [
-            "#mf_txppWframe_edtSumSplCftHeaderTop",
-            "#mf_txppWframe_edtSumSplCftHeaderTop_input",
-            "input[id*='SumSplCft']",
-            "input[name*='supplyAmount']",
-            "[title*='공급가액']",
-            ".supply-amount",
-            "#supplyAmount"
-        ]
-        
-        for selector in supply_selectors:
-            total_supply_raw = await get_field_value(selector, f"공급가액({selector})", wait_time=5000)
-            if total_supply_raw:
-                print(f"   [SUPPLY] 공급가액 수집 성공: '{total_supply_raw}'")
-                break
-        
-        # JavaScript로 공급가액 추가 시도
-        if not total_supply_raw:
-            try:
-                total_supply_raw = await page.evaluate("""
-                    () => {
-                        const selectors = [
-                            '#mf_txppWframe_edtSumSplCftHeaderTop',
-                            'input[id*="SumSplCft"]',
-                            'input[title*="공급가액"]'
-                        ];
-                        
-                        for (let selector of selectors) {
-                            const el = document.querySelector(selector);
-                            if (el && el.value && el.value.trim()) {
-                                return el.value.trim();
-                            }
-                        }
-                        return '';
-                    }
-                """)
-                if total_supply_raw:
-                    print(f"   [SUPPLY] JavaScript 공급가액 수집 성공: '{total_supply_raw}'")
-            except Exception as e:
-                print(f"   [WARN] JavaScript 공급가액 수집 실패: {e}")
-        
-        # 세액 수집 - 다중 방법 시도
-        print("   [TAX] 세액 수집 시도...")
-        total_tax_raw = ""
-        tax_selectors = [
-            "#mf_txppWframe_edtSumTxamtHeaderTop",
-            "#mf_txppWframe_edtSumTxamtHeaderTop_input",
-            "input[id*='SumTxamt']",
-            "input[name*='taxAmount']",
-            "[title*='세액']",
-            ".tax-amount",
-            "#taxAmount"
-        ]
-        
-        for selector in tax_selectors:
-            total_tax_raw = await get_field_value(selector, f"세액({selector})", wait_time=5000)
-            if total_tax_raw:
-                print(f"   [TAX] 세액 수집 성공: '{total_tax_raw}'")
-                break
-        
-        # JavaScript로 세액 추가 시도
-        if not total_tax_raw:
-            try:
-                total_tax_raw = await page.evaluate("""
-                    () => {
-                        const selectors = [
-                            '#mf_txppWframe_edtSumTxamtHeaderTop',
-                            'input[id*="SumTxamt"]',
-                            'input[title*="세액"]'
-                        ];
-                        
-                        for (let selector of selectors) {
-                            const el = document.querySelector(selector);
-                            if (el && el.value && el.value.trim()) {
-                                return el.value.trim();
-                            }
-                        }
-                        return '';
-                    }
-                """)
-                if total_tax_raw:
-                    print(f"   [TAX] JavaScript 세액 수집 성공: '{total_tax_raw}'")
-            except Exception as e:
-                print(f"   [WARN] JavaScript 세액 수집 실패: {e}")
-        
-        # 합계금액 수집 - 다중 방법 시도
-        print("   [TOTAL] 합계금액 수집 시도...")
-        total_amount_raw = ""
-        total_selectors = [
-            "#mf_txppWframe_edtTotaAmtHeaderTop",
-            "#mf_txppWframe_edtTotaAmtHeaderTop_input", 
-            "input[id*='TotaAmt']",
-            "input[name*='totalAmount']",
-            "[title*='합계금액']",
-            ".total-amount",
-            "#totalAmount"
-        ]
-        
-        for selector in total_selectors:
-            total_amount_raw = await get_field_value(selector, f"합계금액({selector})", wait_time=5000)
-            if total_amount_raw:
-                print(f"   [TOTAL] 합계금액 수집 성공: '{total_amount_raw}'")
-                break
-        
-        # JavaScript로 합계금액 추가 시도
-        if not total_amount_raw:
-            try:
-                total_amount_raw = await page.evaluate("""
-                    () => {
-                        const selectors = [
-                            '#mf_txppWframe_edtTotaAmtHeaderTop',
-                            'input[id*="TotaAmt"]',
-                            'input[title*="합계금액"]'
-                        ];
-                        
-                        for (let selector of selectors) {
-                            const el = document.querySelector(selector);
-                            if (el && el.value && el.value.trim()) {
-                                return el.value.trim();
-                            }
-                        }
-                        return '';
-                    }
-                """)
-                if total_amount_raw:
-                    print(f"   [TOTAL] JavaScript 합계금액 수집 성공: '{total_amount_raw}'")
-            except Exception as e:
-                print(f"   [WARN] JavaScript 합계금액 수집 실패: {e}")
-        
-        # 숫자 필드 정리 (콤마 제거)
-        total_supply = total_supply_raw.replace(',', '') if total_supply_raw else ""
-        total_tax = total_tax_raw.replace(',', '') if total_tax_raw else ""
-        total_amount = total_amount_raw.replace(',', '') if total_amount_raw else ""
-        
-        print(f"   [RESULT] 최종 공급가액: '{total_supply}'")
-        print(f"   [RESULT] 최종 세액: '{total_tax}'")
-        print(f"   [RESULT] 최종 합계금액: '{total_amount}'")
+        if form_header is None:
+            form_header = await read_form_header(page)
         
-        # 첫 번째 품목 정보
-        first_item_name = await get_field_value("#mf_txppWframe_genEtxivLsatTop_0_edtLsatNmTop", "첫번째품목명")
-        first_item_spec = await get_field_value("#mf_txppWframe_genEtxivLsatTop_0_edtLsatRszeNmTop", "첫번째규격")
-        first_item_quantity = await get_field_value("#mf_txppWframe_genEtxivLsatTop_0_edtLsatQtyTop", "첫번째수량")
+        # 거래처 정보 - 사업자번호 검증 때 수집한 캐시 우선
+        partner_info = getattr(processor, 'partner_info_cache', {}).get(business_number) or {}
+        if partner_info:
+            print(f"   [CACHE] 캐시된 거래처 정보 사용: {partner_info.get('company_name', '')}")
+        company_name = partner_info.get('company_name') or form_header.get('company_name', '')
+        email_combined = partner_info.get('full_email') or combine_email(
+            form_header.get('email_id', ''), form_header.get('email_domain', ''))
         
-        # 품목명 생성 로직 수정
-        if len(work_rows) == 1:
-            # 1건인 경우: 홈택스 필드값 그대로 사용
-            item_name = first_item_name or work_rows[0].get('품명', '') or work_rows[0].get('품목명', '')
-            item_spec = first_item_spec or work_rows[0].get('규격', '')
-            item_quantity = first_item_quantity or str(work_rows[0].get('수량', ''))
-        else:
-            # 여러 건인 경우: "첫번째품목명 외 N개 품목" 형식으로 수정
-            base_item = first_item_name or work_rows[0].get('품명', '') or work_rows[0].get('품목명', '') or '품목'
-            additional_count = len(work_rows) - 1  # 첫 번째 제외한 나머지 개수
-            if additional_count > 0:
-                item_name = f"{base_item} 외 {additional_count}개 품목"
-            else:
-                item_name = base_item
-            item_spec = first_item_spec or ""
-            item_quantity = first_item_quantity or ""
-        
-        # 공급일자 범위 생성 - 형식 개선
-        def format_date(date_obj):
-            """날짜를 YYMMDD 형식으로 변환"""
-            if not date_obj:
-                return ""
-            try:
-                if isinstance(date_obj, str):
-                    import pandas as pd
-                    date_obj = pd.to_datetime(date_obj)
-                return date_obj.strftime("%y%m%d")  # 250810 형식
-            except:
-                return str(date_obj)[:8] if str(date_obj) else ""
+        tax_invoice_data = build_sheet_summary(work_rows, business_number,
+                                               supply_date=form_header.get('supply_date', ''),
+                                               company_name=company_name, email=email_combined)
         
-        if len(work_rows) == 1:
-            # 1건일 때: 2025-08-10 형식
-            single_date = work_rows[0].get('공급일자') or work_rows[0].get('작성일자', '')
-            if single_date:
-                try:
-                    import pandas as pd
-                    date_obj = pd.to_datetime(single_date)
-                    date_range = date_obj.strftime("%Y-%m-%d")  # 2025-08-10 형식
-                except:
-                    date_range = str(single_date)
-            else:
-                date_range = ""
-        else:
-            # 여러 건일 때: 250810-250831 4건 형식
-            start_date_raw = work_rows[0].get('공급일자') or work_rows[0].get('작성일자', '')
-            end_date_raw = work_rows[-1].get('공급일자') or work_rows[-1].get('작성일자', '')
-            
-            start_formatted = format_date(start_date_raw)
-            end_formatted = format_date(end_date_raw)
-            
-            if start_formatted and end_formatted and start_formatted != end_formatted:
-                date_range = f"{start_formatted}-{end_formatted} {len(work_rows)}건"
-            elif start_formatted:
-                date_range = f"{start_formatted} {len(work_rows)}건"
-            else:
-                date_range = f"{len(work_rows)}건"
-        
-        # 세금계산서 시트에 기록할 데이터 준비
-        tax_invoice_data = {
-            'a': supply_date,  # 공급일자
-            'b': business_number,  # 등록번호
-            'c': company_name,  # 상호
-            'd': email_combined,  # 이메일 (수정됨)
-            'f': item_name,  # 품목
-            'g': item_spec,  # 규격
-            'h': item_quantity,  # 수량
-            'i': total_supply,  # 공급가액
-            'j': total_tax,  # 세액
-            'k': total_amount,  # 합계금액
-            'l': date_range  # 기간 및 건수
-        }
-        
-        # 디버깅을 위한 데이터 출력
         print(f"   [DATA] 세금계산서 시트 기록 데이터:")
         for col, value in tax_invoice_data.items():
             print(f"      {col}열: '{value}'")
         
-        # 값이 초기화된 경우 한 번 더 시도
-        if not company_name or not total_supply or not total_tax or not total_amount:
-            print("   [RETRY] 주요 값이 누락됨 - 전체 재시도...")
-            await page.wait_for_timeout(2000)
-            
-            # 다시 한 번 시도
-            if not company_name:
-                company_name = await get_field_value("#mf_txppWframe_edtDmnrTnmNmTop", "상호(재시도)")
-            if not total_supply:
-                total_supply_retry = await get_field_value("#mf_txppWframe_edtSumSplCftHeaderTop", "공급가액(재시도)")
-                total_supply = total_supply_retry.replace(',', '') if total_supply_retry else ""
-            if not total_tax:
-                total_tax_retry = await get_field_value("#mf_txppWframe_edtSumTxamtHeaderTop", "세액(재시도)")
-                total_tax = total_tax_retry.replace(',', '') if total_tax_retry else ""
-            if not total_amount:
-                total_amount_retry = await get_field_value("#mf_txppWframe_edtTotaAmtHeaderTop", "합계금액(재시도)")
-                total_amount = total_amount_retry.replace(',', '') if total_amount_retry else ""
-            
-            # 재시도 결과 업데이트
-            tax_invoice_data['c'] = company_name
-            tax_invoice_data['i'] = total_supply  
-            tax_invoice_data['j'] = total_tax
-            tax_invoice_data['k'] = total_amount
-            
-            print("   [RETRY] 재시도 완료")
-        
-        # 빈 값들 처리 - 빈 값이면 기록하지 않음
-        filtered_data = {k: v for k, v in tax_invoice_data.items() if v and str(v).strip()}
-        
-        # 수집된 데이터 최종 검증
-        critical_fields = ['c', 'i', 'j', 'k']  # 상호, 공급가액, 세액, 합계금액
-        missing_fields = [field for field in critical_fields if field not in filtered_data or not str(filtered_data[field]).strip()]
-        
-        if missing_fields:
-            print(f"   [WARN] 누락된 중요 필드: {missing_fields}")
-            print("   [WARN] 가능한 원인:")
-            print("     1. 페이지가 아직 로딩 중")
-            print("     2. 필드가 초기화됨")
-            print("     3. 선택자가 변경됨")
-        else:
-            print("   [OK] 모든 중요 필드 수집 완료")
-        
-        # 실제 엑셀 파일에 기록
-        processor.write_tax_invoice_data(tax_invoice_data)
+        if not company_name:
+            print("   [WARN] 상호를 확인하지 못했습니다 - 상호 없이 기록합니다.")
         
-        # 발급보류 전에 데이터를 수집하여 기록 완료
+        # 실제 엑셀 파일에 기록 (요약은 저널에 먼저 남겨 중단 시 재기록)
+        _journal(processor, work_rows, business_number, SUMMARY, tax_invoice=tax_invoice_data)
+        write_result = processor.write_tax_invoice_data(tax_invoice_data)
         
-        print("   [FORM] 세금계산서 시트 기록 및 필드 초기화 완료!")
+        print("   [FORM] 세금계산서 시트 기록 완료!")
+        return write_result
         
     except Exception as e:
         print(f"   [ERROR] 세금계산서 시트 기록 오류: {e}")
+        return False
 
 
 # ==========================================
 # 최적화된 헬퍼 함수들
 # ==========================================
 
-async def _input_date_field(page, idx, row_data):
-    """일자 필드 입력"""
-    supply_date = _find_column_value(row_data, get_date_columns())
+async def _fill_line_items(page, work_rows):
+    """모든 품목 줄을 한 번에 입력 (실패한 필드만 필드별 재입력) 후 재계산 완료 대기"""
+    values, optional = {}, []
+    for idx, row_data in enumerate(work_rows):
+        print(f"   [INPUT] {idx + 1}번째 거래 내역")
+        values.update(_line_item_values(idx, row_data))
+        optional.append(_remark_selector(idx))
+    
+    failed = await fill_fields(page, values, optional=optional)
+    await wait_until_ready(page, 1000)
+    
+    if failed:
+        print(f"   [WARN] 입력하지 못한 필드: {failed}")
+    return failed
+
+
+def _remark_selector(idx):
+    return line_selector(idx, "edtLsatRmrkCntnTop")
+
+
+def _line_item_values(idx, row_data):
+    """품목 줄 하나의 선택자 → 입력값 (일자, 품목, 규격, 수량, 단가, 공급가액, 세액, 비고 순서)"""
+    values = {}
     
+    # 일자
+    supply_date = coerce_record(row_data).supply_date
     if supply_date:
-        try:
-            date_obj = pd.to_datetime(supply_date)
-            day_str = str(date_obj.day)
-            
-            day_input = page.locator(f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatSplDdTop")
-            await day_input.wait_for(state="visible", timeout=3000)
-            await day_input.clear()
-            await day_input.fill(day_str)
-            print(f"      일자: {day_str}")
-        except Exception as e:
-            print(f"      일자 입력 실패: {e}")
+        values[line_selector(idx, "edtLsatSplDdTop")] = str(supply_date.day)
+        print(f"      일자: {supply_date.day}")
     else:
         print(f"      일자: 데이터 없음")
-
-
-async def _input_item_name_field(page, idx, row_data):
-    """품목명 필드 입력"""
-    item_name = _find_column_value(row_data, get_item_name_columns())
     
+    # 품목명
+    item_name = _find_column_value(row_data, get_item_name_columns())
     if item_name:
-        item_input = page.locator(f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatNmTop")
-        await item_input.wait_for(state="visible", timeout=3000)
-        await item_input.clear()
-        await item_input.fill(item_name)
+        values[line_selector(idx, "edtLsatNmTop")] = item_name
         print(f"      품목: {item_name}")
     else:
         print(f"      품목: 데이터 없음")
-
-
-async def _input_basic_fields(page, idx, row_data):
-    """기본 필드들 입력 (규격, 수량, 단가, 공급가액, 세액)"""
-    field_mappings = [
-        ('규격', f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatRszeNmTop", "규격"),
-        ('수량', f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatQtyTop", "수량"),
-        ('단가', f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatUtprcTop", "단가"),
-        ('공급가액', f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatSplCftTop", "공급가액"),
-        ('세액', f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatTxamtTop", "세액")
-    ]
     
-    for field_key, selector, display_name in field_mappings:
+    # 규격, 수량, 단가, 공급가액, 세액
+    for field_key, field in [('규격', "edtLsatRszeNmTop"), ('수량', "edtLsatQtyTop"),
+                             ('단가', "edtLsatUtprcTop"), ('공급가액', "edtLsatSplCftTop"),
+                             ('세액', "edtLsatTxamtTop")]:
         value = str(row_data.get(field_key, '')).strip()
         if value:
-            field_input = page.locator(selector)
-            await field_input.wait_for(state="visible", timeout=3000)
-            await field_input.clear()
-            await field_input.fill(value)
-            print(f"      {display_name}: {value}")
-
-
-async def _input_remark_field(page, idx, row_data):
-    """비고 필드 입력"""
+            values[line_selector(idx, field)] = value
+            print(f"      {field_key}: {value}")
+    
+    # 비고
     remarks = str(row_data.get('비고', '')).strip()
     if remarks and remarks != 'nan':
-        try:
-            remark_input = page.locator(f"#mf_txppWframe_genEtxivLsatTop_{idx}_edtLsatRmrkCntnTop")
-            if await remark_input.count() > 0:
-                await remark_input.wait_for(state="visible", timeout=2000)
-                await remark_input.clear()
-                await remark_input.fill(remarks)
-                print(f"      비고: {remarks}")
-            else:
-                print(f"      [INFO] 비고 필드가 존재하지 않습니다")
-        except Exception as e:
-            print(f"      [WARN] 비고 입력 실패: {e}")
+        values[_remark_selector(idx)] = remarks
+        print(f"      비고: {remarks}")
     else:
         print(f"      비고: (빈 값 또는 NaN - 건너뛰기)")
+    
+    return values
 
 
 def _find_column_value(row_data, column_candidates):
@@ -1265,24 +617,18 @@ def _find_column_value(row_data, column_candidates):
 
 
 def _calculate_payment_amounts(work_rows):
-    """결제 방법별 금액 계산"""
+    """결제 방법별 금액 계산 (로드 시 변환된 정수 금액 사용)"""
     cash_amount = check_amount = note_amount = 0
+    records = coerce_records(work_rows)
     
-    for row in work_rows:
+    for record in records:
         # 현금금액 추출
-        row_cash_amount = 0
-        for cash_col in get_cash_amount_columns():
-            if cash_col in row and row[cash_col]:
-                try:
-                    row_cash_amount = float(str(row[cash_col]).replace(',', '') or 0)
-                    print(f"      현금 데이터 발견: {cash_col} = {row_cash_amount:,.0f}원")
-                    break
-                except:
-                    continue
+        row_cash_amount = record.cash_amount
         
         if row_cash_amount > 0:
+            print(f"      현금 데이터 발견: {row_cash_amount:,.0f}원")
             # 현금종류에 따른 분류
-            payment_type = str(row.get('현금종류', '')).strip()
+            payment_type = str(record.get('현금종류', '')).strip()
             
             if payment_type == '수표':
                 check_amount += row_cash_amount
@@ -1296,9 +642,9 @@ def _calculate_payment_amounts(work_rows):
     
     # fallback 방식
     if cash_amount == 0 and check_amount == 0 and note_amount == 0:
-        cash_amount = sum(float(row.get('현금', 0) or 0) for row in work_rows)
-        check_amount = sum(float(row.get('수표', 0) or 0) for row in work_rows)
-        note_amount = sum(float(row.get('어음', 0) or 0) for row in work_rows)
+        cash_amount = sum(record.amount('현금') for record in records)
+        check_amount = sum(record.amount('수표') for record in records)
+        note_amount = sum(record.amount('어음') for record in records)
     
     return cash_amount, check_amount, note_amount
 
@@ -9,7 +9,10 @@ Common utility functions for HomeTax automation
 import asyncio
 import pandas as pd
 import winsound
-from typing import List, Dict, Any, Optional
+from typing import List, Any, Optional
+
+from transaction_record import ITEM_NAME_FIELDS
+from hometax_dialogs import DialogRouter
 
 
 async def play_beep(count: int = 1, frequency: int = 800, duration: int = 300):
@@ -166,31 +169,11 @@ class DialogHandler:
     """다이얼로그 처리 유틸리티"""
     
     @staticmethod
-    async def handle_consecutive_dialogs(page, max_dialogs: int = 2) -> bool:
-        """연속된 다이얼로그 처리"""
-        dialog_count = 0
-        all_handled = False
-        
-        async def handle_dialog(dialog):
-            nonlocal dialog_count, all_handled
-            dialog_count += 1
-            print(f"   [ALERT] Alert {dialog_count}/{max_dialogs}: {dialog.message}")
-            await dialog.accept()
-            
-            if dialog_count >= max_dialogs:
-                all_handled = True
-            else:
-                page.once("dialog", handle_dialog)
-        
-        page.once("dialog", handle_dialog)
-        
-        # 최대 10초 대기
-        wait_time = 0
-        while not all_handled and wait_time < 10.0:
-            await page.wait_for_timeout(200)
-            wait_time += 0.2
-        
-        return all_handled
+    async def handle_consecutive_dialogs(page, max_dialogs: int = 2, timeout: float = 10.0) -> bool:
+        """연속된 다이얼로그 처리 - 클릭 전에 호출해 둔 경우가 아니면 이미 뜬 대화상자는 받지 못함"""
+        expectation = DialogRouter.for_page(page).expect(count=max_dialogs)
+        await expectation.wait(timeout)
+        return expectation.complete
 
 
 def get_date_columns() -> List[str]:
@@ -200,7 +183,7 @@ def get_date_columns() -> List[str]:
 
 def get_item_name_columns() -> List[str]:
     """품목명 컬럼 후보 목록"""
-    return ['품목명', '품명', '품목', 'item_name', 'item', 'product_name', '상품명']
+    return list(ITEM_NAME_FIELDS)
 
 
 def get_cash_amount_columns() -> List[str]:
@@ -214,32 +197,3 @@ def validate_page_state(page) -> bool:
         return not page.is_closed()
     except:
         return False
-
-
-def format_date_range(work_rows: List[Dict], single_format: str = "%Y-%m-%d", multi_format: str = "%y%m%d") -> str:
-    """날짜 범위 형식화"""
-    if len(work_rows) == 1:
-        single_date = work_rows[0].get('공급일자') or work_rows[0].get('작성일자', '')
-        if single_date:
-            try:
-                date_obj = pd.to_datetime(single_date)
-                return date_obj.strftime(single_format)
-            except:
-                return str(single_date)
-        return ""
-    else:
-        start_date = work_rows[0].get('공급일자') or work_rows[0].get('작성일자', '')
-        end_date = work_rows[-1].get('공급일자') or work_rows[-1].get('작성일자', '')
-        
-        try:
-            start_formatted = pd.to_datetime(start_date).strftime(multi_format) if start_date else ""
-            end_formatted = pd.to_datetime(end_date).strftime(multi_format) if end_date else ""
-            
-            if start_formatted and end_formatted and start_formatted != end_formatted:
-                return f"{start_formatted}-{end_formatted} {len(work_rows)}건"
-            elif start_formatted:
-                return f"{start_formatted} {len(work_rows)}건"
-        except:
-            pass
-        
-        return f"{len(work_rows)}건"
\ No newline at end of file
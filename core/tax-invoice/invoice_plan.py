@@ -0,0 +1,224 @@
+# 📁 C:\APP\tax-bill\core\tax-invoice\invoice_plan.py
+# -*- coding: utf-8 -*-
+"""
+세금계산서 묶음 계획
+
+선택된 거래명세표 행을 등록번호 + 공급 월 기준으로 한 번에 묶고(행 수에 비례하는 1회 순회),
+홈택스 세금계산서 한 장의 품목 한도(16건)를 넘는 묶음은 연속된 여러 장으로 나눈다.
+브라우저 입력 전에 계획(거래처 → 행 → 세금계산서 장수)을 출력해 확인할 수 있다.
+
+- 묶음 순서: 공급 월별로 모아(현재 홈택스 공급일자의 월 먼저, 나머지는 월 순서,
+  월 미상은 공급일자로 오늘을 쓰므로 오늘의 월과 함께) 공급일자 변경(5회 beep + 재입력)
+  횟수를 월 수 - 1회 이하로 줄이고,
+  같은 월 안에서는 품목 수가 많은 묶음부터 (같은 거래처/월의 분할 장은 항상 연속)
+  order=False이면 각 거래처/월이 선택 데이터에 처음 나온 순서
+- 묶음 안의 행 순서: 선택 데이터 순서 그대로 (16건씩 앞에서부터 나눔)
+- 날짜가 없는 행은 같은 거래처의 "월 미상" 묶음으로 모음
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from transaction_record import TransactionRecord, coerce_record
+
+# 홈택스 세금계산서 한 장에 입력 가능한 품목 수 (기본 4 + 품목추가 12)
+MAX_ITEMS_PER_INVOICE = 16
+
+# 세금계산서 양식의 기본 품목 줄 수 (넘으면 품목추가 클릭)
+BASE_ITEM_LINES = 4
+
+# 전환 비용 (초) - 입력 코드의 대기 시간 기준
+DATE_CHANGE_SECONDS = 2.8   # 공급일자 월 변경: beep 5회(0.3초 + 간격 0.2초) + 재입력 0.5초
+ITEM_ADD_SECONDS = 0.5      # 품목추가 클릭 1회
+
+
+@dataclass
+class InvoiceChunk:
+    """세금계산서 한 장에 입력할 행 묶음"""
+    business_number: str               # 숫자만 남긴 등록번호
+    supply_month: Optional[str]        # "2025-08" (날짜 없으면 None)
+    rows: List[TransactionRecord]
+    part: int = 1                      # 같은 거래처/월 안에서 몇 번째 장인지 (1부터)
+    parts: int = 1                     # 같은 거래처/월의 전체 장수
+
+    @property
+    def company_name(self) -> str:
+        return self.rows[0].get('상호', '미상') if self.rows else '미상'
+
+    @property
+    def excel_rows(self) -> List[int]:
+        return [row.excel_row for row in self.rows]
+
+    def label(self, with_part: bool = True) -> str:
+        month = self.supply_month or "월 미상"
+        suffix = f" ({self.part}/{self.parts})" if with_part and self.parts > 1 else ""
+        return f"{self.business_number} {self.company_name} {month}{suffix}"
+
+
+@dataclass
+class PlanCost:
+    """묶음 처리 순서의 전환 비용"""
+    date_changes: int    # 공급일자 월 변경 횟수
+    item_clicks: int     # 품목추가 클릭 횟수
+
+    @property
+    def seconds(self) -> float:
+        return self.date_changes * DATE_CHANGE_SECONDS + self.item_clicks * ITEM_ADD_SECONDS
+
+
+def _group_key(record: TransactionRecord) -> Tuple[str, Optional[str]]:
+    month = record.supply_date.strftime("%Y-%m") if record.supply_date else None
+    return record.business_number, month
+
+
+def current_month() -> str:
+    """홈택스 세금계산서 작성 화면의 기본 공급일자(오늘)의 월"""
+    return date.today().strftime("%Y-%m")
+
+
+def plan_cost(chunks: Sequence[InvoiceChunk], start_month: Optional[str] = None) -> PlanCost:
+    """chunks를 순서대로 처리할 때의 공급일자 변경/품목추가 횟수
+
+    공급일자는 직전 장의 월이 유지된다고 보고(첫 장은 start_month), 월 미상 묶음은
+    오늘 날짜를 쓰므로 오늘의 월로 계산한다. 품목 줄은 장마다 기본 4줄에서 시작한다.
+    """
+    today = current_month()
+    month = start_month or today
+    date_changes = item_clicks = 0
+    for chunk in chunks:
+        chunk_month = chunk.supply_month or today
+        if chunk_month != month:
+            date_changes += 1
+            month = chunk_month
+        item_clicks += max(0, len(chunk.rows) - BASE_ITEM_LINES)
+    return PlanCost(date_changes, item_clicks)
+
+
+def _order_families(families: List[Tuple[Tuple[str, Optional[str]], List[TransactionRecord]]],
+                    start_month: str, max_items: int):
+    """거래처/월 묶음 정렬 - 월별로 모으고, 같은 월 안에서는 첫 장 품목 수가 많은 순 (안정 정렬)
+
+    월 미상 묶음은 plan_cost와 같이 오늘의 월로 본다.
+    """
+    today = current_month()
+    months = sorted({month or today for (_, month), _ in families})
+    if start_month in months:
+        months.remove(start_month)
+        months.insert(0, start_month)
+    month_rank = {month: rank for rank, month in enumerate(months)}
+
+    def sort_key(family):
+        (_, month), records = family
+        rank = month_rank[month or today]
+        return rank, -min(len(records), max_items)
+    return sorted(families, key=sort_key)
+
+
+def build_invoice_plan(rows: Iterable, max_items: int = MAX_ITEMS_PER_INVOICE,
+                       order: bool = True, start_month: Optional[str] = None) -> 'InvoicePlan':
+    """행 목록을 (등록번호, 공급 월)로 묶고 max_items건씩 나눈 계획 생성
+
+    order=True이면 공급일자 변경이 적도록 묶음 순서를 정렬한다 (start_month: 홈택스
+    화면의 현재 공급일자 월, 기본값 오늘).
+    """
+    if max_items < 1:
+        raise ValueError("max_items는 1 이상이어야 합니다.")
+    start_month = start_month or current_month()
+
+    groups: Dict[Tuple[str, Optional[str]], List[TransactionRecord]] = {}
+    for row in rows:
+        record = coerce_record(row)
+        groups.setdefault(_group_key(record), []).append(record)
+
+    families = list(groups.items())
+    # 정렬 효과 보고용 - 선택 데이터 순서대로 처리했을 때의 비용
+    baseline = plan_cost(_split_families(families, max_items), start_month)
+    if order:
+        families = _order_families(families, start_month, max_items)
+    return InvoicePlan(_split_families(families, max_items), max_items, start_month, baseline)
+
+
+def _split_families(families, max_items: int) -> List[InvoiceChunk]:
+    """거래처/월 묶음을 max_items건씩 나눈 장 목록"""
+    chunks = []
+    for (business_number, month), records in families:
+        parts = (len(records) + max_items - 1) // max_items
+        for part in range(parts):
+            chunk_rows = records[part * max_items:(part + 1) * max_items]
+            chunks.append(InvoiceChunk(business_number, month, chunk_rows, part + 1, parts))
+    return chunks
+
+
+class InvoicePlan:
+    """세금계산서 묶음 계획 (순서대로 처리할 InvoiceChunk 목록)"""
+
+    def __init__(self, chunks: List[InvoiceChunk], max_items: int = MAX_ITEMS_PER_INVOICE,
+                 start_month: Optional[str] = None, baseline_cost: Optional[PlanCost] = None):
+        self.chunks = chunks
+        self.max_items = max_items
+        self.start_month = start_month or current_month()
+        self.cost = plan_cost(chunks, self.start_month)
+        self.baseline_cost = baseline_cost or self.cost
+        self._by_row: Dict[int, InvoiceChunk] = {
+            row.excel_row: chunk for chunk in chunks for row in chunk.rows
+        }
+
+    def __iter__(self) -> Iterator[InvoiceChunk]:
+        return iter(self.chunks)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def row_count(self) -> int:
+        return len(self._by_row)
+
+    @property
+    def split_count(self) -> int:
+        """max_items를 넘어 여러 장으로 나눈 거래처/월 수"""
+        return sum(1 for chunk in self.chunks if chunk.part == 1 and chunk.parts > 1)
+
+    def chunk_for_row(self, excel_row: int) -> Optional[InvoiceChunk]:
+        """엑셀 행이 속한 묶음"""
+        return self._by_row.get(excel_row)
+
+    def groups(self) -> List[List[TransactionRecord]]:
+        """기존 순차 처리 루프용 - 묶음별 행 목록"""
+        return [chunk.rows for chunk in self.chunks]
+
+    def summary(self) -> List[Tuple[str, List[int], int]]:
+        """(거래처/월, 엑셀 행, 세금계산서 장수) 목록 - 나눈 묶음은 하나로 합쳐 표시"""
+        lines = []
+        for chunk in self.chunks:
+            if chunk.part == 1:
+                lines.append((chunk.label(with_part=False), list(chunk.excel_rows), chunk.parts))
+            else:
+                lines[-1][1].extend(chunk.excel_rows)
+        return lines
+
+    def print_summary(self) -> None:
+        """브라우저 입력 전 계획 출력"""
+        print(f"\n=== 세금계산서 발행 계획: {len(self.chunks)}장 / {self.row_count}행 ===")
+        for label, excel_rows, parts in self.summary():
+            rows_text = _format_rows(excel_rows)
+            print(f"   {label}: {len(excel_rows)}건 → {parts}장  [행 {rows_text}]")
+        if self.split_count:
+            print(f"   [INFO] {self.max_items}건 초과로 나눈 거래처: {self.split_count}곳")
+        cost, baseline = self.cost, self.baseline_cost
+        print(f"   [COST] 공급일자 변경 {cost.date_changes}회, 품목추가 {cost.item_clicks}회 "
+              f"→ 약 {cost.seconds:.0f}초")
+        if baseline.date_changes > cost.date_changes:
+            print(f"   [COST] 선택 순서대로 처리 시 공급일자 변경 {baseline.date_changes}회 "
+                  f"(약 {baseline.seconds - cost.seconds:.0f}초 절약)")
+
+
+def _format_rows(excel_rows: List[int]) -> str:
+    """[2, 3, 4, 7] → "2-4,7" """
+    parts = []
+    for row in sorted(excel_rows):
+        if parts and row == parts[-1][1] + 1:
+            parts[-1][1] = row
+        else:
+            parts.append([row, row])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
@@ -0,0 +1,107 @@
+# 📁 C:\APP\tax-bill\core\tax-invoice\invoice_summary.py
+# -*- coding: utf-8 -*-
+"""
+세금계산서 시트 요약 행
+
+발급보류한 세금계산서 한 장의 요약(세금계산서 시트 a~l열)을 화면에서 긁어 오지 않고
+입력에 사용한 거래명세표 행에서 계산한다. 홈택스가 정하는 값(공급일자, 상호, 이메일)만
+발급보류 전에 화면에서 한 번에 읽는다 (발급보류 후 화면 초기화와 겹치지 않음).
+
+- 품목/규격/수량: 첫 행 기준, 여러 건이면 품목은 "첫 품목 외 N개 품목"
+- 공급가액/세액/합계: 행 합계 (공급가액이 비면 수량 × 단가, 세액이 비면 공급가액의 10%
+  - 홈택스 품목 줄 자동 계산과 같은 방식)
+- 기간및건수: format_date_range (1건: 2025-08-10, 여러 건: 250810-250831 4건)
+"""
+
+from typing import Dict, Iterable, Optional
+
+from transaction_record import ITEM_NAME_FIELDS, coerce_records, format_date_range
+
+# 홈택스가 정하는 값의 입력 필드
+FORM_HEADER_SELECTORS = {
+    'supply_date': "#mf_txppWframe_calWrtDtTop_input",
+    'company_name': "#mf_txppWframe_edtDmnrTnmNmTop",
+    'email_id': "#mf_txppWframe_edtDmnrMchrgEmlIdTop",
+    'email_domain': "#mf_txppWframe_edtDmnrMchrgEmlDmanTop",
+}
+
+_READ_FIELDS_JS = """(selectors) => {
+    const values = {};
+    for (const [key, selector] of Object.entries(selectors)) {
+        const element = document.querySelector(selector);
+        values[key] = element && element.value ? element.value.trim() : '';
+    }
+    return values;
+}"""
+
+
+async def read_form_header(page) -> Dict[str, str]:
+    """공급일자/상호/이메일 입력 필드를 한 번의 호출로 읽음 (실패 시 빈 값)"""
+    try:
+        return await page.evaluate(_READ_FIELDS_JS, FORM_HEADER_SELECTORS)
+    except Exception as e:
+        print(f"   [WARN] 세금계산서 화면 값 읽기 실패: {e}")
+        return {key: '' for key in FORM_HEADER_SELECTORS}
+
+
+def combine_email(email_id: str, email_domain: str) -> str:
+    """이메일 ID/도메인 조합 (한쪽만 있으면 있는 쪽만)"""
+    email_id, email_domain = (email_id or '').strip(), (email_domain or '').strip()
+    if email_id and email_domain:
+        return f"{email_id}@{email_domain}"
+    if email_domain:
+        return f"@{email_domain}"
+    return email_id
+
+
+def _first_value(row, fields: Iterable[str]) -> str:
+    for field in fields:
+        value = row.get(field)
+        if value and str(value).strip() and str(value).strip() != 'nan':
+            return str(value).strip()
+    return ''
+
+
+def _line_amounts(record):
+    """품목 줄 하나의 (공급가액, 세액) - 빈 값은 홈택스 자동 계산과 같게"""
+    supply = record.supply_amount or int(record.quantity * record.unit_price)
+    tax = record.tax_amount if _first_value(record, ('세액',)) else supply // 10
+    return supply, tax
+
+
+def build_sheet_summary(work_rows, business_number: str, supply_date: Optional[str] = None,
+                        company_name: str = "", email: str = "") -> Dict[str, str]:
+    """세금계산서 시트 한 행 (열 문자 → 값)"""
+    records = coerce_records(work_rows)
+    if not records:
+        return {}
+    first = records[0]
+
+    base_item = _first_value(first, ITEM_NAME_FIELDS)
+    if len(records) > 1:
+        item_name = f"{base_item or '품목'} 외 {len(records) - 1}개 품목"
+    else:
+        item_name = base_item
+
+    total_supply = total_tax = 0
+    for record in records:
+        supply, tax = _line_amounts(record)
+        total_supply += supply
+        total_tax += tax
+
+    if not supply_date and first.supply_date:
+        supply_date = first.supply_date.strftime("%Y-%m-%d")
+
+    return {
+        'a': supply_date or '',               # 공급일자
+        'b': business_number,                 # 등록번호
+        'c': company_name,                    # 상호
+        'd': email,                           # 이메일
+        'f': item_name,                       # 품목
+        'g': _first_value(first, ('규격',)),   # 규격
+        'h': _first_value(first, ('수량',)),   # 수량
+        'i': str(total_supply),               # 공급가액
+        'j': str(total_tax),                  # 세액
+        'k': str(total_supply + total_tax),   # 합계금액
+        'l': format_date_range(records),      # 기간 및 건수
+    }
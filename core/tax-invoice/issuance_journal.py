@@ -0,0 +1,133 @@
+# 📁 C:\APP\tax-bill\core\tax-invoice\issuance_journal.py
+# -*- coding: utf-8 -*-
+"""
+발급 결과 선기록(write-ahead) 저널
+
+홈택스에서 발급보류가 끝난 뒤 엑셀(Q열 완료일, 세금계산서 시트)에 반영되기 전에
+프로그램이 죽으면, 어느 거래처가 이미 발급보류되었는지 알 수 없어 다시 발행하게 된다.
+그룹(같은 등록번호의 거래명세표 행 묶음)의 상태 변화를 엑셀을 건드리기 전에
+~/.hometax/journal/issuance.jsonl에 한 줄씩 추가하고(fsync), 다음 실행 시작 시
+엑셀에 반영되지 않은 그룹을 한 번에 다시 기록한다.
+
+상태 흐름: verified → items_entered → on_hold(발급보류 완료) → summary(요약 수집)
+          → sheet_written(엑셀 반영 완료)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+VERIFIED = 'verified'            # 사업자번호 검증 완료
+ITEMS_ENTERED = 'items_entered'  # 거래명세표 품목 입력 완료
+ON_HOLD = 'on_hold'              # 발급보류 완료 (홈택스에 반영됨)
+SUMMARY = 'summary'              # 세금계산서 시트에 쓸 요약 수집 완료
+SHEET_WRITTEN = 'sheet_written'  # 엑셀 반영 완료 (종료 상태)
+FAILED = 'failed'                # 발급보류 실패 (종료 상태)
+
+# 발급보류가 끝났지만 엑셀에 반영되었는지 알 수 없는 상태
+PENDING_STATES = (ON_HOLD, SUMMARY)
+
+DEFAULT_JOURNAL_DIR = Path.home() / ".hometax" / "journal"
+
+
+def _file_key(file_path: str) -> str:
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def group_id(business_number: str, excel_rows: Iterable[int]) -> str:
+    """그룹 식별자 - 등록번호 + 거래명세표 행 번호"""
+    rows = sorted(int(row) for row in excel_rows)
+    digest = hashlib.sha1(",".join(map(str, rows)).encode('ascii')).hexdigest()[:8]
+    number = ''.join(filter(str.isdigit, str(business_number)))
+    return f"{number}:{rows[0] if rows else 0}:{digest}"
+
+
+class IssuanceJournal:
+    """추가 전용 JSONL 저널 (한 줄 = 한 번의 상태 변화)"""
+
+    def __init__(self, path=None):
+        if path is None:
+            path = Path(os.getenv("HOMETAX_JOURNAL_DIR") or DEFAULT_JOURNAL_DIR) / "issuance.jsonl"
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, file_path: str, business_number: str, excel_rows: Iterable[int],
+               state: str, **data) -> Dict:
+        """상태 변화 기록 - 디스크에 기록(fsync)된 뒤 반환"""
+        rows = sorted(int(row) for row in excel_rows)
+        entry = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'file': _file_key(file_path),
+            'group': group_id(business_number, rows),
+            'business_number': str(business_number),
+            'rows': rows,
+            'state': state,
+        }
+        entry.update(data)
+        line = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'ab+') as f:
+                # 이전 실행이 줄 중간에 죽었으면 잘린 줄을 끝내고 새 줄에 기록 (이어 붙으면 둘 다 읽을 수 없음)
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        return entry
+
+    def entries(self) -> List[Dict]:
+        """저널 전체 (마지막 줄이 잘려 있으면 무시)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return []
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # 기록 중 중단된 줄
+        return entries
+
+    def latest(self, file_path: Optional[str] = None) -> Dict[str, Dict]:
+        """그룹별 마지막 상태 (데이터는 그룹의 모든 기록을 합친 값)"""
+        key = _file_key(file_path) if file_path else None
+        groups: Dict[str, Dict] = {}
+        for entry in self.entries():
+            if key is not None and entry.get('file') != key:
+                continue
+            merged = groups.setdefault(entry['group'], {})
+            merged.update(entry)
+        return groups
+
+    def pending(self, file_path: Optional[str] = None) -> List[Dict]:
+        """발급보류는 끝났지만 엑셀 반영이 확인되지 않은 그룹"""
+        return [entry for entry in self.latest(file_path).values() if entry.get('state') in PENDING_STATES]
+
+    def uncertain(self, file_path: Optional[str] = None) -> List[Dict]:
+        """입력 도중 중단되어 발급보류 여부를 알 수 없는 그룹 (홈택스에서 확인 필요)"""
+        return [entry for entry in self.latest(file_path).values() if entry.get('state') == ITEMS_ENTERED]
+
+    def compact(self) -> None:
+        """종료 상태 그룹을 지우고 그룹별 마지막 상태만 남겨 저널 크기 정리"""
+        with self._lock:
+            kept = [entry for entry in self.latest().values() if entry.get('state') not in (SHEET_WRITTEN, FAILED)]
+            if not self.path.exists():
+                return
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
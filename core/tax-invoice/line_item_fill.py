@@ -0,0 +1,105 @@
+# 📁 C:\APP\tax-bill\core\tax-invoice\line_item_fill.py
+# -*- coding: utf-8 -*-
+"""
+세금계산서 품목 줄 일괄 입력
+
+품목 줄 필드(#mf_txppWframe_genEtxivLsatTop_{줄}_*)를 필드마다 wait_for + clear + fill로
+입력하면 품목 하나에 Playwright 왕복이 20회 이상, 16줄이면 수백 회가 된다.
+모든 줄의 값을 한 번의 page.evaluate로 넣고(값은 인자로 전달) 같은 호출에서 다시 읽어
+확인한 뒤, 값이 맞지 않거나 필드를 찾지 못한 것만 필드별 입력으로 다시 넣는다.
+
+- 이벤트: 값마다 focus → input → change → keyup → blur 순서로 발생시켜
+  WebSquare가 공급가액/세액/합계를 다시 계산하게 함 (직접 입력과 같은 순서, 같은 필드 순서)
+- 확인: 쉼표/공백을 뺀 값으로 비교 (금액 필드는 입력 후 1,000 형식으로 바뀜)
+- optional 필드(비고 등)는 화면에 없으면 건너뜀
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+# 품목 줄 필드 선택자 (줄 번호는 0부터)
+LINE_FIELD_SELECTOR = "#mf_txppWframe_genEtxivLsatTop_{idx}_{field}"
+
+_BULK_FILL_JS = """(entries) => {
+    const inputSetter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    const fire = (element, type, Kind = Event) => element.dispatchEvent(new Kind(type, {bubbles: true}));
+    for (const [selector, value] of entries) {
+        const element = document.querySelector(selector);
+        if (!element) {
+            continue;
+        }
+        fire(element, 'focus', FocusEvent);
+        if (element instanceof HTMLInputElement) {
+            inputSetter.call(element, value);
+        } else {
+            element.value = value;
+        }
+        fire(element, 'input');
+        fire(element, 'change');
+        fire(element, 'keyup', KeyboardEvent);
+        fire(element, 'blur', FocusEvent);
+    }
+    // 모든 이벤트(재계산)가 끝난 뒤 다시 읽어 확인 (찾지 못한 필드는 null)
+    const values = {};
+    for (const [selector] of entries) {
+        const element = document.querySelector(selector);
+        values[selector] = element ? element.value : null;
+    }
+    return values;
+}"""
+
+
+def line_selector(idx: int, field: str) -> str:
+    """품목 줄 필드 선택자 - line_selector(0, 'edtLsatNmTop')"""
+    return LINE_FIELD_SELECTOR.format(idx=idx, field=field)
+
+
+def _normalize(value) -> str:
+    return re.sub(r"[\s,]", "", str(value or ""))
+
+
+async def fill_fields(page, values: Dict[str, str], optional: Iterable[str] = ()) -> List[str]:
+    """values(선택자 → 값)를 한 번에 입력하고 끝까지 입력하지 못한 선택자 목록 반환"""
+    entries = [(selector, str(value)) for selector, value in values.items() if str(value)]
+    if not entries:
+        return []
+    optional = set(optional)
+
+    try:
+        read_back = await page.evaluate(_BULK_FILL_JS, entries)
+    except Exception as e:
+        print(f"      [WARN] 품목 일괄 입력 실패 - 필드별 입력으로 진행: {e}")
+        read_back = {}
+
+    retry = []
+    for selector, value in entries:
+        actual = read_back.get(selector) if read_back else None
+        if actual is None and read_back and selector in optional:
+            continue  # 화면에 없는 선택 필드
+        if actual is None or _normalize(actual) != _normalize(value):
+            retry.append((selector, value))
+
+    if read_back:
+        print(f"      [FILL] 일괄 입력 {len(entries) - len(retry)}/{len(entries)}개 필드"
+              + (f", 필드별 재입력 {len(retry)}개" if retry else ""))
+
+    failed = []
+    for selector, value in retry:
+        if not await _fill_field(page, selector, value, optional=selector in optional):
+            failed.append(selector)
+    return failed
+
+
+async def _fill_field(page, selector: str, value: str, optional: bool = False) -> bool:
+    """필드 하나 입력 (기존 필드별 입력 방식)"""
+    try:
+        field = page.locator(selector)
+        if optional and await field.count() == 0:
+            return True
+        await field.wait_for(state="visible", timeout=3000)
+        await field.clear()
+        await field.fill(value)
+        return True
+    except Exception as e:
+        print(f"      [ERROR] {selector} 입력 실패: {e}")
+        return False
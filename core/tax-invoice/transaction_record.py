@@ -0,0 +1,223 @@
+# 📁 C:\APP\tax-bill\core\tax-invoice\transaction_record.py
+# -*- coding: utf-8 -*-
+"""
+거래명세표 행 타입 모델
+
+선택된 행을 로드 시점에 한 번만 변환해 두고(날짜 → date, 금액 → int,
+등록번호 → 숫자만), 이후 입력/검증/기록 단계에서는 변환된 값을 그대로 사용한다.
+원래의 문자열 값은 dict처럼 그대로 접근할 수 있어 기존 row.get(...) 코드와 호환된다.
+"""
+
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 날짜 컬럼 후보 (앞에 있는 컬럼 우선)
+DATE_FIELDS = ('공급일자', '작성일자', '일자', '날짜', 'supply_date', 'date')
+
+# 정수로 변환할 금액/수량 컬럼
+AMOUNT_FIELDS = ('수량', '단가', '공급가액', '세액', '합계금액', '현금', '수표', '어음', '현금금액', 'cash_amount')
+
+# 현금금액 컬럼 후보 (앞에 있는 컬럼 우선)
+CASH_FIELDS = ('현금금액', '현금', 'cash_amount')
+
+# 품목명 컬럼 후보 (앞에 있는 컬럼 우선)
+ITEM_NAME_FIELDS = ('품목명', '품명', '품목', 'item_name', 'item', 'product_name', '상품명')
+
+_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y%m%d', '%Y.%m.%d', '%Y/%m/%d')
+
+
+def parse_date(value) -> Optional[date]:
+    """셀 값을 date로 변환 (빈 값/해석 불가 시 None)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    if not text or text.lower() == 'nan':
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    try:
+        parsed = pd.to_datetime(text)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isna(parsed) else parsed.date()
+
+
+def parse_amount(value):
+    """금액/수량 값을 정수로 변환 (콤마 제거, 빈 값 0, 소수 수량은 float 유지)"""
+    if value is None or value == '':
+        return 0
+    if isinstance(value, int):
+        return value
+
+    text = str(value).replace(',', '').strip()
+    if not text or text.lower() == 'nan':
+        return 0
+    try:
+        number = float(text)
+    except ValueError:
+        return 0
+    return int(number) if number.is_integer() else number
+
+
+def normalize_business_number(value) -> str:
+    """등록번호 정규화 (숫자만 남김)"""
+    if value is None:
+        return ""
+    return ''.join(filter(str.isdigit, str(value)))
+
+
+# 사업자등록번호 검증번호 가중치 (앞 9자리)
+_BUSINESS_NUMBER_WEIGHTS = np.array([1, 3, 7, 1, 3, 7, 1, 3, 5])
+
+
+def valid_business_numbers(values: Iterable) -> np.ndarray:
+    """등록번호 목록의 검증번호(10번째 자리) 확인 결과 (bool 배열, 한 번에 계산)
+
+    검증번호 = (10 - (Σ 앞 9자리 × [1,3,7,1,3,7,1,3,5] + (9번째 자리 × 5) // 10) % 10) % 10
+    숫자가 10자리가 아니면 False.
+    """
+    numbers = pd.Series(list(values), dtype=object).fillna('').astype(str).str.replace(r'[^0-9]', '', regex=True)
+    valid = np.zeros(len(numbers), dtype=bool)
+    has_ten = (numbers.str.len() == 10).to_numpy()
+    if not has_ten.any():
+        return valid
+
+    digits = np.frombuffer(''.join(numbers[has_ten]).encode('ascii'), dtype=np.uint8).reshape(-1, 10).astype(np.int64) - 48
+    total = digits[:, :9] @ _BUSINESS_NUMBER_WEIGHTS + (digits[:, 8] * 5) // 10
+    valid[has_ten] = (10 - total % 10) % 10 == digits[:, 9]
+    return valid
+
+
+def is_valid_business_number(value) -> bool:
+    """등록번호 하나의 검증번호 확인"""
+    return bool(valid_business_numbers([value])[0])
+
+
+_AMOUNT_POSITIONS = {field: i for i, field in enumerate(AMOUNT_FIELDS)}
+
+
+class TransactionRecord(Mapping):
+    """형 변환 결과를 함께 가진 거래명세표 행
+
+    Mapping 부분은 엑셀 원래 값(감싼 행을 복사하지 않고 그대로 참조),
+    속성은 로드 시 한 번 변환한 값이다. 행 수만큼 생기는 객체이므로 __slots__로
+    속성만 두고, 금액은 AMOUNT_FIELDS 순서의 튜플로 보관한다.
+    """
+
+    __slots__ = ('_row', 'supply_date', 'business_number', '_amounts')
+
+    def __init__(self, row=(), **kwargs):
+        if kwargs or not isinstance(row, Mapping):
+            row = dict(row, **kwargs)
+        self._row = row
+        self.supply_date: Optional[date] = None
+        for field in DATE_FIELDS:
+            value = row.get(field)
+            if value:
+                self.supply_date = parse_date(value)
+                break
+        self.business_number: str = normalize_business_number(row.get('등록번호', ''))
+        self._amounts = tuple(parse_amount(row.get(field)) for field in AMOUNT_FIELDS)
+
+    def __getitem__(self, key):
+        return self._row[key]
+
+    def get(self, key, default=None):
+        return self._row.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self._row
+
+    def __iter__(self):
+        return iter(self._row)
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def amount(self, field: str):
+        """변환된 금액 (컬럼이 없거나 비어 있으면 0)"""
+        position = _AMOUNT_POSITIONS.get(field)
+        return 0 if position is None else self._amounts[position]
+
+    @property
+    def quantity(self):
+        return self.amount('수량')
+
+    @property
+    def unit_price(self):
+        return self.amount('단가')
+
+    @property
+    def supply_amount(self):
+        return self.amount('공급가액')
+
+    @property
+    def tax_amount(self):
+        return self.amount('세액')
+
+    @property
+    def total_amount(self):
+        """합계금액 (컬럼이 비어 있으면 공급가액 + 세액)"""
+        return self.amount('합계금액') or self.supply_amount + self.tax_amount
+
+    @property
+    def cash_amount(self):
+        """현금금액 후보 컬럼 중 값이 있는 첫 컬럼"""
+        for field in CASH_FIELDS:
+            if self.amount(field):
+                return self.amount(field)
+        return 0
+
+    @property
+    def excel_row(self) -> int:
+        return self._row.get('excel_row', 0)
+
+    def __repr__(self) -> str:
+        return f"TransactionRecord(row={self.excel_row}, date={self.supply_date}, 등록번호={self.business_number})"
+
+
+def coerce_record(row) -> TransactionRecord:
+    """TransactionRecord가 아니면 변환 (이미 변환된 행은 그대로 반환)"""
+    if isinstance(row, TransactionRecord):
+        return row
+    return TransactionRecord(row or {})
+
+
+def coerce_records(rows: Iterable) -> List[TransactionRecord]:
+    """행 목록 변환"""
+    return [coerce_record(row) for row in rows]
+
+
+def format_date_range(work_rows: List[Dict], single_format: str = "%Y-%m-%d", multi_format: str = "%y%m%d") -> str:
+    """날짜 범위 형식화 (로드 시 변환된 공급일자 사용)"""
+    if not work_rows:
+        return ""
+    
+    start_date = coerce_record(work_rows[0]).supply_date
+    if len(work_rows) == 1:
+        if start_date:
+            return start_date.strftime(single_format)
+        return str(work_rows[0].get('공급일자') or work_rows[0].get('작성일자', '') or "")
+    
+    end_date = coerce_record(work_rows[-1]).supply_date
+    start_formatted = start_date.strftime(multi_format) if start_date else ""
+    end_formatted = end_date.strftime(multi_format) if end_date else ""
+    
+    if start_formatted and end_formatted and start_formatted != end_formatted:
+        return f"{start_formatted}-{end_formatted} {len(work_rows)}건"
+    elif start_formatted:
+        return f"{start_formatted} {len(work_rows)}건"
+    
+    return f"{len(work_rows)}건"
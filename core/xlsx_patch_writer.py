@@ -0,0 +1,237 @@
+# 📁 C:\APP\tax-bill\core\xlsx_patch_writer.py
+# -*- coding: utf-8 -*-
+"""
+xlsx 셀 직접 패치
+
+엑셀이 닫혀 있을 때 상태 기록을 위해 load_workbook + save를 하면 모든 시트를 다시 쓰고
+openpyxl이 지원하지 않는 기능(슬라이서, 일부 서식 등)이 사라지며 큰 파일은 수 초가 걸린다.
+여기서는 대상 시트 XML 안에서 바뀐 셀(<c>)만 문자열로 교체하고, zip의 나머지 항목은
+내용을 그대로 복사한다.
+
+- 문자열은 인라인 문자열(t="inlineStr")로 기록 → sharedStrings.xml은 건드리지 않음
+- 기존 셀의 스타일(s 속성)은 유지, 수식 셀은 덮어쓰지 않음
+- 처리할 수 없는 경우(수식 셀, 날짜 등 지원하지 않는 값, r 속성 없는 셀, 시트 없음)는
+  파일을 건드리지 않고 False/None을 반환 → 호출 측이 openpyxl로 처리
+- 임시 파일에 쓴 뒤 os.replace로 교체 (중간에 실패해도 원본 유지)
+"""
+
+import copy
+import math
+import os
+import re
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from excel_sheet_cache import sheet_part
+
+_SHEET_DATA = re.compile(r'<sheetData\s*/>|<sheetData\b[^>]*>(.*?)</sheetData>', re.S)
+_ROW = re.compile(r'<row\b[^>]*?(?:/>|>.*?</row>)', re.S)
+_CELL = re.compile(r'<c\b[^>]*?(?:/>|>.*?</c>)', re.S)
+_START_TAG = re.compile(r'<[^>]*?/?>', re.S)
+_ATTR = re.compile(r'([\w:]+)="([^"]*)"')
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)$')
+_DIMENSION = re.compile(r'<dimension\b[^>]*\bref="([^"]*)"[^>]*/>')
+# XML 1.0에서 허용되지 않는 제어 문자
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class UnsupportedPatch(Exception):
+    """직접 패치로 처리할 수 없는 경우 (호출 측은 openpyxl로 처리)"""
+
+
+def _attrs(tag: str) -> Dict[str, str]:
+    return dict(_ATTR.findall(tag))
+
+
+def _cell_xml(ref: str, value: Any, style: Optional[str]) -> str:
+    """값 하나를 <c> 요소 문자열로 변환"""
+    attrs = f' r="{ref}"' + (f' s="{style}"' if style else '')
+    if value is None or value == '':
+        return f'<c{attrs}/>'
+    if isinstance(value, bool):
+        return f'<c{attrs} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int):
+        return f'<c{attrs}><v>{value}</v></c>'
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise UnsupportedPatch(f"{ref}: 숫자가 아닌 값 {value}")
+        return f'<c{attrs}><v>{repr(value)}</v></c>'
+    if isinstance(value, str):
+        if _ILLEGAL_XML.search(value):
+            raise UnsupportedPatch(f"{ref}: XML에 쓸 수 없는 문자")
+        space = ' xml:space="preserve"' if value != value.strip() else ''
+        return f'<c{attrs} t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>'
+    raise UnsupportedPatch(f"{ref}: 지원하지 않는 값 형식 {type(value).__name__}")
+
+
+def _has_value(cell: str) -> bool:
+    return '<v>' in cell or '<v ' in cell or '<is>' in cell or '<f' in cell
+
+
+class SheetXml:
+    """시트 XML의 sheetData 부분을 행 단위 문자열로 나눠 편집"""
+
+    def __init__(self, xml: str):
+        match = _SHEET_DATA.search(xml)
+        if match is None:
+            raise UnsupportedPatch("sheetData 요소가 없습니다.")
+        self._head = xml[:match.start()]
+        self._tail = xml[match.end():]
+        self._open_tag = xml[match.start():match.start(1)] if match.group(1) is not None else '<sheetData>'
+        body = match.group(1) or ''
+
+        self.rows: Dict[int, str] = {}
+        for row_match in _ROW.finditer(body):
+            row_xml = row_match.group(0)
+            number = _attrs(_START_TAG.match(row_xml).group(0)).get('r')
+            if number is None:
+                raise UnsupportedPatch("행 번호(r 속성)가 없는 행이 있습니다.")
+            self.rows[int(number)] = row_xml
+        self._max_row = max(self.rows, default=0)
+        self._max_column = 0
+
+    def last_used_row(self, column: int = 1) -> int:
+        """column 열에 값이 있는 마지막 행 (없으면 0)"""
+        letter = get_column_letter(column)
+        for number in sorted(self.rows, reverse=True):
+            for cell in _CELL.finditer(self.rows[number]):
+                if _attrs(_START_TAG.match(cell.group(0)).group(0)).get('r') == f"{letter}{number}":
+                    if _has_value(cell.group(0)):
+                        return number
+                    break
+        return 0
+
+    def set_cells(self, row: int, values: Dict[int, Any]) -> None:
+        """한 행의 {열 번호: 값} 기록 (기존 셀 스타일 유지, 수식 셀은 거부)"""
+        row_xml = self.rows.get(row)
+        if row_xml is None:
+            row_tag, cells = f'<row r="{row}">', []
+        else:
+            row_tag = _START_TAG.match(row_xml).group(0)
+            cells = []
+            for cell in _CELL.finditer(row_xml):
+                ref = _attrs(_START_TAG.match(cell.group(0)).group(0)).get('r')
+                ref_match = _CELL_REF.match(ref or '')
+                if ref_match is None or int(ref_match.group(2)) != row:
+                    raise UnsupportedPatch(f"행 {row}에 위치(r 속성)가 없는 셀이 있습니다.")
+                cells.append((column_index_from_string(ref_match.group(1)), cell.group(0)))
+
+        existing = dict(cells)
+        for column, value in values.items():
+            ref = f"{get_column_letter(column)}{row}"
+            style = None
+            old = existing.get(column)
+            if old is not None:
+                if '<f' in old:
+                    raise UnsupportedPatch(f"{ref}: 수식 셀은 덮어쓰지 않습니다.")
+                style = _attrs(_START_TAG.match(old).group(0)).get('s')
+            existing[column] = _cell_xml(ref, value, style)
+            self._max_column = max(self._max_column, column)
+
+        # spans는 선택 속성이므로 셀 범위가 바뀔 수 있는 행에서는 제거
+        row_tag = re.sub(r'\s+spans="[^"]*"', '', row_tag)
+        if row_tag.endswith('/>'):
+            row_tag = row_tag[:-2].rstrip() + '>'
+        self.rows[row] = row_tag + ''.join(existing[column] for column in sorted(existing)) + '</row>'
+        self._max_row = max(self._max_row, row)
+
+    def to_xml(self) -> str:
+        body = ''.join(self.rows[number] for number in sorted(self.rows))
+        head = self._head
+        dimension = _DIMENSION.search(head)
+        if dimension is not None and self._max_column:
+            head = head[:dimension.start(1)] + _grow_dimension(dimension.group(1), self._max_row, self._max_column) + head[dimension.end(1):]
+        return f"{head}{self._open_tag}{body}</sheetData>{self._tail}"
+
+
+def _grow_dimension(ref: str, max_row: int, max_column: int) -> str:
+    """dimension 범위를 새로 기록한 셀까지 확장"""
+    first, _, last = ref.partition(':')
+    last = last or first
+    match = _CELL_REF.match(last.replace('$', ''))
+    if match is None:
+        return ref
+    column = max(column_index_from_string(match.group(1)), max_column)
+    row = max(int(match.group(2)), max_row)
+    return f"{first}:{get_column_letter(column)}{row}"
+
+
+def _patch_file(file_path: str, sheet_name: str, fallback_active: bool, edit) -> Any:
+    """시트 XML을 edit(SheetXml)로 수정해 파일을 교체하고 edit의 결과 반환"""
+    with zipfile.ZipFile(file_path) as zin:
+        located = sheet_part(zin, sheet_name, fallback_active)
+        if located is None:
+            raise UnsupportedPatch(f"'{sheet_name}' 시트가 없습니다.")
+        _, part = located
+
+        sheet = SheetXml(zin.read(part).decode('utf-8'))
+        result = edit(sheet)
+        patched = sheet.to_xml().encode('utf-8')
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, tmp_path = tempfile.mkstemp(suffix='.xlsx.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w') as zout:
+                for info in zin.infolist():
+                    data = patched if info.filename == part else zin.read(info.filename)
+                    zout.writestr(copy.copy(info), data, compress_type=info.compress_type)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    try:
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return result
+
+
+def patch_cells(file_path: str, sheet_name: str, cells: Iterable[Tuple[int, int, Any]]) -> bool:
+    """(행, 열, 값) 목록을 시트에 직접 기록 (시트가 없으면 활성 시트)
+
+    처리할 수 없으면 파일을 그대로 두고 False 반환. 파일 잠금 등 입출력 오류는 그대로 전달한다.
+    """
+    by_row: Dict[int, Dict[int, Any]] = {}
+    for row, column, value in cells:
+        by_row.setdefault(row, {})[column] = value
+    if not by_row:
+        return True
+
+    def edit(sheet: SheetXml):
+        for row in sorted(by_row):
+            sheet.set_cells(row, by_row[row])
+        return True
+
+    try:
+        return _patch_file(file_path, sheet_name, True, edit)
+    except (UnsupportedPatch, KeyError, zipfile.BadZipFile, UnicodeDecodeError) as e:
+        print(f"   xlsx 직접 패치 불가: {e}")
+        return False
+
+
+def append_rows(file_path: str, sheet_name: str, rows: Sequence[Dict[int, Any]],
+                column: int = 1) -> Optional[int]:
+    """{열 번호: 값} 행들을 column 열의 마지막 값 다음 행부터 추가하고 첫 행 번호 반환
+
+    시트가 없거나 처리할 수 없으면 파일을 그대로 두고 None 반환.
+    """
+    rows: List[Dict[int, Any]] = [row for row in rows if row]
+    if not rows:
+        return None
+
+    def edit(sheet: SheetXml):
+        first_row = sheet.last_used_row(column) + 1
+        for offset, values in enumerate(rows):
+            sheet.set_cells(first_row + offset, values)
+        return first_row
+
+    try:
+        return _patch_file(file_path, sheet_name, False, edit)
+    except (UnsupportedPatch, KeyError, zipfile.BadZipFile, UnicodeDecodeError) as e:
+        print(f"   xlsx 직접 패치 불가: {e}")
+        return None
@@ -0,0 +1,292 @@
+# 📁 C:\APP\tax-bill\core\xlwings_session.py
+# -*- coding: utf-8 -*-
+"""
+xlwings 워크북 세션
+
+열려 있는 엑셀 워크북/시트를 한 번만 찾아 보관하고, 여러 셀을 범위 단위로 한 번에 기록한다.
+
+- 워크북 조회: xw.apps / books / sheets 열거는 처음 한 번만 (COM 오류 시 다시 조회)
+- 범위 쓰기: 같은 값은 떨어진 행이라도 다중 영역 주소("Q2:Q5,Q9")로 한 번에,
+  값이 다른 연속 행은 세로 범위 하나로 한 번에 기록
+- 행 추가: 시트의 마지막 사용 행은 처음 한 번만 조회하고(AppendCursor) 이후에는 로컬로 증가,
+  여러 행은 한 번의 범위 쓰기로 추가
+- 저장 지연: 엑셀 쓰기 작업자 스레드에서는 큐가 비었을 때 한 번만 save()
+  (작업자 밖에서는 즉시 저장)
+
+COM 객체는 만든 스레드에서만 쓸 수 있으므로 세션은 스레드별로 따로 보관한다.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from openpyxl.utils import get_column_letter
+
+from excel_write_worker import current_worker
+
+# Excel Range() 주소 문자열 길이 제한
+MAX_ADDRESS_LENGTH = 255
+
+
+def _column_runs(rows: Sequence[int]) -> List[Tuple[int, int]]:
+    """정렬된 행 번호를 연속 구간 [(시작, 끝), ...]으로 묶기"""
+    runs = []
+    for row in rows:
+        if runs and row == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+def _area(column_letter: str, first: int, last: int) -> str:
+    if first == last:
+        return f"{column_letter}{first}"
+    return f"{column_letter}{first}:{column_letter}{last}"
+
+
+def _join_areas(areas: List[str]) -> List[str]:
+    """영역 목록을 Range 주소 길이 제한 안에서 콤마로 이어 붙이기"""
+    addresses = []
+    current = ""
+    for area in areas:
+        if current and len(current) + 1 + len(area) > MAX_ADDRESS_LENGTH:
+            addresses.append(current)
+            current = area
+        else:
+            current = f"{current},{area}" if current else area
+    if current:
+        addresses.append(current)
+    return addresses
+
+
+def plan_range_writes(cells: Iterable[Tuple[int, int, Any]]) -> List[Tuple[str, str, Any]]:
+    """(행, 열, 값) 목록을 범위 쓰기 목록 [(종류, 주소, 값), ...]으로 변환
+
+    - ('fill', "Q2:Q5,Q9", 값): 주소의 모든 셀에 같은 값 (떨어진 행도 한 번에)
+    - ('block', "Q12:Q14", [[값], ...]): 값이 서로 다른 연속 행
+    같은 셀이 여러 번 나오면 마지막 값을 사용한다.
+    """
+    columns: Dict[int, Dict[int, Any]] = {}
+    for row, column, value in cells:
+        columns.setdefault(column, {})[row] = value
+
+    plan = []
+    for column in sorted(columns):
+        values = columns[column]
+        letter = get_column_letter(column)
+        fills: Dict[Tuple[type, Any], List[str]] = {}
+        for first, last in _column_runs(sorted(values)):
+            run_values = [values[row] for row in range(first, last + 1)]
+            if all(value == run_values[0] for value in run_values):
+                # 1과 True처럼 ==로 같은 값이 섞이지 않도록 타입도 키에 포함
+                fills.setdefault((type(run_values[0]), run_values[0]), []).append(_area(letter, first, last))
+            else:
+                plan.append(('block', _area(letter, first, last), [[value] for value in run_values]))
+        for (_, value), areas in fills.items():
+            for address in _join_areas(areas):
+                plan.append(('fill', address, value))
+    return plan
+
+
+def last_used_row(ws, column: int = 1) -> int:
+    """column 열에서 값이 있는 마지막 행 (없으면 0) - 사용 범위 끝에서 위로 한 번에 탐색"""
+    last = ws.used_range.last_cell.row
+    if ws.range((last, column)).value is not None:
+        return last
+    row = ws.range((last, column)).end('up').row
+    if row == 1 and ws.range((1, column)).value is None:
+        return 0
+    return row
+
+
+class AppendCursor:
+    """시트 끝에 행을 이어 붙일 위치 - 마지막 행은 만들 때 한 번만 조회"""
+
+    def __init__(self, ws, column: int = 1):
+        self.next_row = last_used_row(ws, column) + 1
+
+    def advance(self, count: int = 1) -> int:
+        """count개 행을 사용한 것으로 표시하고 그 첫 행 번호 반환"""
+        row = self.next_row
+        self.next_row += count
+        return row
+
+
+class XlwingsWorkbookSession:
+    """열린 워크북 하나에 대한 xlwings 세션 (스레드별)"""
+
+    def __init__(self, file_path: str):
+        self.file_path = os.path.abspath(file_path)
+        self.workbook_name = os.path.basename(file_path.replace("\\", os.sep))
+        self._book = None
+        self._sheets: Dict[str, Any] = {}
+        self._cursors: Dict[str, AppendCursor] = {}
+        self.dirty = False
+        self.save_count = 0
+
+    # 워크북/시트 조회
+    def book(self):
+        """열린 워크북 (처음 한 번만 조회, 열려 있지 않으면 None)"""
+        if self._book is None:
+            self._book = _find_open_book(self.workbook_name)
+        return self._book
+
+    def sheet(self, sheet_name: str, headers: Optional[Sequence[str]] = None):
+        """시트 조회 - 없으면 headers가 있을 때 생성, 아니면 첫 번째 시트"""
+        ws = self._sheets.get(sheet_name)
+        if ws is not None:
+            return ws
+
+        wb = self.book()
+        if wb is None:
+            return None
+
+        ws = next((sheet for sheet in wb.sheets if sheet.name == sheet_name), None)
+        if ws is None:
+            if headers is None:
+                ws = wb.sheets[0]
+            else:
+                ws = wb.sheets.add(sheet_name)
+                ws.range((1, 1)).value = [list(headers)]
+                self.dirty = True
+        self._sheets[sheet_name] = ws
+        return ws
+
+    def reset(self) -> None:
+        """보관한 COM 객체 폐기 (엑셀을 닫았다 연 경우 등 - 다음 호출에서 다시 조회)"""
+        self._book = None
+        self._sheets.clear()
+        self._cursors.clear()
+
+    # 쓰기
+    def write_cells(self, sheet_name: str, cells: Iterable[Tuple[int, int, Any]]) -> bool:
+        """(행, 열, 값) 목록을 범위 단위로 기록 (워크북이 열려 있지 않으면 False)"""
+        plan = plan_range_writes(cells)
+        if not plan:
+            return True
+        return self._run(sheet_name, None, lambda ws: _apply_plan(ws, plan))
+
+    def write_row(self, sheet_name: str, row: int, values: Dict[int, Any],
+                  headers: Optional[Sequence[str]] = None) -> bool:
+        """한 행의 {열 번호: 값}을 한 번의 범위 쓰기로 기록 (사이의 빈 열은 비움)"""
+        if not values:
+            return True
+        first, last = min(values), max(values)
+        row_values = [values.get(column) for column in range(first, last + 1)]
+
+        def write(ws):
+            ws.range((row, first), (row, last)).value = [row_values]
+        return self._run(sheet_name, headers, write)
+
+    def append_rows(self, sheet_name: str, rows: Sequence[Dict[int, Any]],
+                    headers: Optional[Sequence[str]] = None) -> Optional[int]:
+        """{열 번호: 값} 행들을 시트 끝에 한 번의 범위 쓰기로 추가하고 첫 행 번호 반환 (실패 시 None)"""
+        rows = [row for row in rows if row]
+        if not rows:
+            return None
+        width = max(max(row) for row in rows)
+        matrix = [[row.get(column) for column in range(1, width + 1)] for row in rows]
+
+        def append(ws):
+            cursor = self._cursors.get(sheet_name)
+            if cursor is None:
+                cursor = self._cursors[sheet_name] = AppendCursor(ws)
+            first = cursor.next_row
+            ws.range((first, 1), (first + len(matrix) - 1, width)).value = matrix
+            return cursor.advance(len(matrix))
+        return self._run(sheet_name, headers, append) or None
+
+    def _run(self, sheet_name, headers, action):
+        """시트 작업 실행 - COM 오류가 나면 워크북을 다시 찾아 한 번 더 시도
+
+        작업 결과를 반환한다 (결과가 없는 작업은 True, 실패 시 False).
+        """
+        for attempt in range(2):
+            ws = self.sheet(sheet_name, headers)
+            if ws is None:
+                return False
+            try:
+                result = action(ws)
+                break
+            except Exception as e:
+                self.reset()
+                if attempt:
+                    print(f"   xlwings 기록 실패: {e}")
+                    return False
+        self.schedule_save()
+        return True if result is None else result
+
+    # 저장
+    def schedule_save(self) -> None:
+        """저장 예약 - 작업자 스레드에서는 큐가 빌 때 한 번, 그 밖에서는 즉시"""
+        self.dirty = True
+        worker = current_worker()
+        if worker is None:
+            self.save()
+        else:
+            worker.call_when_idle(self.save, key=('xlwings-save', id(self)))
+
+    def save(self) -> bool:
+        """변경 사항이 있으면 저장"""
+        if not self.dirty:
+            return True
+        wb = self.book()
+        if wb is None:
+            return False
+        try:
+            wb.save()
+        except Exception as e:
+            print(f"❌ xlwings 저장 실패: {e}")
+            self.reset()
+            return False
+        self.dirty = False
+        self.save_count += 1
+        return True
+
+
+def _apply_plan(ws, plan) -> None:
+    for kind, address, value in plan:
+        if kind == 'fill':
+            ws.api.Range(address).Value = value
+        else:
+            ws.range(address).value = value
+
+
+_xlwings_warned = False
+
+
+def _find_open_book(workbook_name: str):
+    """실행 중인 엑셀에서 이름이 같은 워크북 찾기 (없으면 None)"""
+    global _xlwings_warned
+    try:
+        import xlwings as xw
+    except ImportError:
+        if not _xlwings_warned:
+            print("   xlwings가 설치되지 않았습니다.")
+            _xlwings_warned = True
+        return None
+
+    try:
+        for app in xw.apps:
+            for book in app.books:
+                if book.name == workbook_name:
+                    return book
+    except Exception as e:
+        print(f"   xlwings 워크북 조회 실패: {e}")
+    return None
+
+
+_sessions = threading.local()
+
+
+def get_workbook_session(file_path: str) -> XlwingsWorkbookSession:
+    """현재 스레드의 파일별 세션 (없으면 생성)"""
+    sessions = getattr(_sessions, 'by_path', None)
+    if sessions is None:
+        sessions = _sessions.by_path = {}
+    key = os.path.normcase(os.path.abspath(file_path))
+    session = sessions.get(key)
+    if session is None:
+        session = sessions[key] = XlwingsWorkbookSession(file_path)
+    return session
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+행 저장소 메모리 측정 스크립트 (pytest 수집 대상 아님)
+
+거래명세표 헤더로 만든 합성 10만 행을 기존 방식(행마다 dict)과
+공유 스키마 + __slots__ 행(CompactRow/SelectedRow/TransactionRecord)으로 각각 만들고
+tracemalloc으로 유지 메모리를 비교한다.
+
+    python tests/bench_row_store.py [행 수]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from excel_unified_processor import CompactRow, ProcessedRow, RowSchema, SelectedRow
+from transaction_record import TransactionRecord
+
+HEADERS = ['작성일자', '등록번호', '상호', '품목코드', '품명', '규격', '수량', '단가',
+           '공급가액', '세액', '합계금액', '현금', '현금종류', '비고', '담당자', '이메일', '발행일']
+
+
+def _synthetic_values(count):
+    """행별 셀 값 (두 방식이 같은 값 객체를 공유하도록 미리 생성)"""
+    rows = []
+    for i in range(count):
+        day = i % 28 + 1
+        rows.append((f"2025-08-{day:02d}", f"{1000000000 + i % 5000}", f"거래처{i % 5000}", "",
+                     f"품목{i % 300}", "M8", str(i % 50 + 1), "1000", str((i % 50 + 1) * 1000),
+                     str((i % 50 + 1) * 100), str((i % 50 + 1) * 1100), "", "", "", "", "", ""))
+    return rows
+
+
+def _measure(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main(count=100_000):
+    values = _synthetic_values(count)
+
+    def build_dicts():
+        processed = [{'row_number': i + 2, 'data': dict(zip(HEADERS, row))} for i, row in enumerate(values)]
+        selected = [dict(item['data'], excel_row=item['row_number']) for item in processed]
+        return processed, selected
+
+    def build_compact():
+        schema = RowSchema(HEADERS)
+        processed = [ProcessedRow(i + 2, CompactRow(schema, row)) for i, row in enumerate(values)]
+        selected = [SelectedRow(item.data, item.row_number) for item in processed]
+        return processed, selected
+
+    _, dict_bytes = _measure(build_dicts)
+    _, compact_bytes = _measure(build_compact)
+    _, typed_dict_bytes = _measure(lambda: [TransactionRecord(dict(zip(HEADERS, row)), excel_row=i)
+                                            for i, row in enumerate(values)])
+    schema = RowSchema(HEADERS)
+    _, typed_compact_bytes = _measure(lambda: [TransactionRecord(SelectedRow(CompactRow(schema, row), i))
+                                               for i, row in enumerate(values)])
+
+    print(f"행 수: {count:,}")
+    print(f"processed_data + selected_data (dict)      : {dict_bytes / 2**20:8.1f} MiB")
+    print(f"processed_data + selected_data (compact)   : {compact_bytes / 2**20:8.1f} MiB "
+          f"({compact_bytes / dict_bytes:.0%})")
+    print(f"TransactionRecord (dict 복사)              : {typed_dict_bytes / 2**20:8.1f} MiB")
+    print(f"TransactionRecord (compact 참조)           : {typed_compact_bytes / 2**20:8.1f} MiB "
+          f"({typed_compact_bytes / typed_dict_bytes:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+닫힌 파일 상태 기록 속도 비교 스크립트 (pytest 수집 대상 아님)
+
+거래처/거래명세표/세금계산서 시트를 가진 합성 세금계산서.xlsx에서
+Q열 16칸 기록을 openpyxl(load_workbook + save)과 xlsx 직접 패치로 각각 반복해 시간을 비교한다.
+
+    python tests/bench_xlsx_patch.py [거래명세표 행 수] [반복 횟수]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from openpyxl import Workbook, load_workbook
+
+from xlsx_patch_writer import patch_cells
+
+
+def _create_workbook(path, count):
+    wb = Workbook()
+    partners = wb.active
+    partners.title = "거래처"
+    partners.append(['등록번호', '상호', '대표자', '이메일'])
+    for i in range(count // 10):
+        partners.append([f"{1000000000 + i}", f"거래처{i}", f"대표{i}", f"tax{i}@example.com"])
+
+    ws = wb.create_sheet("거래명세표")
+    ws.append(['작성일자', '등록번호', '상호', '품목코드', '품명', '규격', '수량', '단가',
+               '공급가액', '세액', '합계금액', '현금', '현금종류', '비고', '', '', '발행일'])
+    for i in range(count):
+        qty = i % 50 + 1
+        ws.append([f"2025-08-{i % 28 + 1:02d}", f"{1000000000 + i % 5000}", f"거래처{i % 5000}", "",
+                   f"품목{i % 300}", "M8", qty, 1000, qty * 1000, qty * 100, qty * 1100])
+
+    log = wb.create_sheet("세금계산서")
+    log.append(['공급일자', '등록번호', '상호'])
+    wb.save(path)
+
+
+def _openpyxl_write(path, cells):
+    workbook = load_workbook(path)
+    worksheet = workbook["거래명세표"]
+    for row, column, value in cells:
+        worksheet.cell(row=row, column=column, value=value)
+    workbook.save(path)
+    workbook.close()
+
+
+def _time(fn, path, repeat):
+    started = time.perf_counter()
+    for i in range(repeat):
+        fn(path, [(row, 17, f"2025-08-{i % 28 + 1:02d}") for row in range(2 + i * 16, 18 + i * 16)])
+    return (time.perf_counter() - started) / repeat
+
+
+def main(count=20_000, repeat=5):
+    work_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(work_dir, "source.xlsx")
+        _create_workbook(source, count)
+        results = {}
+        writers = (("openpyxl", _openpyxl_write),
+                   ("xlsx 패치", lambda path, cells: patch_cells(path, "거래명세표", cells)))
+        for index, (name, write) in enumerate(writers):
+            path = os.path.join(work_dir, f"bench{index}.xlsx")
+            shutil.copy(source, path)
+            results[name] = _time(write, path, repeat)
+
+        print(f"거래명세표 {count:,}행, Q열 16칸 기록 {repeat}회 평균")
+        for name, seconds in results.items():
+            print(f"{name:10s}: {seconds * 1000:8.1f} ms")
+        print(f"속도 비율: {results['openpyxl'] / results['xlsx 패치']:.1f}배")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공통 설정
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_sheet_cache(tmp_path, monkeypatch):
+    """시트 캐시를 테스트별 임시 폴더로 분리 (~/.hometax/cache 미사용)"""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("HOMETAX_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_journal(tmp_path, monkeypatch):
+    """발급 저널을 테스트별 임시 폴더로 분리 (~/.hometax/journal 미사용)"""
+    journal_dir = tmp_path / "journal"
+    monkeypatch.setenv("HOMETAX_JOURNAL_DIR", str(journal_dir))
+    return journal_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_checkpoints(tmp_path, monkeypatch):
+    """실행 체크포인트를 테스트별 임시 폴더로 분리 (~/.hometax/checkpoints 미사용)"""
+    checkpoint_dir = tmp_path / "checkpoints"
+    monkeypatch.setenv("HOMETAX_CHECKPOINT_DIR", str(checkpoint_dir))
+    return checkpoint_dir
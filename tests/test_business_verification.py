@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+business_verification.py 검증 테스트 (브라우저 없이 page 대역 사용)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from business_verification import (
+    BRANCH_OFFICE, BRANCH_POPUP_CLOSE_SELECTOR, COMPANY_NAME_SELECTOR, CONFIRM_BUTTON_SELECTOR,
+    INVALID, UNREGISTERED, VERIFIED, verify_business_number,
+)
+
+
+class FakeDialog:
+    def __init__(self, message):
+        self.message = message
+        self.type = "alert"
+
+    async def accept(self):
+        pass
+
+    async def dismiss(self):
+        pass
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def fill(self, value):
+        self.page.values[self.selector] = value
+
+    async def click(self, **kwargs):
+        self.page.clicks.append(self.selector)
+        if self.selector == CONFIRM_BUTTON_SELECTOR:
+            asyncio.ensure_future(self.page.respond())
+
+    async def input_value(self, timeout=None):
+        return self.page.values.get(self.selector, "")
+
+    async def is_editable(self, timeout=None):
+        return self.page.editable
+
+    async def wait_for(self, state="visible", timeout=None):
+        assert self.selector == BRANCH_POPUP_CLOSE_SELECTOR
+        await asyncio.wait_for(self.page.popup.wait(), timeout / 1000)
+
+
+class FakePage:
+    """확인 버튼을 누르면 delay초 뒤 outcome(대화상자/종사업장 창/상호 입력) 하나가 나타남"""
+
+    def __init__(self, outcome=None, delay=0.01, editable=True):
+        self.outcome = outcome
+        self.delay = delay
+        self.editable = editable
+        self.values = {}
+        self.clicks = []
+        self.listeners = []
+        self.popup = asyncio.Event()
+        self.name_filled = asyncio.Event()
+
+    def on(self, event, handler):
+        self.listeners.append(handler)
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        await asyncio.wait_for(self.name_filled.wait(), timeout / 1000)
+
+    async def respond(self):
+        await asyncio.sleep(self.delay)
+        if self.outcome is None:
+            return
+        kind, value = self.outcome
+        if kind == "dialog":
+            for handler in self.listeners:
+                await handler(FakeDialog(value))
+        elif kind == "popup":
+            self.popup.set()
+        elif kind == "name":
+            self.values[COMPANY_NAME_SELECTOR] = value
+            self.name_filled.set()
+
+
+def _verify(page, timeout=2000):
+    return verify_business_number(page, "123-45-67890", timeout=timeout)
+
+
+def test_first_outcome_decides_result_without_waiting_for_timeout():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+
+        page = FakePage(("dialog", "정상적인 사업자번호입니다."))
+        page.values[COMPANY_NAME_SELECTOR] = "가나상사"
+        started = loop.time()
+        result = await _verify(page)
+        assert loop.time() - started < 1.0
+        assert result.ok and result.company_name == "가나상사"
+        assert result.status is None
+
+        result = await _verify(FakePage(("dialog", "사업자등록번호를 입력하세요.")))
+        assert result.outcome == INVALID and result.status == "번호오류"
+
+        page = FakePage(("popup", None))
+        result = await _verify(page)
+        assert result.outcome == BRANCH_OFFICE and result.status == "미등록(주)"
+        assert page.clicks[-1] == BRANCH_POPUP_CLOSE_SELECTOR
+
+        result = await _verify(FakePage(("name", "다라상사")))
+        assert result.outcome == VERIFIED and result.company_name == "다라상사"
+
+    asyncio.run(scenario())
+
+
+def test_no_response_falls_back_to_company_field_state():
+    async def scenario():
+        result = await _verify(FakePage(None), timeout=50)
+        assert result.outcome == UNREGISTERED and result.beeps == 2
+
+        result = await _verify(FakePage(None, editable=False), timeout=50)
+        assert result.outcome == INVALID and result.beeps == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+excel_data_manager.py 검증 테스트
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from openpyxl import Workbook
+
+from excel_data_manager import ExcelDataManager
+
+
+def _create_workbook(path):
+    """테스트용 거래명세표/거래처 워크북 생성"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "거래명세표"
+    ws.append(['작성일자', '등록번호', '상호', '품목코드', '품명', '규격', '수량', '단가', '공급가액', '세액'])
+    ws.append([datetime(2025, 7, 31), '123-45-67891', '가나상사', None, '볼트', 'M8', 10, 100, 1000, 100])
+    ws.append([datetime(2025, 8, 1), '1234567891', '가나상사', 'A1', '너트', 'M8', 5, '1,000', '5,000', 500])
+    ws.append([None, '220-81-62517', '빈행', None, '', '', 1, 1, 1, 1])
+    ws.append(['2025-08-15', '220-81-62517', '다라물산', None, '와셔', '', None, 300, 300, 30])
+
+    customers = wb.create_sheet("거래처")
+    customers.append(['순번', '사업자등록번호', '거래처명', '대표자', '사업장주소', '업태', '종목'])
+    customers.append([1, '123-45-67891', '가나상사', '홍길동', '서울', '도매', '철물'])
+    customers.append([2, '220-81-62517', '', '', '', '', ''])
+    customers.append([3, '220-81-62517', '다라물산', '김철수', '부산', '제조', '부품'])
+    wb.save(path)
+    return str(path)
+
+
+def test_typed_transaction_loading(tmp_path):
+    """금액 int64, 작성일 datetime, 등록번호 정규화"""
+    manager = ExcelDataManager(_create_workbook(tmp_path / "세금계산서.xlsx"))
+    assert manager.load_all_data()
+
+    df = manager.transaction_df
+    assert len(manager.transaction_data) == 3
+    assert str(df['공급가액'].dtype) == 'int64'
+    assert df['작성일'].dt.month.tolist() == [7, 8, 8]
+    assert df['등록번호'].tolist() == ['1234567891', '1234567891', '2208162517']
+
+    second = manager.transaction_data[1]
+    assert second['작성일자'] == '2025-08-01'
+    assert second['단가'] == 1000
+    assert second['총액'] == 5500
+    assert manager.transaction_data[2]['수량'] == 0
+
+    assert [c['거래처명'] for c in manager.customer_data] == ['가나상사', '다라물산']
+
+
+def test_grouped_summaries(tmp_path):
+    """요약/거래처별/월별 합계"""
+    manager = ExcelDataManager(_create_workbook(tmp_path / "세금계산서.xlsx"))
+    manager.load_all_data()
+
+    summary = manager.get_transaction_summary()
+    assert summary == {'총_거래건수': 3, '총_공급가액': 6300, '총_세액': 630, '총액': 6930, '거래처_수': 2}
+
+    by_customer = manager.get_customer_summary().set_index('등록번호')
+    assert by_customer.loc['1234567891', '거래건수'] == 2
+    assert by_customer.loc['1234567891', '총액'] == 6600
+
+    by_month = manager.get_monthly_summary().set_index('작성월')
+    assert by_month.loc['2025-07', '공급가액'] == 1000
+    assert by_month.loc['2025-08', '거래처_수'] == 2
+
+
+def test_indexed_lookups(tmp_path):
+    """사업자등록번호 해시 조회와 작성일 범위 조회"""
+    manager = ExcelDataManager(_create_workbook(tmp_path / "세금계산서.xlsx"))
+    manager.load_all_data()
+
+    assert manager.get_customer_by_business_number('220-81-62517')['거래처명'] == '다라물산'
+    assert manager.get_customer_by_business_number('000-00-00000') is None
+    assert [tx['품명'] for tx in manager.get_transactions_by_business_number('123-45-67891')] == ['볼트', '너트']
+
+    assert [tx['품명'] for tx in manager.get_transactions_by_date('2025-08-01')] == ['너트']
+    assert [tx['품명'] for tx in manager.get_transactions_by_date_range('2025-07-01', '2025-08-14')] == ['볼트', '너트']
+    assert [tx['품명'] for tx in manager.get_transactions_by_date_range(datetime(2025, 8, 1), '2025-08-31')] == ['너트', '와셔']
+    assert manager.get_transactions_by_date_range('2025-09-01', '2025-08-01') == []
+    assert manager.get_transactions_by_date('날짜아님') == []
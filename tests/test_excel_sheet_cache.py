@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+excel_sheet_cache.py 검증 테스트
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from openpyxl import Workbook, load_workbook
+
+import excel_sheet_cache
+from excel_sheet_cache import SheetCache
+
+
+def _create_workbook(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "거래명세표"
+    ws.append(['작성일자', '등록번호', '상호', '수량'])
+    ws.append(['2025-08-01', '123-45-67891', '가나상사', 10])
+    ws.append(['2025-08-02', '220-81-62517', '다라물산'])
+    customers = wb.create_sheet("거래처")
+    customers.append(['순번', '사업자등록번호', '거래처명'])
+    customers.append([1, '123-45-67891', '가나상사'])
+    wb.save(path)
+    return str(path)
+
+
+def test_cache_hit_skips_parsing(tmp_path, monkeypatch):
+    """지문이 같으면 xlsx를 다시 파싱하지 않음"""
+    path = _create_workbook(tmp_path / "세금계산서.xlsx")
+    cache = SheetCache(tmp_path / "cache")
+
+    first = cache.load(path, "거래명세표")
+    assert not first.from_cache
+    assert first.max_row == 3 and first.max_column == 4
+    assert first.row_values(2) == ['2025-08-01', '123-45-67891', '가나상사', '10']
+    assert first.row_values(3)[3] == ''
+
+    monkeypatch.setattr(excel_sheet_cache, "_parse_sheet", lambda *args: (_ for _ in ()).throw(AssertionError))
+    second = SheetCache(tmp_path / "cache").load(path, "거래명세표")
+    assert second.from_cache
+    assert second.frame.equals(first.frame)
+
+
+def test_only_changed_sheet_is_reparsed(tmp_path, monkeypatch):
+    """파일이 저장돼도 내용이 같은 시트는 캐시 재사용"""
+    path = _create_workbook(tmp_path / "세금계산서.xlsx")
+    cache = SheetCache(tmp_path / "cache")
+    cache.load(path, "거래명세표")
+    cache.load(path, "거래처")
+
+    # 숫자 셀만 바꾸면 sharedStrings는 그대로이고 거래명세표 시트 XML만 바뀜
+    wb = load_workbook(path)
+    wb["거래명세표"]["D2"] = 20
+    wb.save(path)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+
+    parsed = []
+    original = excel_sheet_cache._parse_sheet
+    monkeypatch.setattr(excel_sheet_cache, "_parse_sheet",
+                        lambda file_path, sheet_name: parsed.append(sheet_name) or original(file_path, sheet_name))
+
+    assert cache.load(path, "거래명세표").row_values(2)[3] == '20'
+    customers = cache.load(path, "거래처")
+    assert customers.from_cache
+    assert customers.row_values(2) == ['1', '123-45-67891', '가나상사']
+    assert parsed == ["거래명세표"]
+
+
+def test_missing_sheet_falls_back_to_active(tmp_path):
+    """시트가 없으면 활성 시트를 반환 (openpyxl과 동일)"""
+    path = _create_workbook(tmp_path / "세금계산서.xlsx")
+    sheet = SheetCache(tmp_path / "cache").load(path, "세금계산서")
+    assert sheet.title == "거래명세표"
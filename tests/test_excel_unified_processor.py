@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+excel_unified_processor.py 검증 테스트
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from openpyxl import Workbook, load_workbook
+
+from excel_unified_processor import SheetConfig, StatusRecorder
+
+
+def _create_transaction_workbook(path, rows):
+    """테스트용 거래명세표 워크북 생성"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "거래명세표"
+    ws.append(['작성일자', '등록번호', '상호', '품목코드', '품명', '규격', '수량', '단가',
+               '공급가액', '세액', '합계금액', '현금', '현금종류', '비고', '', '', '발행일'])
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def _sample_rows():
+    return [
+        ['2025-08-01', '123-45-67891', '가나상사', '', '볼트', 'M8', 10, 100, 1000, 100, 1100],
+        ['2025-08-02', '1234567891', '가나상사', '', '너트', 'M8', 5, 100, 500, 50, 550],
+        ['2025-08-03', '220-81-62517', '다라물산', '', '와셔', '', 1, 300, 300, 30, 330],
+    ]
+
+
+def test_status_batch_flushes_once(tmp_path, monkeypatch):
+    """버퍼 구간에서는 워크북을 한 번만 저장"""
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path)
+    monkeypatch.setattr(recorder, "_write_with_xlwings", lambda cells: False)
+
+    calls = []
+    original = recorder._write_cells
+    monkeypatch.setattr(recorder, "_write_cells", lambda cells: calls.append(list(cells)) or original(cells))
+
+    with recorder.batch():
+        recorder.write_success(2, "2025-08-31")
+        recorder.write_success(3, "2025-08-31")
+        recorder.write_status_to_column(4, "번호오류", 17)
+        assert recorder.pending_count == 3
+        assert calls == []
+
+    assert len(calls) == 1
+    ws = load_workbook(path)["거래명세표"]
+    assert [ws.cell(row=r, column=17).value for r in (2, 3, 4)] == ["2025-08-31", "2025-08-31", "번호오류"]
+
+
+def test_status_batch_flushes_on_error(tmp_path, monkeypatch):
+    """구간 안에서 예외가 나도 보류 기록은 반영"""
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path)
+    monkeypatch.setattr(recorder, "_write_with_xlwings", lambda cells: False)
+
+    try:
+        with recorder.batch():
+            recorder.write_error(2, "처리오류")
+            raise RuntimeError("브라우저 오류")
+    except RuntimeError:
+        pass
+
+    assert recorder.pending_count == 0
+    assert load_workbook(path)["거래명세표"].cell(row=2, column=17).value == "처리오류"
+
+
+def test_status_flush_threshold(tmp_path, monkeypatch):
+    """보류 개수가 임계값에 도달하면 자동 반영"""
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path, buffered=True, flush_threshold=2)
+    monkeypatch.setattr(recorder, "_write_with_xlwings", lambda cells: False)
+
+    recorder.write_success(2, "A")
+    assert recorder.pending_count == 1
+    recorder.write_success(3, "B")
+    assert recorder.pending_count == 0
+    assert load_workbook(path)["거래명세표"].cell(row=3, column=17).value == "B"
+
+
+def test_business_number_index_shared_with_recorder(tmp_path, monkeypatch):
+    """데이터 로드 시 만든 인덱스로 같은 등록번호 행 조회"""
+    from excel_unified_processor import DataProcessor
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    config = SheetConfig.get_transaction_config()
+    data_processor = DataProcessor(config, path)
+    assert data_processor.process_excel_data([2])
+
+    index = data_processor.business_number_index
+    assert index.lookup('123-45-67891') == [2, 3]
+    assert index.lookup('2208162517') == [4]
+
+    recorder = StatusRecorder(config, path)
+    recorder.business_number_index = index
+    monkeypatch.setattr(recorder, "_write_with_xlwings", lambda cells: False)
+    assert recorder.write_error_to_matching_business_numbers('1234567891', "번호오류")
+
+    ws = load_workbook(path)["거래명세표"]
+    assert [ws.cell(row=r, column=17).value for r in (2, 3, 4)] == ["번호오류", "번호오류", None]
+
+    # 연결된 인덱스가 없으면 공유 시트 캐시(read_sheet)로 한 번만 만들어 재사용
+    standalone = StatusRecorder(config, path)
+    assert standalone.find_rows_by_business_number('220-81-62517') == [4]
+    assert standalone.business_number_index is not None
+
+
+def test_matching_business_number_write_reports_failure(tmp_path, monkeypatch):
+    """같은 등록번호 일괄 기록이 실패하면 False (보류 목록에 남아 다음 flush에서 재시도)"""
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path)
+    monkeypatch.setattr(recorder, "_write_cells", lambda cells: False)
+
+    assert not recorder.write_error_to_matching_business_numbers('1234567891', "번호오류")
+    assert recorder.pending_count == 2
+
+
+def test_stream_sheet_materializes_selected_rows_only(tmp_path):
+    """시트 1회 순회로 선택 행만 보관하고 크기를 함께 보고"""
+    from excel_unified_processor import DataProcessor
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    data_processor = DataProcessor(SheetConfig.get_transaction_config(), path)
+    sheet = data_processor._stream_sheet([3, 10])
+
+    assert sheet.max_row == 4
+    assert sheet.max_column == 17
+    assert list(sheet.rows) == [3]
+    assert sheet.rows[3][:3] == ['2025-08-02', '1234567891', '가나상사']
+    assert sheet.rows[3][6] == '5'
+
+    assert data_processor.process_excel_data([3, 10])
+    row = data_processor.get_processed_data()[0]
+    assert row['row_number'] == 3
+    assert row['data']['등록번호'] == '1234567891'
+
+
+def test_stream_sheet_uses_cache_only_when_present(tmp_path):
+    """캐시가 없으면 파싱 결과를 만들지 않고 순회, 캐시가 있으면 같은 결과를 캐시에서"""
+    from excel_sheet_cache import peek_sheet, read_sheet
+    from excel_unified_processor import DataProcessor
+
+    config = SheetConfig.get_transaction_config()
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    streamed = DataProcessor(config, path)._stream_sheet([2, 4])
+    assert peek_sheet(path, config.sheet_name) is None
+
+    read_sheet(path, config.sheet_name)
+    data_processor = DataProcessor(config, path)
+    cached = data_processor._stream_sheet([2, 4])
+    assert (cached.header, cached.rows, cached.max_row, cached.max_column) == \
+        (streamed.header, streamed.rows, streamed.max_row, streamed.max_column)
+    assert data_processor.business_number_index.lookup('123-45-67891') == [2, 3]
+
+
+def test_row_selection_merges_intervals():
+    """범위를 펼치지 않고 병합된 구간으로 보관"""
+    from excel_unified_processor import RowSelection
+
+    selection = RowSelection.parse("10, 2-5,4-8, 9 ,300000-200000,abc,2-200000")
+    assert selection.intervals == [(2, 200000)]
+    assert len(selection) == 199999
+    assert 150000 in selection and 1 not in selection and 200001 not in selection
+    assert selection[0] == 2 and selection[-1] == 200000
+    assert selection.first(3) == [2, 3, 4]
+    assert str(selection) == "2-200000"
+
+    selection = RowSelection.parse("1,3,5-6,12-14", min_row=2)
+    assert list(selection) == [3, 5, 6, 12, 13, 14]
+    assert selection[3] == 12
+    assert str(selection.clip(2, 12)) == "3,5-6,12"
+    assert selection == [3, 5, 6, 12, 13, 14]
+    assert not RowSelection.parse("   ")
+
+
+def test_process_excel_data_clips_selection_to_sheet(tmp_path):
+    """시트 데이터 범위를 벗어난 선택은 개별 확인 없이 잘라냄"""
+    from excel_unified_processor import DataProcessor, RowSelection
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    data_processor = DataProcessor(SheetConfig.get_transaction_config(), path)
+    assert data_processor.process_excel_data(RowSelection.parse("1-1000000"))
+    assert [row['row_number'] for row in data_processor.get_processed_data()] == [2, 3, 4]
+
+
+def test_header_classification_applied_per_column(tmp_path):
+    """헤더를 한 번 분류해 컬럼별 처리 함수 적용"""
+    from excel_unified_processor import DataProcessor, classify_headers, register_field_processor, FIELD_PROCESSORS
+
+    kinds = [kind for kind, _ in classify_headers(['등록번호', '주이메일', '작성일자', '공급가액', '비고'])]
+    assert kinds == ['business_number', 'email', 'date', 'amount', 'passthrough']
+
+    rows = [[datetime(2025, 8, 1), '123-45-67891', '가나상사', '', '볼트', 'M8', '1,000', 100, 1000.0, 100, 1100]]
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", rows)
+    data_processor = DataProcessor(SheetConfig.get_transaction_config(), path)
+    assert data_processor.process_excel_data([2])
+    data = data_processor.get_processed_data()[0]['data']
+    assert data['작성일자'] == '2025-08-01'
+    assert data['등록번호'] == '1234567891'
+    assert (data['수량'], data['공급가액'], data['상호']) == ('1000', '1000', '가나상사')
+
+    saved = list(FIELD_PROCESSORS)
+    try:
+        register_field_processor('company', lambda header: header == '상호', str.upper, first=True)
+        assert classify_headers(['상호'])[0][0] == 'company'
+    finally:
+        FIELD_PROCESSORS[:] = saved
+
+
+def test_compact_rows_keep_dict_access(tmp_path):
+    """공유 스키마 행이 기존 dict 접근 방식을 그대로 지원"""
+    from excel_unified_processor import CompactRow, DataProcessor, RowSchema, SelectedRow, split_email
+
+    schema = RowSchema(['등록번호', '상호', '등록번호'])
+    assert schema.keys == ('등록번호', '상호') and schema.columns == (2, 1)
+    row = CompactRow(schema, ('2208162517', '다라물산'))
+    assert row['등록번호'] == '2208162517' and row.get('없음', '-') == '-'
+    assert '상호' in row and list(row.items()) == [('등록번호', '2208162517'), ('상호', '다라물산')]
+    assert row == {'등록번호': '2208162517', '상호': '다라물산'}
+
+    selected = SelectedRow(row, 7)
+    assert selected['excel_row'] == 7 and selected.get('상호') == '다라물산'
+    assert list(selected) == ['등록번호', '상호', 'excel_row']
+
+    email = split_email('tax@example.com')
+    assert email['front'] == 'tax' and email.get('back') == 'example.com'
+    assert email == {'front': 'tax', 'back': 'example.com'}
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    data_processor = DataProcessor(SheetConfig.get_transaction_config(), path)
+    assert data_processor.process_excel_data([2, 4])
+    items = data_processor.get_processed_data()
+    assert [item['row_number'] for item in items] == [2, 4]
+    assert items[1]['data'].get('상호') == '다라물산'
+    assert items[0].data._schema is items[1].data._schema
+
+
+def test_find_pending_rows_skips_completed_and_failed(tmp_path):
+    """상태 컬럼 기준으로 미처리/재시도 행만 자동 선택"""
+    from excel_unified_processor import RowSelector
+
+    rows = []
+    statuses = ['', '2025-08-31', '처리오류', '번호오류', '', datetime(2025, 9, 1), '']
+    for i, status in enumerate(statuses):
+        row = ['2025-08-01', f'12345678{i:02d}', '가나상사', '', '볼트', '', 1, 100, 100, 10, 110,
+               '', '', '', '', '', status]
+        rows.append(row)
+    rows.append([''] * 16 + ['처리오류'])  # 상태만 남은 빈 행
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", rows)
+
+    selector = RowSelector(SheetConfig.get_transaction_config(), path)
+    assert str(selector.find_pending_rows()) == "2,4,6,8"
+    assert str(selector.find_pending_rows(include_retryable=False)) == "2,6,8"
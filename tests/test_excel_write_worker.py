@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+excel_write_worker.py 검증 테스트
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from excel_write_worker import ExcelWriteWorker
+
+
+def test_jobs_run_in_order_on_worker_thread():
+    """제출 순서대로 전용 스레드에서 실행"""
+    worker = ExcelWriteWorker(max_pending=2)
+    seen = []
+    futures = [worker.submit(lambda i=i: seen.append((i, threading.current_thread().name)) or i) for i in range(10)]
+
+    assert [future.result(timeout=5) for future in futures] == list(range(10))
+    assert [i for i, _ in seen] == list(range(10))
+    assert {name for _, name in seen} == {"excel-writer"}
+    worker.shutdown()
+
+
+def test_async_submit_does_not_block_loop():
+    """큐가 가득 차도 이벤트 루프는 계속 동작하고, 결과는 필요할 때만 기다림"""
+    worker = ExcelWriteWorker(max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        ticks = 0
+        blocker = await worker.submit_async(release.wait)
+        await worker.submit_async(lambda: "queued")  # 큐를 채움
+
+        async def ticker():
+            nonlocal ticks
+            while not release.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        submit_task = asyncio.create_task(worker.submit_async(lambda: "after"))
+        await asyncio.sleep(0.2)
+        assert not submit_task.done()  # 역압: 빈자리가 날 때까지 대기
+        release.set()
+        last = await submit_task
+        await tick_task
+        assert blocker.result(timeout=5) is True
+        assert await worker.run(lambda: "confirmed") == "confirmed"
+        assert last.result(timeout=5) == "after"
+        return ticks
+
+    assert asyncio.run(scenario()) > 5
+    worker.shutdown()
+
+
+def test_sync_submit_from_coroutine_does_not_block_loop(tmp_path, monkeypatch):
+    """코루틴 안에서 호출한 동기 상태 기록은 큐가 가득 차도 바로 반환하고 순서대로 반영"""
+    from excel_unified_processor import SheetConfig, StatusRecorder
+    from test_excel_unified_processor import _create_transaction_workbook, _sample_rows
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    worker = ExcelWriteWorker(max_pending=1)
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path, writer=worker)
+    written = []
+    monkeypatch.setattr(recorder, "_write_cells", lambda cells: written.extend(cells) or True)
+    release = threading.Event()
+
+    async def scenario():
+        worker.submit(release.wait)
+        started = time.monotonic()
+        for row in (2, 3, 4):
+            assert recorder.write_error(row, "번호오류")
+        elapsed = time.monotonic() - started
+        release.set()
+        await worker.drain_async()
+        return elapsed
+
+    assert asyncio.run(scenario()) < 0.5
+    assert [row for row, _, _ in written] == [2, 3, 4]
+    worker.shutdown()
+
+
+def test_matching_business_number_write_reports_worker_outcome(tmp_path, monkeypatch, capsys):
+    """작업자 모드에서는 제출 즉시 성공으로 보지 않고 Future로 실제 기록 결과를 전달"""
+    from concurrent.futures import Future
+    from excel_unified_processor import SheetConfig, StatusRecorder
+    from test_excel_unified_processor import _create_transaction_workbook, _sample_rows
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    worker = ExcelWriteWorker()
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path, writer=worker)
+    monkeypatch.setattr(recorder, "_write_cells", lambda cells: False)
+    release = threading.Event()
+    worker.submit(release.wait)
+
+    result = recorder.write_error_to_matching_business_numbers('1234567891', "번호오류")
+    assert isinstance(result, Future) and result is recorder.last_write
+    assert "✅" not in capsys.readouterr().out  # 기록 전에는 결과를 출력하지 않음
+
+    release.set()
+    assert result.result(timeout=5) is False
+    assert "❌ 2개 행 에러 기록 실패" in capsys.readouterr().out
+    assert recorder.pending_count == 2
+    worker.shutdown()
+
+
+def test_shutdown_drains_pending_jobs():
+    """종료 시 남은 작업을 모두 처리"""
+    worker = ExcelWriteWorker()
+    done = []
+    for i in range(5):
+        worker.submit(lambda i=i: time.sleep(0.01) or done.append(i))
+    worker.shutdown()
+    assert done == list(range(5))
+    assert not worker.is_running
+
+
+def test_status_recorder_writes_through_worker(tmp_path, monkeypatch):
+    """상태 기록이 작업자 스레드에서 실행되고 wait_for_writes로 확인"""
+    from openpyxl import load_workbook
+    from excel_unified_processor import SheetConfig, StatusRecorder
+    from test_excel_unified_processor import _create_transaction_workbook, _sample_rows
+
+    path = _create_transaction_workbook(tmp_path / "세금계산서.xlsx", _sample_rows())
+    worker = ExcelWriteWorker()
+    recorder = StatusRecorder(SheetConfig.get_transaction_config(), path, writer=worker)
+    monkeypatch.setattr(recorder, "_write_with_xlwings", lambda cells: False)
+
+    threads = []
+    original = recorder._write_cells
+    monkeypatch.setattr(recorder, "_write_cells",
+                        lambda cells: threads.append(threading.current_thread().name) or original(cells))
+
+    assert recorder.write_success(2, "2025-08-31")
+    with recorder.batch():
+        recorder.write_error(3, "번호오류")
+        recorder.write_error(4, "번호오류")
+    assert recorder.wait_for_writes(timeout=10)
+
+    assert threads == ["excel-writer", "excel-writer"]
+    ws = load_workbook(path)["거래명세표"]
+    assert [ws.cell(row=r, column=17).value for r in (2, 3, 4)] == ["2025-08-31", "번호오류", "번호오류"]
+    worker.shutdown()
+
+
+def test_idle_callbacks_run_once_when_queue_empties():
+    """같은 key의 유휴 콜백은 큐가 빌 때 한 번만 실행되고, drain 시 바로 실행"""
+    worker = ExcelWriteWorker(idle_delay=0.05)
+    saves = []
+
+    def job():
+        worker.call_when_idle(lambda: saves.append(threading.current_thread().name), key="save")
+
+    for _ in range(5):
+        worker.submit(job)
+    assert worker.drain(timeout=5)
+    assert saves == ["excel-writer"]
+
+    worker.submit(job).result(timeout=5)
+    deadline = time.time() + 5
+    while len(saves) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(saves) == 2
+    worker.shutdown()
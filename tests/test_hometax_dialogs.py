@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+hometax_dialogs.py 검증 테스트 (브라우저 없이 page/dialog 대역 사용)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from hometax_dialogs import (
+    CONFIRM, CONTACT_PROMPT, ERROR, INFO, ITEM_PROMPT, SUCCESS, DialogRouter, classify_dialog,
+)
+
+
+class FakeDialog:
+    def __init__(self, message, type="alert"):
+        self.message = message
+        self.type = type
+        self.response = None
+
+    async def accept(self):
+        self.response = "accept"
+
+    async def dismiss(self):
+        self.response = "dismiss"
+
+
+class FakePage:
+    def __init__(self):
+        self.listeners = []
+
+    def on(self, event, handler):
+        assert event == "dialog"
+        self.listeners.append(handler)
+
+    async def show(self, message, delay=0.0):
+        """delay초 뒤 대화상자 표시 (버튼 클릭 후 뜨는 alert 흉내)"""
+        await asyncio.sleep(delay)
+        dialog = FakeDialog(message)
+        for handler in self.listeners:
+            await handler(dialog)
+        return dialog
+
+
+def test_classify_dialog():
+    assert classify_dialog("비정상적인 등록번호입니다.") == ERROR
+    assert classify_dialog("사업자등록번호를 입력하세요.") == ERROR
+    assert classify_dialog("이미 등록된 사업자등록번호입니다.") == ERROR
+    assert classify_dialog("발급보류 하시겠습니까?") == CONFIRM
+    assert classify_dialog("정상적인 사업자번호입니다.") == SUCCESS
+    assert classify_dialog("발급보류가 완료되었습니다.") == SUCCESS
+    assert classify_dialog("품목 등록을 하시겠습니까?") == ITEM_PROMPT
+    assert classify_dialog("담당자를 추가 등록하시겠습니까?") == CONTACT_PROMPT
+    assert classify_dialog("안내") == INFO
+    # 안내성 문구는 오류로 보지 않음 (발급보류 대기가 중단되지 않도록)
+    assert classify_dialog("조회된 거래처가 없습니다.") == INFO
+    assert classify_dialog("입력 내용을 확인하시기 바랍니다.") == INFO
+
+
+def test_router_is_shared_per_page_and_answers_dialogs():
+    async def scenario():
+        page = FakePage()
+        router = DialogRouter.for_page(page)
+        assert DialogRouter.for_page(page) is router
+        assert len(page.listeners) == 1
+
+        # 기다리는 쪽이 없어도 응답 (품목 등록 안내는 취소)
+        prompt = await page.show("품목 등록을 하시겠습니까?")
+        done = await page.show("등록되었습니다.")
+        assert prompt.response == "dismiss"
+        assert done.response == "accept"
+        assert [event.kind for event in router.history] == [ITEM_PROMPT, SUCCESS]
+
+    asyncio.run(scenario())
+
+
+def test_expectation_returns_as_soon_as_dialogs_arrive():
+    async def scenario():
+        page = FakePage()
+        router = DialogRouter.for_page(page)
+
+        # 확인 요청 → 성공 두 개를 기다림 - 두 번째가 오는 즉시 종료
+        expectation = router.expect(count=2)
+        asyncio.ensure_future(page.show("발급보류 하시겠습니까?", 0.01))
+        asyncio.ensure_future(page.show("발급보류가 완료되었습니다.", 0.02))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        events = await expectation.wait(5.0)
+        assert loop.time() - started < 1.0
+        assert [event.kind for event in events] == [CONFIRM, SUCCESS]
+        assert expectation.complete
+
+        # 오류 메시지가 오면 개수를 채우지 않아도 종료
+        expectation = router.expect(count=2)
+        asyncio.ensure_future(page.show("사업자등록번호를 입력하세요.", 0.01))
+        events = await expectation.wait(5.0)
+        assert len(events) == 1
+        assert expectation.done and not expectation.complete
+        assert expectation.error.message == "사업자등록번호를 입력하세요."
+
+        # until 분류가 오면 종료
+        expectation = router.expect(count=3, until=(SUCCESS,))
+        asyncio.ensure_future(page.show("정상적인 사업자번호입니다.", 0.01))
+        assert len(await expectation.wait(5.0)) == 1
+        assert expectation.succeeded
+
+        # 확인 요청 뒤 안내만 오면 개수를 채워도 성공이 아님
+        expectation = router.expect(count=3, until=(SUCCESS,))
+        for delay, message in enumerate(("발급보류 하시겠습니까?", "입력 내용을 확인하시기 바랍니다.", "안내"), 1):
+            asyncio.ensure_future(page.show(message, delay * 0.01))
+        assert len(await expectation.wait(5.0)) == 3
+        assert expectation.complete and not expectation.succeeded
+
+    asyncio.run(scenario())
+
+
+def test_expectation_timeout_and_close():
+    async def scenario():
+        page = FakePage()
+        router = DialogRouter.for_page(page)
+
+        expectation = router.expect(count=1)
+        assert await expectation.wait(0.05) == []
+        assert not expectation.done
+
+        # 대기가 끝난 expectation은 이후 대화상자를 받지 않음
+        await page.show("등록되었습니다.")
+        assert expectation.events == []
+
+        expectation = router.expect(count=1)
+        expectation.close()
+        await page.show("등록되었습니다.")
+        assert expectation.events == []
+        assert len(router.history) == 2
+
+    asyncio.run(scenario())
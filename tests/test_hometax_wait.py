@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+hometax_wait.py 검증 테스트 (브라우저 없이 page 대역 사용)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from hometax_wait import NetworkTracker, settle, wait_for_network_idle
+
+
+class FakeRequest:
+    def __init__(self, resource_type="xhr"):
+        self.resource_type = resource_type
+
+
+class FakePage:
+    """요청 이벤트를 흉내 (처리 중 표시는 항상 없음)"""
+
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def emit(self, event, request):
+        for handler in self.listeners.get(event, []):
+            handler(request)
+
+    async def request(self, delay, duration, resource_type="xhr"):
+        """delay초 뒤 시작해 duration초 뒤 끝나는 요청"""
+        await asyncio.sleep(delay)
+        request = FakeRequest(resource_type)
+        self.emit("request", request)
+        await asyncio.sleep(duration)
+        self.emit("requestfinished", request)
+
+    async def wait_for_function(self, script, arg=None, timeout=None, polling=None):
+        return True
+
+
+def test_waits_for_request_started_after_click():
+    """이미 조용한 페이지에서도 클릭 직후 시작된 요청이 끝날 때까지 기다림"""
+    async def scenario():
+        page = FakePage()
+        tracker = NetworkTracker.for_page(page)
+        assert NetworkTracker.for_page(page) is tracker
+
+        loop = asyncio.get_running_loop()
+        request = asyncio.ensure_future(page.request(delay=0.05, duration=0.3))
+        started = loop.time()
+        assert await settle(page, 3000)
+        assert request.done()
+        assert loop.time() - started >= 0.35
+        assert not tracker.in_flight
+
+    asyncio.run(scenario())
+
+
+def test_static_resources_ignored_and_timeout_reported():
+    async def scenario():
+        page = FakePage()
+        NetworkTracker.for_page(page)
+        page.emit("request", FakeRequest("image"))  # 끝나지 않는 이미지 요청은 세지 않음
+        assert await wait_for_network_idle(page, 1000, quiet_ms=50)
+
+        page.emit("request", FakeRequest("xhr"))  # 끝나지 않는 XHR은 상한까지 대기 후 False
+        assert not await wait_for_network_idle(page, 100, quiet_ms=50)
+
+    asyncio.run(scenario())
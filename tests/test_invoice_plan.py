@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+invoice_plan.py 검증 테스트
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from invoice_plan import MAX_ITEMS_PER_INVOICE, build_invoice_plan
+
+
+def _row(excel_row, business_number, date, company="가나상사"):
+    return {'excel_row': excel_row, '등록번호': business_number, '작성일자': date,
+            '상호': company, '공급가액': '1,000'}
+
+
+def test_groups_by_business_number_and_month():
+    """표기가 달라도 같은 등록번호는 한 묶음, 월이 다르면 별도 묶음 (처음 나온 순서 유지)"""
+    rows = [
+        _row(2, '123-45-67891', '2025-08-01'),
+        _row(3, '220-81-62517', '2025-08-01', "다라물산"),
+        _row(4, '1234567891', '2025-08-15'),
+        _row(5, '1234567891', '2025-09-01'),
+        _row(6, '2208162517', ''),
+    ]
+    plan = build_invoice_plan(rows, start_month='2025-08')
+
+    assert [(chunk.business_number, chunk.supply_month, chunk.excel_rows) for chunk in plan] == [
+        ('1234567891', '2025-08', [2, 4]),
+        ('2208162517', '2025-08', [3]),
+        ('1234567891', '2025-09', [5]),
+        ('2208162517', None, [6]),
+    ]
+    assert plan.row_count == 5
+    assert plan.chunk_for_row(4).excel_rows == [2, 4]
+    assert plan.groups()[0][0]['상호'] == "가나상사"
+
+
+def test_large_group_split_into_consecutive_invoices(capsys):
+    """16건 초과 묶음은 잘라내지 않고 여러 장으로 나눔"""
+    rows = [_row(row, '1234567891', '2025-08-01') for row in range(2, 2 + 40)]
+    rows.append(_row(50, '2208162517', '2025-08-02', "다라물산"))
+    plan = build_invoice_plan(rows)
+
+    chunks = list(plan)
+    assert [len(chunk.rows) for chunk in chunks] == [16, 16, 8, 1]
+    assert [(chunk.part, chunk.parts) for chunk in chunks] == [(1, 3), (2, 3), (3, 3), (1, 1)]
+    assert chunks[1].excel_rows[0] == 18
+    assert sum(len(chunk.rows) for chunk in chunks) == 41
+    assert all(len(chunk.rows) <= MAX_ITEMS_PER_INVOICE for chunk in chunks)
+    assert plan.split_count == 1
+
+    assert plan.summary() == [
+        ("1234567891 가나상사 2025-08", list(range(2, 42)), 3),
+        ("2208162517 다라물산 2025-08", [50], 1),
+    ]
+    plan.print_summary()
+    out = capsys.readouterr().out
+    assert "4장 / 41행" in out
+    assert "40건 → 3장  [행 2-41]" in out
+
+
+def test_order_groups_by_month_to_reduce_date_changes(capsys):
+    """월이 섞인 선택은 월별로 모아 공급일자 변경을 줄이고, 분할 장은 연속 유지"""
+    rows = [
+        _row(2, '1111111111', '2025-07-30'),
+        _row(3, '2222222222', '2025-08-01'),
+        _row(4, '3333333333', '2025-07-02'),
+        _row(5, '4444444444', '2025-08-05'),
+    ]
+    rows += [_row(row, '5555555555', '2025-08-10') for row in range(10, 30)]  # 20건 → 2장
+    rows.append(_row(40, '6666666666', ''))
+
+    plan = build_invoice_plan(rows, start_month='2025-08')
+    assert [(chunk.business_number[0], chunk.supply_month, chunk.part) for chunk in plan] == [
+        ('5', '2025-08', 1), ('5', '2025-08', 2), ('2', '2025-08', 1), ('4', '2025-08', 1),
+        ('1', '2025-07', 1), ('3', '2025-07', 1),
+        ('6', None, 1),
+    ]
+    # 08 → 07 → 월 미상(오늘 날짜 사용)
+    assert plan.cost.date_changes == 2
+    assert plan.baseline_cost.date_changes == 5  # 07 → 08 → 07 → 08 → 오늘
+    assert plan.cost.item_clicks == plan.baseline_cost.item_clicks == 12
+    assert plan.cost.seconds < plan.baseline_cost.seconds
+
+    unordered = build_invoice_plan(rows, order=False, start_month='2025-08')
+    assert [chunk.excel_rows[0] for chunk in unordered][:4] == [2, 3, 4, 5]
+    assert unordered.cost == unordered.baseline_cost
+
+    plan.print_summary()
+    assert "공급일자 변경 2회" in capsys.readouterr().out
+
+
+def test_month_less_groups_ranked_with_current_month(monkeypatch):
+    """월 미상 묶음은 오늘 날짜를 쓰므로 오늘의 월 묶음과 함께 처리 (추가 변경 없음)"""
+    import invoice_plan
+    monkeypatch.setattr(invoice_plan, "current_month", lambda: '2025-07')
+    rows = [
+        _row(2, '1111111111', '2025-08-01'),
+        _row(3, '2222222222', ''),
+        _row(4, '3333333333', '2025-07-02'),
+    ]
+    plan = build_invoice_plan(rows, start_month='2025-08')
+    assert [chunk.supply_month for chunk in plan] == ['2025-08', None, '2025-07']
+    assert plan.cost.date_changes == 1
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+invoice_summary.py 검증 테스트
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from invoice_summary import FORM_HEADER_SELECTORS, build_sheet_summary, combine_email, read_form_header
+
+
+def _row(excel_row, date, item, supply, tax, **extra):
+    row = {'excel_row': excel_row, '등록번호': '123-45-67891', '작성일자': date, '품명': item,
+           '규격': 'M8', '수량': '10', '단가': '', '공급가액': supply, '세액': tax}
+    row.update(extra)
+    return row
+
+
+def test_summary_from_rows():
+    rows = [
+        _row(2, '2025-08-10', '볼트', '10,000', '1,000'),
+        _row(3, '2025-08-20', '너트', '5,000', '500'),
+        _row(4, '2025-08-31', '와셔', '', '', 수량='3', 단가='700'),  # 빈 금액은 홈택스처럼 계산
+    ]
+    summary = build_sheet_summary(rows, '1234567891', supply_date='2025-08-31',
+                                  company_name='가나상사', email='a@b.com')
+
+    assert summary == {
+        'a': '2025-08-31', 'b': '1234567891', 'c': '가나상사', 'd': 'a@b.com',
+        'f': '볼트 외 2개 품목', 'g': 'M8', 'h': '10',
+        'i': '17100', 'j': '1710', 'k': '18810',
+        'l': '250810-250831 3건',
+    }
+
+
+def test_single_row_and_fallbacks():
+    summary = build_sheet_summary([_row(2, '2025-08-10', '볼트', '10000', '1000')], '1234567891')
+    assert summary['f'] == '볼트'
+    assert summary['a'] == '2025-08-10'  # 화면 공급일자가 없으면 행의 날짜
+    assert summary['l'] == '2025-08-10'
+    assert build_sheet_summary([], '1234567891') == {}
+
+    assert combine_email('tax', 'example.com') == 'tax@example.com'
+    assert combine_email('tax', '') == 'tax'
+    assert combine_email('', 'example.com') == '@example.com'
+
+
+def test_read_form_header_in_one_call():
+    class FakePage:
+        calls = 0
+
+        async def evaluate(self, script, selectors):
+            FakePage.calls += 1
+            return {key: f"값-{key}" for key in selectors}
+
+    header = asyncio.run(read_form_header(FakePage()))
+    assert FakePage.calls == 1
+    assert set(header) == set(FORM_HEADER_SELECTORS)
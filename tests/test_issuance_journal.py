@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+issuance_journal.py 검증 테스트
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from issuance_journal import (IssuanceJournal, ITEMS_ENTERED, ON_HOLD, SHEET_WRITTEN, SUMMARY,
+                              VERIFIED, group_id)
+
+
+def test_pending_groups_after_interrupted_run(isolated_journal):
+    """발급보류 후 엑셀 반영 전에 중단된 그룹만 재기록 대상"""
+    journal = IssuanceJournal()
+    assert journal.path == isolated_journal / "issuance.jsonl"
+    book = "C:/APP/세금계산서.xlsx"
+
+    # 완료된 그룹
+    for state in (VERIFIED, ITEMS_ENTERED, ON_HOLD, SHEET_WRITTEN):
+        journal.record(book, "123-45-67891", [3, 2], state)
+    # 발급보류 + 요약 수집 후 중단
+    journal.record(book, "2208162517", [4, 5], ON_HOLD, status_date="2025-08-31")
+    journal.record(book, "2208162517", [4, 5], SUMMARY, tax_invoice={'a': "2025-08-31", 'c': "다라물산"})
+    # 입력 도중 중단
+    journal.record(book, "1111111111", [6], ITEMS_ENTERED)
+    # 다른 파일
+    journal.record("D:/다른파일.xlsx", "3333333333", [2], ON_HOLD)
+
+    # 마지막 줄이 잘린 경우도 무시하고 읽음
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"group": "잘린')
+
+    pending = journal.pending(book)
+    assert [entry['rows'] for entry in pending] == [[4, 5]]
+    assert pending[0]['status_date'] == "2025-08-31"
+    assert pending[0]['tax_invoice']['c'] == "다라물산"
+    assert [entry['business_number'] for entry in journal.uncertain(book)] == ["1111111111"]
+    assert group_id("123-45-67891", [3, 2]) == group_id("1234567891", [2, 3])
+
+    journal.compact()
+    assert len(journal.entries()) == 3
+    assert [entry['rows'] for entry in journal.pending(book)] == [[4, 5]]
+
+
+def test_record_after_torn_line_starts_new_line(isolated_journal):
+    """기록 도중 중단되어 마지막 줄이 잘려 있어도 다음 기록은 온전한 줄로 남음"""
+    journal = IssuanceJournal()
+    book = "C:/APP/세금계산서.xlsx"
+    journal.record(book, "1234567891", [2], ON_HOLD)
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"ts": "2026-')
+
+    journal.record(book, "2208162517", [3], ON_HOLD)
+    assert len(journal.entries()) == 2
+    assert sorted(entry['business_number'] for entry in journal.pending(book)) == ["1234567891", "2208162517"]
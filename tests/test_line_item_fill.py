@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+line_item_fill.py 검증 테스트 (브라우저 없이 page 대역 사용)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from line_item_fill import fill_fields, line_selector
+
+
+class FakeField:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def count(self):
+        return 1 if self.selector in self.page.fields else 0
+
+    async def wait_for(self, state="visible", timeout=None):
+        if self.selector not in self.page.fields:
+            raise TimeoutError(self.selector)
+
+    async def clear(self):
+        self.page.fields[self.selector] = ""
+
+    async def fill(self, value):
+        self.page.fill_calls.append(self.selector)
+        self.page.fields[self.selector] = value
+
+
+class FakePage:
+    """화면의 입력 필드(선택자 → 값)와 입력 시 서식 적용(금액 쉼표)을 흉내"""
+
+    def __init__(self, selectors, rejected=()):
+        self.fields = {selector: "" for selector in selectors}
+        self.rejected = set(rejected)   # 일괄 입력 값이 반영되지 않는 필드
+        self.evaluate_calls = 0
+        self.fill_calls = []
+
+    async def evaluate(self, script, entries):
+        self.evaluate_calls += 1
+        for selector, value in entries:
+            if selector in self.fields and selector not in self.rejected:
+                self.fields[selector] = f"{int(value):,}" if value.isdigit() else value
+        return {selector: self.fields.get(selector) for selector, _ in entries}
+
+    def locator(self, selector):
+        return FakeField(self, selector)
+
+
+def _line_values(lines):
+    values = {}
+    for idx in range(lines):
+        values[line_selector(idx, "edtLsatNmTop")] = f"품목{idx}"
+        values[line_selector(idx, "edtLsatSplCftTop")] = "12000"
+    return values
+
+
+def test_all_lines_filled_in_one_evaluate():
+    async def scenario():
+        values = _line_values(16)
+        page = FakePage(values)
+        failed = await fill_fields(page, values)
+        assert failed == []
+        assert page.evaluate_calls == 1
+        assert page.fill_calls == []
+        # 쉼표 서식이 붙어도 같은 값으로 확인
+        assert page.fields[line_selector(15, "edtLsatSplCftTop")] == "12,000"
+
+    asyncio.run(scenario())
+
+
+def test_only_mismatched_or_missing_fields_fall_back():
+    async def scenario():
+        values = _line_values(2)
+        remark = line_selector(0, "edtLsatRmrkCntnTop")
+        missing = line_selector(1, "edtLsatQtyTop")
+        values[remark] = "비고"
+        values[missing] = "3"
+        rejected = line_selector(1, "edtLsatNmTop")
+        page = FakePage(_line_values(2), rejected=[rejected])
+
+        failed = await fill_fields(page, values, optional=[remark])
+        assert page.fill_calls == [rejected]
+        assert page.fields[rejected] == "품목1"
+        # 화면에 없는 필수 필드만 실패로 남고, 없는 비고는 건너뜀
+        assert failed == [missing]
+
+    asyncio.run(scenario())
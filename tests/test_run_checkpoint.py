@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+run_checkpoint.py 검증 테스트
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from run_checkpoint import RunCheckpoint, selection_fingerprint
+
+
+def test_progress_survives_restart(isolated_checkpoints):
+    """중단 후 같은 파일로 다시 열면 완료/실패 그룹이 남아 있음"""
+    book = "C:/APP/세금계산서.xlsx"
+    checkpoint = RunCheckpoint("tax_invoice", book)
+    assert checkpoint.path.parent == isolated_checkpoints
+    assert not checkpoint.exists
+
+    checkpoint.start("2-10", "abc")
+    checkpoint.mark_completed("A")
+    checkpoint.mark_failed("B", "timeout")
+    checkpoint.mark_completed("C")
+
+    reopened = RunCheckpoint("tax_invoice", book)
+    assert reopened.exists
+    assert reopened.selection == "2-10"
+    assert reopened.fingerprint == "abc"
+    assert reopened.completed == {"A", "C"}
+    assert reopened.failed == {"B": "timeout"}
+    assert reopened.is_completed("A") and not reopened.is_completed("B")
+
+    # 재시도에서 성공하면 실패 목록에서 빠짐
+    reopened.mark_completed("B")
+    assert RunCheckpoint("tax_invoice", book).failed == {}
+
+    # 종류가 다르거나 다른 파일이면 별도 체크포인트
+    assert not RunCheckpoint("partner", book).exists
+    assert not RunCheckpoint("tax_invoice", "C:/APP/다른파일.xlsx").exists
+
+
+def test_finish_and_start_discard_progress():
+    checkpoint = RunCheckpoint("partner", "거래처.xlsx")
+    checkpoint.start("2", "x")
+    checkpoint.mark_completed("row:2")
+    checkpoint.start("2-3", "y")
+    assert checkpoint.completed == set()
+
+    checkpoint.finish()
+    assert not checkpoint.path.exists()
+    assert not RunCheckpoint("partner", "거래처.xlsx").exists
+    # 시작 전 기록은 무시
+    checkpoint.mark_completed("row:3")
+    assert not checkpoint.path.exists()
+
+
+def test_corrupt_checkpoint_is_ignored():
+    checkpoint = RunCheckpoint("partner", "거래처.xlsx")
+    checkpoint.path.parent.mkdir(parents=True)
+    checkpoint.path.write_text('{"version": 1, "kind": "par', encoding='utf-8')
+    assert not RunCheckpoint("partner", "거래처.xlsx").exists
+
+
+def test_fingerprint_ignores_status_column():
+    """우리가 쓴 완료일은 지문에 영향 없고, 데이터 수정은 지문을 바꿈"""
+    before = [(2, {'등록번호': '1234567891', '공급가액': 1000, '발행일': None}),
+              (3, {'등록번호': '2208162517', '공급가액': 500, '발행일': None})]
+    written = [(2, {'등록번호': '1234567891', '공급가액': 1000, '발행일': '2025-08-31'}),
+               (3, {'등록번호': '2208162517', '공급가액': 500, '발행일': 'error'})]
+    edited = [(2, {'등록번호': '1234567891', '공급가액': 1200, '발행일': None}),
+              (3, {'등록번호': '2208162517', '공급가액': 500, '발행일': None})]
+
+    base = selection_fingerprint(before, ignore=['발행일'])
+    assert selection_fingerprint(written, ignore=['발행일']) == base
+    assert selection_fingerprint(edited, ignore=['발행일']) != base
+    assert selection_fingerprint(written) != selection_fingerprint(before)
+
+
+def test_failed_group_is_retried_after_resume(tmp_path):
+    """발급에 실패한 그룹은 완료로 남지 않고, 이어서 처리할 때 다시 처리 대상이 됨"""
+    from excel_unified_processor import create_transaction_processor
+
+    book = str(tmp_path / "세금계산서.xlsx")
+    processor = create_transaction_processor()
+    processor.checkpoint = RunCheckpoint(processor.sheet_type, book)
+    processor.checkpoint.start("2-5", "abc")
+    processor.mark_group_completed("A")
+    processor.mark_group_failed("B", "발급실패")
+    processor.finish_run()  # 실패가 있으면 체크포인트 유지
+
+    resumed = create_transaction_processor()
+    resumed.checkpoint = RunCheckpoint(resumed.sheet_type, book)
+    assert resumed.is_group_completed("A")
+    assert not resumed.is_group_completed("B")
+    assert resumed.checkpoint.failed == {"B": "발급실패"}
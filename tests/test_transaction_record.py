@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+transaction_record.py 검증 테스트
+"""
+
+import os
+import sys
+from datetime import date, datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core', 'tax-invoice'))
+
+from transaction_record import (TransactionRecord, coerce_record, is_valid_business_number, parse_amount,
+                                parse_date, valid_business_numbers)
+
+
+def test_record_parses_once_and_keeps_raw_values():
+    """로드 시 변환한 값과 원래 문자열을 함께 보관"""
+    record = TransactionRecord({
+        '작성일자': '2025-08-01 00:00:00', '등록번호': '123-45-67891', '품명': '볼트',
+        '수량': '1,000', '단가': '10', '공급가액': '10000', '세액': '1000', '합계금액': '',
+        '현금': '5000', '현금종류': '수표', 'excel_row': 7,
+    })
+
+    assert record.supply_date == date(2025, 8, 1)
+    assert record.business_number == '1234567891'
+    assert (record.quantity, record.unit_price, record.supply_amount, record.tax_amount) == (1000, 10, 10000, 1000)
+    assert record.total_amount == 11000
+    assert record.cash_amount == 5000
+    assert record['수량'] == '1,000' and record.get('품명') == '볼트'
+    assert record.excel_row == 7
+    assert coerce_record(record) is record
+
+
+def test_parse_helpers():
+    assert parse_date('20250831') == date(2025, 8, 31)
+    assert parse_date(datetime(2025, 8, 31, 12)) == date(2025, 8, 31)
+    assert parse_date('날짜아님') is None and parse_date('') is None
+    assert parse_amount('1,234.0') == 1234
+    assert parse_amount('1.5') == 1.5
+    assert parse_amount('') == 0 and parse_amount('abc') == 0
+
+
+def test_record_wraps_mapping_without_copy():
+    """Mapping 행은 복사하지 않고 참조"""
+    row = {'작성일자': '2025-08-02', '공급가액': '500', 'excel_row': 3}
+    record = TransactionRecord(row)
+    assert record._row is row
+    assert dict(record) == row
+    assert record.total_amount == 500
+    assert TransactionRecord(row, excel_row=9).excel_row == 9
+
+
+def test_business_number_check_digit():
+    """검증번호 계산은 표기(하이픈, 숫자형)와 무관하고 자릿수가 틀리면 실패"""
+    values = ['123-45-67891', '2208162517', 1234567891, '1234567890', '220-81-62518',
+              '', None, '12345', '12345678901']
+    assert valid_business_numbers(values).tolist() == [True, True, True, False, False,
+                                                        False, False, False, False]
+    assert is_valid_business_number('220-81-62517')
+    assert not is_valid_business_number('220-81-62510')
+    assert valid_business_numbers([]).tolist() == []
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+xlsx_patch_writer.py 검증 테스트
+"""
+
+import os
+import sys
+import zipfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from xlsx_patch_writer import append_rows, patch_cells
+
+
+def _create_workbook(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "거래명세표"
+    ws.append(['작성일자', '등록번호', '합계'])
+    ws.append(['2025-08-01', '1234567891', '=1+1'])
+    ws.append(['2025-08-02', '2208162517', 330])
+    ws['Q2'] = '대기'
+    ws['Q2'].font = Font(bold=True)
+    log = wb.create_sheet("세금계산서")
+    log.append(['공급일자', '등록번호', '상호'])
+    log.append(['2025-08-01', '1234567891', '가나상사'])
+    wb.save(path)
+    return str(path)
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def test_patch_cells_changes_only_target_sheet(tmp_path):
+    """대상 시트 XML만 바뀌고 스타일은 유지"""
+    path = _create_workbook(tmp_path / "세금계산서.xlsx")
+    before = _parts(path)
+
+    assert patch_cells(path, "거래명세표", [(2, 17, "번호오류"), (3, 17, " 완료 "), (6, 2, 42), (3, 1, "A&B<C>")])
+    after = _parts(path)
+    assert [name for name in before if before[name] != after[name]] == ["xl/worksheets/sheet1.xml"]
+
+    ws = load_workbook(path)["거래명세표"]
+    assert ws['Q2'].value == "번호오류" and ws['Q2'].font.b
+    assert ws['Q3'].value == " 완료 " and ws['A3'].value == "A&B<C>"
+    assert ws['B6'].value == 42 and ws['C2'].value == "=1+1"
+    assert ws.max_row == 6 and ws.max_column == 17
+
+
+def test_patch_falls_back_without_touching_file(tmp_path):
+    """수식 셀/지원하지 않는 값/없는 시트는 파일을 그대로 두고 실패 반환"""
+    from datetime import date
+
+    path = _create_workbook(tmp_path / "세금계산서.xlsx")
+    before = _parts(path)
+
+    assert not patch_cells(path, "거래명세표", [(2, 17, "완료"), (2, 3, "덮어쓰기")])
+    assert not patch_cells(path, "거래명세표", [(2, 17, date(2025, 8, 31))])
+    assert append_rows(path, "없는시트", [{1: "x"}]) is None
+    assert _parts(path) == before
+
+
+def test_append_rows_after_last_used_row(tmp_path):
+    """A열 마지막 값 다음 행부터 여러 행을 한 번에 추가"""
+    path = _create_workbook(tmp_path / "세금계산서.xlsx")
+    assert append_rows(path, "세금계산서", [{1: "2025-08-31", 3: "다라물산"}, {1: "2025-09-01", 2: "2208162517"}]) == 3
+    assert append_rows(path, "세금계산서", [{1: "2025-09-02"}]) == 5
+
+    ws = load_workbook(path)["세금계산서"]
+    assert [[cell.value for cell in row] for row in ws.iter_rows(min_row=3)] == [
+        ["2025-08-31", None, "다라물산"], ["2025-09-01", "2208162517", None], ["2025-09-02", None, None]]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+xlwings_session.py 검증 테스트 (엑셀 없이 범위 계획과 저장 지연만 확인)
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from excel_write_worker import ExcelWriteWorker
+from xlwings_session import MAX_ADDRESS_LENGTH, XlwingsWorkbookSession, last_used_row, plan_range_writes
+
+
+def test_plan_groups_rows_into_range_writes():
+    """같은 값은 떨어진 행도 한 주소로, 다른 값의 연속 행은 세로 범위 하나로"""
+    cells = [(row, 17, "번호오류") for row in (2, 3, 4, 5, 9, 12)]
+    cells += [(20, 17, "2025-08-31"), (21, 17, "2025-09-01"), (22, 17, "2025-09-02")]
+    plan = plan_range_writes(cells)
+
+    assert ('fill', "Q2:Q5,Q9,Q12", "번호오류") in plan
+    assert ('block', "Q20:Q22", [["2025-08-31"], ["2025-09-01"], ["2025-09-02"]]) in plan
+    assert len(plan) == 2
+
+    many = plan_range_writes([(row, 1, "x") for row in range(2, 400, 2)])
+    assert len(many) > 1
+    assert all(kind == 'fill' and len(address) <= MAX_ADDRESS_LENGTH for kind, address, _ in many)
+    assert sum(len(address.split(",")) for _, address, _ in many) == len(range(2, 400, 2))
+
+
+class _FakeRange:
+    def __init__(self, log, address, sheet=None):
+        self.log, self.address, self.sheet = log, address, sheet
+
+    @property
+    def value(self):
+        if self.sheet is None:
+            return None
+        self.sheet.reads += 1
+        return self.sheet.cells.get(self.address[0])
+
+    @value.setter
+    def value(self, value):
+        self.log.append((self.address, value))
+
+    Value = value
+
+
+class _FakeSheet:
+    def __init__(self, name, log):
+        self.name, self.log = name, log
+        self.api = self
+        self.cells, self.reads = {}, 0
+
+    def range(self, *address):
+        return _FakeRange(self.log, address, self)
+
+    def Range(self, address):
+        return _FakeRange(self.log, address)
+
+
+class _FakeBook:
+    def __init__(self):
+        self.log, self.saves = [], 0
+        self.sheets = [_FakeSheet("거래명세표", self.log)]
+
+    def save(self):
+        self.saves += 1
+
+
+def test_session_coalesces_saves_on_worker():
+    """작업자 스레드에서 여러 번 기록해도 저장은 큐가 빌 때 한 번"""
+    book = _FakeBook()
+    session = XlwingsWorkbookSession("C:\\APP\\세금계산서.xlsx")
+    session._book = book
+    assert session.workbook_name == "세금계산서.xlsx"
+
+    worker = ExcelWriteWorker(idle_delay=0.05)
+    results = [worker.submit(session.write_cells, "거래명세표", [(row, 17, "완료")]) for row in range(2, 18)]
+    assert all(future.result(timeout=5) for future in results)
+    assert worker.drain(timeout=5)
+
+    assert len(book.log) == 16
+    assert book.saves == 1 and not session.dirty
+    worker.shutdown()
+
+    # 작업자 밖에서는 즉시 저장
+    assert session.write_row("거래명세표", 30, {1: "2025-08-31", 3: "가나상사"})
+    assert book.log[-1] == (((30, 1), (30, 3)), [["2025-08-31", None, "가나상사"]])
+    assert book.saves == 2
+
+
+class _FakeCell:
+    def __init__(self, row):
+        self.row = row
+
+
+class _FakeColumnSheet(_FakeSheet):
+    """A열 값만 가진 시트 - used_range / end('up') 조회 지원"""
+
+    def __init__(self, values, used_rows):
+        super().__init__("세금계산서", [])
+        self.cells = {(row, 1): value for row, value in enumerate(values, 1)}
+        self.used_range = type("UsedRange", (), {"last_cell": _FakeCell(used_rows)})()
+
+    def range(self, *address):
+        fake = super().range(*address)
+        sheet = self
+
+        def end(direction):
+            row = address[0][0] - 1
+            while row > 1 and sheet.cells.get((row, 1)) is None:
+                row -= 1
+            return _FakeCell(row)
+        fake.end = end
+        return fake
+
+
+def test_append_cursor_looks_up_last_row_once():
+    """마지막 행은 세션에서 한 번만 조회하고, 여러 행은 한 번의 범위 쓰기로 추가"""
+    ws = _FakeColumnSheet(["공급일자"] + ["2025-08-01"] * 500, used_rows=520)
+    assert last_used_row(ws) == 501
+    assert last_used_row(_FakeColumnSheet([], used_rows=1)) == 0
+
+    book = _FakeBook()
+    book.sheets = [ws]
+    session = XlwingsWorkbookSession("세금계산서.xlsx")
+    session._book = book
+
+    ws.reads = 0
+    assert session.append_rows("세금계산서", [{1: "2025-08-31", 3: "가나상사"}]) == 502
+    reads = ws.reads
+    assert reads <= 3
+    assert session.append_rows("세금계산서", [{1: "2025-09-01"}, {}, {2: "2208162517"}]) == 503
+    assert ws.reads == reads
+    assert ws.log[-1] == (((503, 1), (504, 2)), [["2025-09-01", None], [None, "2208162517"]])
+    assert session.append_rows("세금계산서", [{1: "x"}]) == 505